@@ -2,6 +2,15 @@
 let playersData = [];
 let draftedPlayers = new Set();
 
+// Players per position sorted by projected points, built once at load so
+// ranking updates only skip drafted players instead of re-sorting every pick
+let positionIndex = {};
+
+// Build-time search index (data/players.search.json, see search_index.py)
+// and an ID lookup to resolve its postings; search scans names without it
+let searchIndex = null;
+let playersById = new Map();
+
 // League configuration
 let leagueSettings = {
     size: 12,                    // 8, 10, 12, 14
@@ -28,7 +37,19 @@ let modelSettings = {
     yearWeight: 0.6              // Weight for recent year (0.6 = 60% recent, 40% previous)
 };
 
+// Undrafted players at a position, best first, stopping after `limit`
+function undraftedAtPosition(position, limit = Infinity) {
+    const players = [];
+    for (const player of positionIndex[position] || []) {
+        if (draftedPlayers.has(player.id)) continue;
+        players.push(player);
+        if (players.length >= limit) break;
+    }
+    return players;
+}
+
 // Calculate replacement level baselines based on league settings
+// (rankings.py mirrors this model and precomputes it for common leagues)
 function calculateReplacementLevels() {
     const starters = leagueSettings.rosterPositions;
     const benchDepth = Math.ceil(leagueSettings.rosterPositions.BENCH / 5); // Rough bench allocation
@@ -45,11 +66,9 @@ function calculateReplacementLevels() {
     const replacementLevels = {};
     
     Object.keys(replacementRanks).forEach(position => {
-        const positionPlayers = playersData
-            .filter(p => p.position === position && !draftedPlayers.has(p.id))
-            .sort((a, b) => b.stats.totalPoints - a.stats.totalPoints);
+        const positionPlayers = undraftedAtPosition(position, Math.ceil(replacementRanks[position]));
         
-        const replacementRank = Math.min(replacementRanks[position] - 1, positionPlayers.length - 1);
+        const replacementRank = Math.min(Math.floor(replacementRanks[position]) - 1, positionPlayers.length - 1);
         replacementLevels[position] = positionPlayers[replacementRank]?.stats.totalPoints || 0;
     });
     
@@ -80,9 +99,15 @@ function calculateAdvancedStats(player) {
     // Adjust for injury risk
     const injuryAdjustment = 1 - (player.injury.riskScore * modelSettings.injuryWeight);
     
+    // Simulated seasons (simulation.py) set the spread, P10/P90 relative to
+    // their median; the year and injury weights set the center, as above
+    const simulation = player.simulation;
+    const expected = weightedAvgPoints * 17 * injuryAdjustment;
+    const simulated = simulation && simulation.p50 > 0;
+    
     return {
-        floor: floor * injuryAdjustment,
-        ceiling: ceiling * injuryAdjustment,
+        floor: simulated ? simulation.p10 / simulation.p50 * expected : floor * injuryAdjustment,
+        ceiling: simulated ? simulation.p90 / simulation.p50 * expected : ceiling * injuryAdjustment,
         volatility: volatility,
         adjustedProjection: weightedTotalPoints * injuryAdjustment,
         weightedAvgPoints: weightedAvgPoints,
@@ -116,10 +141,7 @@ function calculatePositionalScarcity() {
     const scarcity = {};
     
     ['QB', 'RB', 'WR', 'TE'].forEach(position => {
-        const positionPlayers = playersData
-            .filter(p => p.position === position && !draftedPlayers.has(p.id))
-            .sort((a, b) => b.stats.totalPoints - a.stats.totalPoints)
-            .slice(0, 20); // Top 20 undrafted
+        const positionPlayers = undraftedAtPosition(position, 20); // Top 20 undrafted
         
         if (positionPlayers.length >= 2) {
             // Calculate average drop-off between tiers
@@ -336,6 +358,45 @@ function initializeEventListeners() {
     // Draft pick tab - search removed in favor of drag-and-drop interface
 }
 
+// Players whose name contains the term, plus token prefix matches (last
+// names, teams, nicknames). Mirror of search() in search_index.py
+function searchCandidates(term) {
+    const ids = new Set();
+    if (term.length >= 3) {
+        // A name containing the term contains every trigram of it
+        const lists = [];
+        for (let i = 0; i + 3 <= term.length; i++) {
+            lists.push(searchIndex.trigrams[term.slice(i, i + 3)] || []);
+        }
+        lists.sort((a, b) => a.length - b.length);
+        let candidates = lists[0];
+        for (let i = 1; i < lists.length && candidates.length; i++) {
+            const next = new Set(lists[i]);
+            candidates = candidates.filter(id => next.has(id));
+        }
+        candidates.forEach(id => {
+            const player = playersById.get(id);
+            if (player && player.name.toLowerCase().includes(term)) ids.add(id);
+        });
+    } else {
+        playersData.forEach(p => {
+            if (p.name.toLowerCase().includes(term)) ids.add(p.id);
+        });
+    }
+    
+    // Tokens are sorted: binary search for the first one >= term, then walk the prefix range
+    const tokens = searchIndex.tokens;
+    let lo = 0, hi = tokens.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (tokens[mid] < term) lo = mid + 1; else hi = mid;
+    }
+    for (let i = lo; i < tokens.length && tokens[i].startsWith(term); i++) {
+        searchIndex.postings[i].forEach(id => ids.add(id));
+    }
+    return [...ids].map(id => playersById.get(id)).filter(Boolean);
+}
+
 // Search functionality with fuzzy matching
 function searchPlayers(event) {
     const searchTerm = event.target.value.toLowerCase();
@@ -346,10 +407,13 @@ function searchPlayers(event) {
         return;
     }
     
-    // Fuzzy search - match if search term appears anywhere in name
-    const matches = playersData
-        .filter(p => !draftedPlayers.has(p.id) && 
-                     p.name.toLowerCase().includes(searchTerm))
+    // Fuzzy search - match if search term appears anywhere in name (or a
+    // team / nickname starts with it, when the search index is loaded)
+    const pool = searchIndex
+        ? searchCandidates(searchTerm)
+        : playersData.filter(p => p.name.toLowerCase().includes(searchTerm));
+    const matches = pool
+        .filter(p => !draftedPlayers.has(p.id))
         .sort((a, b) => {
             // Prioritize matches at start of name
             const aStart = a.name.toLowerCase().indexOf(searchTerm);
@@ -530,30 +594,122 @@ function showTab(tabName) {
     });
 }
 
-// Load player data
-async function loadPlayerData() {
+// Player file named in summary.json, versioned by its content hash so browsers
+// can cache it until the data changes. Prefers the columnar export when built.
+async function playerDataSource() {
     try {
-        const response = await fetch('data/players.json');
-        playersData = await response.json();
-        
-        // Add simulated previous year stats (slightly different from current year)
-        playersData = playersData.map(player => {
-            // Create previous year stats with some variance
-            const variance = 0.85 + Math.random() * 0.3; // 85% to 115% of current stats
-            const prevYearStats = {
-                gamesPlayed: Math.max(1, Math.min(17, player.stats.gamesPlayed + Math.floor(Math.random() * 3 - 1))),
-                totalPoints: player.stats.totalPoints * variance,
-                averagePoints: player.stats.averagePoints * variance,
-                consistency: Math.max(0.4, Math.min(0.95, player.stats.consistency + (Math.random() * 0.2 - 0.1)))
+        const response = await fetch('data/summary.json', { cache: 'no-cache' });
+        const summary = await response.json();
+        const searchUrl = summary.searchFile && summary.contentHash
+            ? `data/${summary.searchFile}?v=${summary.contentHash}` : null;
+        if (summary.columnarFile && summary.contentHash) {
+            return { url: `data/${summary.columnarFile}?v=${summary.contentHash}`, columnar: true, searchUrl };
+        }
+        if (summary.compactFile && summary.contentHash) {
+            return { url: `data/${summary.compactFile}?v=${summary.contentHash}`, columnar: false, searchUrl };
+        }
+    } catch (error) {
+        console.warn('Could not read data/summary.json, loading players.json:', error);
+    }
+    return { url: 'data/players.json', columnar: false, searchUrl: null };
+}
+
+// Fetch the search index in the background; searchPlayers scans until it lands
+async function loadSearchIndex(url) {
+    if (!url) return;
+    try {
+        const response = await fetch(url);
+        searchIndex = await response.json();
+    } catch (error) {
+        console.warn('Could not load the search index, searching by scan:', error);
+    }
+}
+
+const TYPED_ARRAYS = { float32: Float32Array, uint8: Uint8Array, uint16: Uint16Array, uint32: Uint32Array };
+
+// Decode the columnar export (see columnar.py) into player objects
+function playersFromColumns(data) {
+    const columns = {};
+    Object.entries(data.types).forEach(([name, type]) => {
+        columns[name] = (TYPED_ARRAYS[type] || Float64Array).from(data.columns[name]);
+    });
+    const names = data.columns.name;
+    const positions = data.columns.position;
+    const teams = data.columns.team;
+    
+    const players = new Array(data.length);
+    for (let row = 0; row < data.length; row++) {
+        players[row] = {
+            id: columns.id[row],
+            name: names[row],
+            position: positions.dictionary[positions.codes[row]],
+            team: teams.dictionary[teams.codes[row]],
+            stats: {
+                gamesPlayed: columns.gamesPlayed[row],
+                totalPoints: columns.totalPoints[row],
+                averagePoints: columns.averagePoints[row],
+                consistency: columns.consistency[row]
+            },
+            injury: {
+                gamesInjured: columns.gamesInjured[row],
+                riskScore: columns.riskScore[row]
+            }
+        };
+        if (columns.simP50 && columns.simP50[row]) {
+            players[row].simulation = {
+                p10: columns.simP10[row],
+                p50: columns.simP50[row],
+                p90: columns.simP90[row]
             };
-            
-            return {
-                ...player,
-                currentYearStats: player.stats, // Keep current year stats
-                previousYearStats: prevYearStats, // Add previous year stats
-                stats: player.stats // Keep original for backward compatibility
+        }
+        if (columns.prevSeason && columns.prevSeason[row]) {
+            players[row].previousYearStats = {
+                season: columns.prevSeason[row],
+                gamesPlayed: columns.prevGamesPlayed[row],
+                totalPoints: columns.prevTotalPoints[row],
+                averagePoints: columns.prevAveragePoints[row],
+                consistency: columns.prevConsistency[row]
             };
+        }
+    }
+    return players;
+}
+
+// Players per position, highest projected points first
+function buildPositionIndex(players, byPosition = null) {
+    positionIndex = {};
+    if (byPosition) {
+        Object.entries(byPosition).forEach(([position, rows]) => {
+            positionIndex[position] = rows.map(row => players[row]);
         });
+        return;
+    }
+    players.forEach(player => {
+        (positionIndex[player.position] = positionIndex[player.position] || []).push(player);
+    });
+    Object.values(positionIndex).forEach(list => {
+        list.sort((a, b) => b.stats.totalPoints - a.stats.totalPoints);
+    });
+}
+
+// Load player data
+async function loadPlayerData() {
+    try {
+        const source = await playerDataSource();
+        const response = await fetch(source.url);
+        const data = await response.json();
+        playersData = source.columnar ? playersFromColumns(data) : data;
+        
+        // previousYearStats comes from the history store (history.py); players
+        // without a stored previous season (rookies) weigh their current stats only
+        playersData = playersData.map(player => ({
+            ...player,
+            currentYearStats: player.stats,
+            previousYearStats: player.previousYearStats || player.stats
+        }));
+        buildPositionIndex(playersData, source.columnar ? data.byPosition : null);
+        playersById = new Map(playersData.map(player => [player.id, player]));
+        loadSearchIndex(source.searchUrl);
         
         updateRankings();
     } catch (error) {
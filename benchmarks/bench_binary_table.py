@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import binary_table
+
+# Load cost of a synthetic player file as JSON vs the memory-mapped binary
+# table: time to get at the data, then a scan of one column. The "RSS" column
+# is the resident memory the column scan added, which should be about the
+# column's own size rather than the file's (Linux only).
+#
+#   python benchmarks/bench_binary_table.py --rows 100000,1000000
+
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX',
+         'KC', 'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS']
+
+def synthetic_players(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        average = rng.uniform(2, 25)
+        yield {
+            'id': i + 1,
+            'sourceId': f"espn:{1000000 + i}",
+            'name': f"Player {i:07d}",
+            'position': rng.choice(POSITIONS),
+            'team': rng.choice(TEAMS),
+            'stats': {'gamesPlayed': 17, 'totalPoints': average * 17, 'averagePoints': average,
+                      'consistency': rng.uniform(0.4, 0.95)},
+            'injury': {'gamesInjured': rng.randint(0, 8), 'injuryHistory': [], 'riskScore': rng.uniform(0, 0.5)},
+            'previousYearStats': {'season': 2023, 'gamesPlayed': 16, 'totalPoints': average * 16,
+                                  'averagePoints': average, 'consistency': rng.uniform(0.4, 0.95)}
+        }
+
+def resident_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(sizes):
+    import numpy  # imported up front so the first scan doesn't pay for it
+
+    print(f"{'rows':>10}{'json MB':>9}{'bin MB':>8}{'json load':>11}{'bin open':>10}"
+          f"{'json scan':>11}{'bin scan':>10}{'scan RSS':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            json_path = os.path.join(tmp, 'players.json')
+            bin_path = os.path.join(tmp, 'players.bin')
+            builder = binary_table.TableBuilder()
+            with open(json_path, 'w') as f:
+                json.dump([builder.add(player) for player in synthetic_players(n)], f, separators=(',', ':'))
+            builder.write(bin_path)
+            del builder
+
+            load_time, players = timed(load_json, json_path)
+            json_scan, json_total = timed(lambda: sum(p['stats']['totalPoints'] for p in players))
+            del players
+
+            open_time, table = timed(binary_table.BinaryTable, bin_path)
+            before = resident_bytes()
+            bin_scan, bin_total = timed(lambda: float(table.array('totalPoints').sum(dtype='f8')))
+            after = resident_bytes()
+            assert abs(bin_total - json_total) / json_total < 1e-4, "column sums should agree"
+            table.close()
+
+            rss = f"{(after - before) / 2 ** 20:>8.1f}MB" if before is not None else f"{'n/a':>10}"
+            print(f"{n:>10,}{os.path.getsize(json_path) / 2 ** 20:>9.1f}{os.path.getsize(bin_path) / 2 ** 20:>8.1f}"
+                  f"{load_time * 1000:>9.0f}ms{open_time * 1000:>8.2f}ms"
+                  f"{json_scan * 1000:>9.1f}ms{bin_scan * 1000:>8.1f}ms{rss}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the binary player table against JSON")
+    parser.add_argument('--rows', default='10000,100000,1000000',
+                        help="Comma-separated table sizes (default: 10000,100000,1000000)")
+    args = parser.parse_args()
+    main([int(size) for size in args.rows.split(',')])
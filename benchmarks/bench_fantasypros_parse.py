@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fantasypros
+
+# Parse-only benchmark for the FantasyPros ranking pages: times the legacy
+# html.parser full-page parse against the fast strained parse on saved pages.
+#
+#   python benchmarks/bench_fantasypros_parse.py --fetch   # snapshot live pages
+#   python benchmarks/bench_fantasypros_parse.py
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'fantasypros')
+MANIFEST_PATH = os.path.join(FIXTURE_DIR, 'manifest.json')
+
+def fixture_path(position):
+    return os.path.join(FIXTURE_DIR, f"{position}.html")
+
+def fetch_fixtures():
+    """Save the current ranking pages as fixtures, with where and when they came from
+
+    Every page has to come back 200 and parse to ranking rows; an error or
+    captcha page would otherwise be benchmarked as if it were real markup.
+    """
+    import http_client
+
+    pages = {}
+    for position in fantasypros.POSITIONS:
+        url = fantasypros.RANKINGS_URL.format(position=position)
+        try:
+            response = http_client.get(url, refresh=True)
+        except Exception as e:
+            raise SystemExit(f"Could not fetch {url} ({e}); no fixtures saved")
+        if response.status_code != 200:
+            raise SystemExit(f"{url} returned {response.status_code}; no fixtures saved")
+        rows = fantasypros.parse_rankings(response.content)
+        if not rows:
+            raise SystemExit(f"{url} has no ranking rows; no fixtures saved")
+        pages[position] = (url, response.content, len(rows))
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    manifest = {'fetchedAt': time.strftime('%Y-%m-%dT%H:%M:%S'), 'pages': {}}
+    for position, (url, content, rows) in pages.items():
+        with open(fixture_path(position), 'wb') as f:
+            f.write(content)
+        manifest['pages'][position] = {'url': url, 'bytes': len(content), 'rows': rows}
+        print(f"Saved {position} ({len(content) / 1024:.0f} KB, {rows} rows)")
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def synthetic_page(position, rows=250, seed=0):
+    """Page shaped like a FantasyPros ranking page: heavy chrome around one large table"""
+    rng = random.Random(f"{position}:{seed}")
+    teams = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'KC', 'SF']
+    parts = ['<!DOCTYPE html><html><head><title>Rankings</title>']
+    parts += [f'<script>var config{i} = {{"k": "{"x" * 400}"}};</script>' for i in range(40)]
+    parts.append('</head><body><nav>')
+    parts += [f'<div class="menu"><ul>{"".join(f"<li><a href=/p{j}>Link {j}</a></li>" for j in range(30))}</ul></div>'
+              for _ in range(20)]
+    parts.append('</nav><table class="schedule"><tr><th>Week</th></tr><tr><td>1</td></tr></table>')
+    parts.append('<table id="ranking-table" class="rankings-table"><thead><tr><th>Rank</th><th>Player</th>'
+                 '<th>Best</th><th>Worst</th><th>Avg</th></tr></thead><tbody>')
+    for rank in range(1, rows + 1):
+        team = rng.choice(teams)
+        parts.append(f'<tr class="player-row"><td>{rank}</td><td><div class="player-cell">'
+                     f'<a href="/nfl/players/p{rank}.php" class="player-name">Player {position.upper()} {rank}</a>'
+                     f' <small class="grey">{team}</small></div></td><td>{rank}</td><td>{rank + 9}</td>'
+                     f'<td>{rank + rng.random():.1f}</td></tr>')
+    parts.append('</tbody></table>')
+    parts += [f'<div class="article"><p>{"Lorem ipsum dolor sit amet. " * 40}</p></div>' for _ in range(30)]
+    parts.append('</body></html>')
+    return ''.join(parts).encode()
+
+def load_fixtures():
+    fixtures = {}
+    for position in fantasypros.POSITIONS:
+        try:
+            with open(fixture_path(position), 'rb') as f:
+                fixtures[position] = f.read()
+        except OSError:
+            pass
+
+    if not fixtures:
+        print("No saved pages found, using synthetic pages (run with --fetch to snapshot live ones)")
+        return {position: synthetic_page(position) for position in fantasypros.POSITIONS}, 'synthetic pages'
+
+    try:
+        with open(MANIFEST_PATH) as f:
+            source = f"pages saved {json.load(f)['fetchedAt']}"
+    except (OSError, ValueError, KeyError):
+        source = 'saved pages'
+    return fixtures, source
+
+def time_parse(html, fast, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fantasypros.parse_rankings(html, fast=fast)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+def main(repeat=5):
+    fixtures, source = load_fixtures()
+    print(f"Fast parser backend: {fantasypros.FAST_PARSER}, {source}\n")
+    print(f"{'page':<6}{'size':>9}{'legacy':>11}{'fast':>11}{'speedup':>9}")
+
+    total_legacy = total_fast = 0.0
+    for position, html in fixtures.items():
+        legacy, legacy_rows = time_parse(html, False, repeat)
+        fast, fast_rows = time_parse(html, True, repeat)
+        if legacy_rows != fast_rows:
+            print(f"{position}: fast parse returned different rows than the legacy parse")
+        total_legacy += legacy
+        total_fast += fast
+        print(f"{position:<6}{len(html) / 1024:>7.0f}KB{legacy * 1000:>9.1f}ms{fast * 1000:>9.1f}ms"
+              f"{legacy / fast:>8.1f}x")
+
+    print(f"{'total':<6}{'':>9}{total_legacy * 1000:>9.1f}ms{total_fast * 1000:>9.1f}ms"
+          f"{total_legacy / total_fast:>8.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark FantasyPros ranking page parsing")
+    parser.add_argument('--fetch', action='store_true',
+                        help="Save the live ranking pages as fixtures before benchmarking")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="Timed parses per page; the best run is reported (default: 5)")
+    args = parser.parse_args()
+    if args.fetch:
+        fetch_fixtures()
+    main(repeat=args.repeat)
@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fantasypros
+import pipeline
+import player_ids
+import scrape_nfl_data
+import team_registry
+from bench_fantasypros_parse import load_fixtures as load_ranking_pages
+
+# Offline benchmark of every scraper stage on recorded fixtures: HTTP body
+# decode, FantasyPros HTML parse, ESPN normalization, injury enrichment,
+# projections, sort and JSON write. Each stage reports ops/sec (bodies, pages
+# or players per second, best of --repeat runs) and peak traced memory, and is compared against the stored
+# baseline; the run exits non-zero when a stage is slower or hungrier than
+# the baseline by more than --threshold.
+#
+#   python benchmarks/bench_pipeline.py --fetch          # record live ESPN pages
+#   python benchmarks/bench_pipeline.py --save-baseline  # after an intended change
+#   python benchmarks/bench_pipeline.py
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ESPN_FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures', 'espn')
+RAW_DATA_PATH = os.path.join(os.path.dirname(BENCH_DIR), 'data', 'espn_raw_data.json')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_THRESHOLD = 0.25  # allowed slowdown / memory growth before the run fails
+MIN_RUN_TIME = 0.25       # seconds each timed run lasts at least
+
+def kona_fixture_path(position):
+    return os.path.join(ESPN_FIXTURE_DIR, f"kona_{position.replace('/', '')}.json")
+
+def fetch_fixtures():
+    """Save one kona_player_info response per position as fixtures"""
+    import http_client
+
+    os.makedirs(ESPN_FIXTURE_DIR, exist_ok=True)
+    for position, pos_id in scrape_nfl_data.ESPN_POSITION_IDS.items():
+        headers = {
+            'x-fantasy-filter': json.dumps({
+                "filterSlotIds": {"value": [pos_id]},
+                "limit": scrape_nfl_data.DEFAULT_DEPTH[position],
+                "sortPercOwned": {"sortPriority": 1, "sortAsc": False}
+            })
+        }
+        response = http_client.get(scrape_nfl_data.ESPN_PLAYERS_URL, headers=headers)
+        with open(kona_fixture_path(position), 'wb') as f:
+            f.write(response.content)
+        print(f"Saved {position} ({len(response.content) / 1024:.0f} KB)")
+
+def synthetic_kona_page(position, count, seed=0):
+    """Body shaped like a kona_player_info response"""
+    rng = random.Random(f"{position}:{seed}")
+    first_id = 1000 * (list(scrape_nfl_data.DEFAULT_DEPTH).index(position) + 1)
+    players = []
+    for rank in range(count):
+        players.append({
+            'id': rank,
+            'player': {
+                'id': first_id + rank,
+                'fullName': f"Player {position} {rank}",
+                'proTeamId': rng.randint(1, 34),
+                'ownership': {'percentOwned': max(0.0, 100 - rank * rng.uniform(0.3, 0.8))},
+                'stats': [
+                    {'scoringPeriodId': 0, 'statSourceId': source, 'seasonId': 2024,
+                     'appliedTotal': rng.uniform(20, 350),
+                     'stats': {str(stat): rng.uniform(0, 100) for stat in range(40)}}
+                    for source in (0, 1)
+                ]
+            }
+        })
+    return json.dumps({'players': players}).encode()
+
+def load_kona_pages():
+    pages = {}
+    for position in scrape_nfl_data.ESPN_POSITION_IDS:
+        try:
+            with open(kona_fixture_path(position), 'rb') as f:
+                pages[position] = f.read()
+        except OSError:
+            pass
+
+    if not pages:
+        print("No saved ESPN pages found, using synthetic pages (run with --fetch to record live ones)")
+        pages = {position: synthetic_kona_page(position, count)
+                 for position, count in scrape_nfl_data.DEFAULT_DEPTH.items()}
+    return pages
+
+def load_fixtures(scale):
+    """Raw bodies and the normalized player list every later stage starts from"""
+    bodies = list(load_kona_pages().items()) * scale
+    raw = []
+    if os.path.exists(RAW_DATA_PATH):
+        with open(RAW_DATA_PATH, 'rb') as f:
+            raw = [f.read()] * scale
+
+    # Distinct IDs per copy so scaled-up fixtures behave like a larger feed
+    entries = []
+    for copy, (position, body) in enumerate(bodies):
+        for player_data in json.loads(body).get('players', []):
+            player_data['player']['id'] = f"{copy}-{player_data['player'].get('id')}"
+            entries.append((player_data, position))
+
+    pages, source = load_ranking_pages()
+    return {
+        'bodies': [body for position, body in bodies] + raw,
+        'pages': list(pages.values()) * scale,
+        'entries': entries
+    }
+
+def copy_players(players):
+    return [json.loads(json.dumps(player)) for player in players]
+
+def sort_key(player):
+    return (player['position'], -player['stats']['totalPoints'])
+
+# Each stage is (name, prepare, run): prepare(fixtures, players) builds fresh
+# input outside the timed region, run(input) returns the number of ops done.
+
+def run_decode(bodies):
+    for body in bodies:
+        json.loads(body)
+    return len(bodies)
+
+def run_parse(pages):
+    for html in pages:
+        fantasypros.parse_rankings(html)
+    return len(pages)
+
+def run_normalize(entries):
+    teams = team_registry.TeamRegistry(team_registry.FALLBACK_TEAMS)
+    with tempfile.TemporaryDirectory() as tmp:
+        id_map = player_ids.PlayerIdMap(os.path.join(tmp, 'player_ids.json'))
+        for player_data, position in entries:
+            scrape_nfl_data.normalize_espn_player(player_data, position, teams, id_map)
+    return len(entries)
+
+def run_injury(players):
+    return len(scrape_nfl_data.scrape_injury_data(players))
+
+def run_projections(players):
+    return len(scrape_nfl_data.calculate_player_stats(players))
+
+def run_sort(players):
+    return sum(1 for _ in pipeline.sort_stream(players, key=sort_key))
+
+def run_external_sort(players):
+    return sum(1 for _ in pipeline.sort_stream(players, key=sort_key, memory_budget=len(players) // 8 or 1))
+
+def run_write(players):
+    with tempfile.TemporaryDirectory() as tmp:
+        written = pipeline.write_players(players, path=os.path.join(tmp, 'players.json'))
+    return written['totalPlayers']
+
+STAGES = [
+    ('decode', lambda fixtures, players: fixtures['bodies'], run_decode),
+    ('parse', lambda fixtures, players: fixtures['pages'], run_parse),
+    ('normalize', lambda fixtures, players: fixtures['entries'], run_normalize),
+    ('injury', lambda fixtures, players: copy_players(players), run_injury),
+    ('projections', lambda fixtures, players: copy_players(players), run_projections),
+    ('sort', lambda fixtures, players: copy_players(players), run_sort),
+    ('sort_external', lambda fixtures, players: copy_players(players), run_external_sort),
+    ('json_write', lambda fixtures, players: copy_players(players), run_write)
+]
+
+def normalized_players(entries):
+    teams = team_registry.TeamRegistry(team_registry.FALLBACK_TEAMS)
+    with tempfile.TemporaryDirectory() as tmp:
+        id_map = player_ids.PlayerIdMap(os.path.join(tmp, 'player_ids.json'))
+        return [scrape_nfl_data.normalize_espn_player(player_data, position, teams, id_map)
+                for player_data, position in entries]
+
+def measure(prepare, run, fixtures, players, repeat):
+    """(ops/sec of the best run, peak traced bytes of one extra run)
+
+    Each timed run repeats the stage on fresh input until it has taken at
+    least MIN_RUN_TIME, so fast stages aren't timed off a few milliseconds.
+    """
+    best = None
+    for _ in range(repeat):
+        count = elapsed = 0
+        while elapsed < MIN_RUN_TIME:
+            data = prepare(fixtures, players)
+            start = time.perf_counter()
+            count += run(data)
+            elapsed += time.perf_counter() - start
+        rate = count / elapsed
+        best = rate if best is None else max(best, rate)
+
+    data = prepare(fixtures, players)
+    tracemalloc.start()
+    run(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def compare(results, baseline, threshold):
+    """Regression messages for stages slower or larger than the baseline allows"""
+    regressions = []
+    for stage, result in results.items():
+        base = baseline['stages'].get(stage)
+        if not base:
+            continue
+        if result['opsPerSec'] < base['opsPerSec'] * (1 - threshold):
+            regressions.append(f"{stage}: {result['opsPerSec']:,.0f} ops/sec vs baseline {base['opsPerSec']:,.0f}")
+        if result['peakMemory'] > base['peakMemory'] * (1 + threshold):
+            regressions.append(f"{stage}: peak {result['peakMemory'] / 1024:,.0f} KB vs baseline "
+                               f"{base['peakMemory'] / 1024:,.0f} KB")
+    return regressions
+
+def main(repeat=3, scale=10, stages=None, threshold=DEFAULT_THRESHOLD, save_baseline=False):
+    random.seed(0)
+    fixtures = load_fixtures(scale)
+    players = normalized_players(fixtures['entries'])
+    print(f"Fixtures: {len(fixtures['bodies'])} bodies, {len(fixtures['pages'])} ranking pages, "
+          f"{len(players)} players (x{scale})\n")
+
+    baseline = None if save_baseline else load_baseline()
+    print(f"{'stage':<15}{'ops/sec':>14}{'peak':>12}{'vs baseline':>14}")
+    results = {}
+    for name, prepare, run in STAGES:
+        if stages and name not in stages:
+            continue
+        rate, peak = measure(prepare, run, fixtures, players, repeat)
+        results[name] = {'opsPerSec': round(rate, 1), 'peakMemory': peak}
+
+        change = ''
+        base = baseline['stages'].get(name) if baseline else None
+        if base:
+            change = f"{rate / base['opsPerSec'] - 1:+.0%}"
+        print(f"{name:<15}{rate:>14,.0f}{peak / 1024:>10,.0f}KB{change:>14}")
+
+    if save_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'scale': scale,
+                'stages': results
+            }, f, indent=2)
+        print(f"\nSaved baseline to {BASELINE_PATH}")
+        return 0
+
+    if baseline is None:
+        print("\nNo baseline yet; run with --save-baseline to store one")
+        return 0
+    if baseline.get('scale') != scale:
+        print(f"\nBaseline was recorded at --scale {baseline.get('scale')}, comparing anyway")
+
+    regressions = compare(results, baseline, threshold)
+    if regressions:
+        print(f"\nRegressions beyond {threshold:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"\nNo stage regressed beyond {threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every scraper stage against a stored baseline")
+    parser.add_argument('--fetch', action='store_true',
+                        help="Record live ESPN pages as fixtures before benchmarking")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Timed runs per stage; the best run is reported (default: 3)")
+    parser.add_argument('--scale', type=int, default=10,
+                        help="Copies of the fixtures to run through each stage (default: 10)")
+    parser.add_argument('--stages', default='',
+                        help="Comma-separated stages to run (default: all)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown or memory growth before failing (default: 0.25)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"Store this run as the new baseline in {os.path.relpath(BASELINE_PATH)}")
+    args = parser.parse_args()
+    if args.fetch:
+        fetch_fixtures()
+    sys.exit(main(repeat=args.repeat, scale=args.scale,
+                  stages=[stage.strip() for stage in args.stages.split(',') if stage.strip()],
+                  threshold=args.threshold, save_baseline=args.save_baseline))
@@ -0,0 +1,87 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import player_names
+
+# Name-index build and lookup speed on synthetic rosters: exact lookups of
+# names spelled the way another source would (case, punctuation, suffixes)
+# and fuzzy lookups of names with one typo in the last name.
+#
+#   python benchmarks/bench_player_names.py --sizes 1000,10000,50000
+
+FIRST = ['Josh', 'Patrick', 'Jalen', 'Lamar', "Ja'Marr", 'Justin', 'Travis', 'Kenneth', 'Amon-Ra',
+         'Christian', 'Saquon', 'Derrick', 'Tyreek', 'Cooper', 'Mike', 'Davante', 'Stefon', 'Keenan',
+         'Darren', 'Kyle', 'George', 'Mark', 'Dallas', 'Brandon', 'DeVonta', 'Garrett', 'Chris', 'J.K.']
+ONSETS = ['', 'b', 'br', 'c', 'ch', 'd', 'f', 'g', 'h', 'j', 'k', 'l', 'm', 'mc', 'n', 'p', 'r', 's', 'st',
+          't', 'th', 'v', 'w', 'y', 'z']
+VOWELS = ['a', 'e', 'i', 'o', 'u', 'ai', 'ee', 'ou']
+CODAS = ['', '', 'n', 'r', 'l', 'ck', 's', 'tt', 'ng', 'x', 'm', 'rd']
+SUFFIXES = ['', '', '', '', ' Jr.', ' III', ' II']
+
+def synthetic_names(n, seed=0):
+    """(name, misspelled name) for n distinct players with made-up last names"""
+    rng = random.Random(seed)
+    names, seen = [], set()
+    while len(names) < n:
+        first = rng.choice(FIRST)
+        last = ''.join(rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS)
+                       for _ in range(rng.randint(2, 3))).capitalize()
+        if len(last) < 4 or (first, last) in seen:
+            continue
+        seen.add((first, last))
+        suffix = rng.choice(SUFFIXES)
+        names.append((f"{first} {last}{suffix}", f"{first} {typo(last, rng)}{suffix}"))
+    return names
+
+def respell(name, rng):
+    """The same player as another source would print him"""
+    name = name.replace('.', '').replace("'", '')
+    for suffix in (' Jr', ' III', ' II'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name.upper() if rng.random() < 0.5 else name.lower()
+
+def typo(last, rng):
+    """Drop or swap one letter after the first"""
+    i = rng.randrange(1, len(last) - 1)
+    if rng.random() < 0.5:
+        return last[:i] + last[i + 1:]
+    return last[:i] + last[i + 1] + last[i] + last[i + 2:]
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+def main(sizes, queries):
+    rng = random.Random(0)
+    print(f"{'names':>8}{'build':>10}{'exact/sec':>14}{'fuzzy/sec':>14}{'fuzzy hits':>12}")
+    for n in sizes:
+        names = synthetic_names(n)
+        build, index = timed(player_names.NameIndex, ((name, i) for i, (name, misspelled) in enumerate(names)))
+
+        sample = [rng.randrange(n) for _ in range(queries)]
+        exact = [respell(names[i][0], rng) for i in sample]
+        fuzzy = [names[i][1] for i in sample]
+
+        exact_time, found = timed(lambda: [index.get(name) for name in exact])
+        assert found == sample, "respelled names should all match exactly"
+        fuzzy_time, found = timed(lambda: [index.get(name) for name in fuzzy])
+        hits = sum(1 for i, value in zip(sample, found) if i == value)
+
+        print(f"{n:>8,}{build:>9.3f}s{queries / exact_time:>14,.0f}{queries / fuzzy_time:>14,.0f}"
+              f"{hits / queries:>12.1%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the player name index")
+    parser.add_argument('--sizes', default='1000,10000,50000',
+                        help="Comma-separated index sizes (default: 1000,10000,50000)")
+    parser.add_argument('--queries', type=int, default=5000,
+                        help="Lookups per size and kind (default: 5000)")
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(',')], args.queries)
@@ -0,0 +1,67 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import projection_engine
+import scrape_all_nfl_players
+import scrape_comprehensive_nfl
+
+# Per-player projection/injury functions vs the vectorized batch engine on
+# synthetic player tables of increasing size.
+#
+#   python benchmarks/bench_projection_engine.py --sizes 1000,100000,1000000
+
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+
+def synthetic_players(n, seed=0):
+    """Column arrays of n players: position, rank in position, age, experience"""
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(POSITIONS, n)
+    ranks = rng.integers(1, 65, n)
+    ages = rng.integers(21, 37, n)
+    experience = np.clip(ages - 22 + rng.integers(-1, 2, n), 0, 15)
+    return positions, ranks, ages, experience
+
+def per_player(positions, ranks, ages, experience):
+    """Both generators' per-player functions over every row"""
+    for position, rank, age, exp in zip(positions.tolist(), ranks.tolist(), ages.tolist(), experience.tolist()):
+        scrape_comprehensive_nfl.calculate_fantasy_projections({'position': position}, rank)
+        scrape_comprehensive_nfl.calculate_injury_risk({'position': position, 'name': ''})
+        player = {'position': position, 'age': age, 'experience': exp}
+        scrape_all_nfl_players.calculate_fantasy_projections(player)
+        scrape_all_nfl_players.calculate_injury_risk(player)
+
+def batch(positions, ranks, ages, experience, seed=0):
+    rng = projection_engine.default_rng(seed)
+    positions = projection_engine.encode_positions(positions)
+    projection_engine.project_by_rank(positions, ranks, rng)
+    projection_engine.injury_risk(positions, rng=rng, noise=0.05)
+    projection_engine.project_by_experience(positions, experience, rng)
+    projection_engine.injury_risk(positions, ages, rng=rng)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+def main(sizes):
+    random.seed(0)
+    print(f"{'rows':>10}{'per-player':>14}{'batch':>12}{'speedup':>10}")
+    for n in sizes:
+        columns = synthetic_players(n)
+        loop = timed(per_player, *columns)
+        vectorized = timed(batch, *columns)
+        print(f"{n:>10,}{loop:>13.3f}s{vectorized:>11.3f}s{loop / vectorized:>9.0f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the batch projection engine")
+    parser.add_argument('--sizes', default='1000,100000,1000000',
+                        help="Comma-separated row counts (default: 1000,100000,1000000)")
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(',')])
@@ -0,0 +1,301 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+import columnar
+
+# Fixed-width binary player table for analysis code that loads big datasets
+# (multi-season history, simulated leagues) and shouldn't pay for parsing
+# nested JSON. Opening a file maps it and reads a 32-byte header plus a small
+# JSON schema; every numeric column is then a zero-copy memoryview (or numpy
+# array) over the mapping.
+#
+# Layout, little-endian:
+#
+#   header   magic "DRFTTBL1", version u32, flags u32, rows u64, schema offset u64
+#   columns  one block per column, each starting on a page boundary, so a scan
+#            over one column only faults in that column's pages
+#            - numeric: rows x uint8/uint16/uint32/float32
+#            - dict:    rows x uint16 codes; the values are in the schema
+#            - str:     (rows + 1) x uint32 offsets into a UTF-8 string table
+#   schema   JSON: row count, kind, and per column its name, type, record
+#            path, byte offset and (dict) dictionary
+#
+#   python3 binary_table.py --players data/players.json      # write data/players.bin
+#   python3 binary_table.py --history                        # player-seasons to data/history.bin
+#   python3 binary_table.py --info data/players.bin
+
+BINARY_PATH = 'data/players.bin'
+HISTORY_BINARY_PATH = 'data/history.bin'
+
+MAGIC = b'DRFTTBL1'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIIQQ')
+PAGE_SIZE = 4096
+
+# column type -> array typecode (numpy dtypes are the little-endian equivalents)
+TYPECODES = {'uint8': 'B', 'uint16': 'H', 'uint32': 'I', 'float32': 'f'}
+DTYPES = {'uint8': '<u1', 'uint16': '<u2', 'uint32': '<u4', 'float32': '<f4'}
+DICT_TYPE = 'uint16'
+OFFSET_TYPE = 'uint32'
+
+# (column, type, path into the record): the columnar export's numeric columns plus strings
+PLAYER_COLUMNS = ([(name, kind, path) for name, (kind, path) in columnar.NUMERIC_COLUMNS.items()] + [
+    ('name', 'str', ('name',)),
+    ('sourceId', 'str', ('sourceId',)),
+    ('position', 'dict', ('position',)),
+    ('team', 'dict', ('team',))
+])
+
+# One row per player-season in the history store (history.py)
+SEASON_COLUMNS = [
+    ('player_id', 'uint32', ('player_id',)),
+    ('season', 'uint16', ('season',)),
+    ('games_played', 'uint8', ('games_played',)),
+    ('total_points', 'float32', ('total_points',)),
+    ('average_points', 'float32', ('average_points',)),
+    ('consistency', 'float32', ('consistency',)),
+    ('risk_score', 'float32', ('risk_score',)),
+    ('games_injured', 'uint8', ('games_injured',)),
+    ('name', 'str', ('name',)),
+    ('source_id', 'str', ('source_id',)),
+    ('position', 'dict', ('position',)),
+    ('team', 'dict', ('team',)),
+    ('source', 'dict', ('source',))
+]
+
+def _aligned(offset):
+    return -(-offset // PAGE_SIZE) * PAGE_SIZE
+
+def _little_endian(values):
+    """Bytes of an array in file byte order"""
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+class TableBuilder:
+    """Accumulates records into compact per-column arrays; call add() per record, then write()"""
+
+    def __init__(self, columns=PLAYER_COLUMNS, kind='players'):
+        self.columns = columns
+        self.kind = kind
+        self.length = 0
+        self.values = {}
+        self.dictionaries = {}
+        self.lookup = {}
+        for name, kind, field_path in columns:
+            if kind == 'str':
+                self.values[name] = (array(TYPECODES[OFFSET_TYPE], [0]), bytearray())
+            elif kind == 'dict':
+                self.values[name] = array(TYPECODES[DICT_TYPE])
+                self.dictionaries[name] = []
+                self.lookup[name] = {}
+            else:
+                self.values[name] = array(TYPECODES[kind])
+
+    def __len__(self):
+        return self.length
+
+    def add(self, record):
+        for name, kind, field_path in self.columns:
+            value = columnar._field(record, field_path)
+            if kind == 'str':
+                offsets, data = self.values[name]
+                data += (value or '').encode()
+                offsets.append(len(data))
+            elif kind == 'dict':
+                code = self.lookup[name].get(value)
+                if code is None:
+                    code = self.lookup[name][value] = len(self.dictionaries[name])
+                    self.dictionaries[name].append(value)
+                self.values[name].append(code)
+            elif kind == 'float32':
+                self.values[name].append(float(value or 0))
+            else:
+                self.values[name].append(int(value or 0))
+        self.length += 1
+        return record
+
+    def write(self, path=BINARY_PATH):
+        """Write the table atomically; returns the file size"""
+        tmp_path = path + '.tmp'
+        schema = {'kind': self.kind, 'rows': self.length, 'columns': []}
+        with open(tmp_path, 'wb') as f:
+            f.write(b'\0' * HEADER.size)
+            for name, kind, field_path in self.columns:
+                column = {'name': name, 'type': kind, 'path': list(field_path)}
+                if kind == 'str':
+                    offsets, data = self.values[name]
+                    column['offset'] = self._block(f, _little_endian(offsets))
+                    column['dataOffset'] = self._block(f, bytes(data))
+                    column['dataLength'] = len(data)
+                else:
+                    column['offset'] = self._block(f, _little_endian(self.values[name]))
+                    if kind == 'dict':
+                        column['dictionary'] = self.dictionaries[name]
+                schema['columns'].append(column)
+
+            schema_offset = f.tell()
+            f.write(json.dumps(schema, separators=(',', ':')).encode())
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, self.length, schema_offset))
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    @staticmethod
+    def _block(f, data):
+        """Write `data` at the next page boundary; returns its offset"""
+        offset = _aligned(f.tell())
+        f.seek(offset)
+        f.write(data)
+        return offset
+
+class BinaryTable:
+    """Read-only view of a table written by TableBuilder, backed by mmap
+
+    Numeric columns come back as memoryviews (column()) or numpy arrays
+    (array()) over the mapping without copying; the mapping stays open while
+    any of them is alive.
+    """
+
+    def __init__(self, path=BINARY_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, rows, schema_offset = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.mm.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} player table")
+        schema = json.loads(self.mm[schema_offset:])
+        self.kind = schema['kind']
+        self.length = rows
+        self.columns = {column['name']: column for column in schema['columns']}
+
+    def __len__(self):
+        return self.length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        try:
+            self.mm.close()
+        except BufferError:
+            # Views handed out are still alive; the mapping goes when they do
+            pass
+
+    def _view(self, kind, offset, count):
+        # memoryviews use native byte order, so these need a little-endian host; array() doesn't
+        itemsize = struct.calcsize(TYPECODES[kind])
+        return memoryview(self.mm)[offset:offset + count * itemsize].cast(TYPECODES[kind])
+
+    def column(self, name):
+        """Zero-copy memoryview of a numeric column (dict columns give their codes)"""
+        column = self.columns[name]
+        if column['type'] == 'str':
+            raise TypeError(f"{name} is a string column; use strings() or value()")
+        kind = DICT_TYPE if column['type'] == 'dict' else column['type']
+        return self._view(kind, column['offset'], self.length)
+
+    def array(self, name):
+        """Zero-copy numpy array of a numeric column (dict columns give their codes)"""
+        import numpy as np
+
+        column = self.columns[name]
+        kind = DICT_TYPE if column['type'] == 'dict' else column['type']
+        return np.frombuffer(self.mm, dtype=DTYPES[kind], count=self.length, offset=column['offset'])
+
+    def value(self, name, row):
+        column = self.columns[name]
+        if column['type'] == 'str':
+            offsets = self._view(OFFSET_TYPE, column['offset'], self.length + 1)
+            start = column['dataOffset']
+            return self.mm[start + offsets[row]:start + offsets[row + 1]].decode()
+        value = self.column(name)[row]
+        return column['dictionary'][value] if column['type'] == 'dict' else value
+
+    def strings(self, name):
+        """Every value of a string column, decoded"""
+        return [self.value(name, row) for row in range(self.length)]
+
+    def record(self, row):
+        """Row `row` rebuilt as a nested record, like the JSON it came from"""
+        record = {}
+        for name, column in self.columns.items():
+            target = record
+            for key in column['path'][:-1]:
+                target = target.setdefault(key, {})
+            target[column['path'][-1]] = self.value(name, row)
+        return record
+
+def write_history(path=HISTORY_BINARY_PATH, history_path=None):
+    """Export every player-season in the history store; returns (rows, bytes)"""
+    import sqlite3
+
+    import history
+
+    builder = TableBuilder(SEASON_COLUMNS, kind='player_seasons')
+    connection = history.connect(history_path or history.HISTORY_PATH)
+    connection.row_factory = sqlite3.Row
+    try:
+        names = ', '.join(name for name, kind, field_path in SEASON_COLUMNS)
+        for row in connection.execute(f"SELECT {names} FROM player_seasons ORDER BY season, position, player_id"):
+            builder.add(dict(row))
+    finally:
+        connection.close()
+    return len(builder), builder.write(path)
+
+def print_info(path):
+    start = time.perf_counter()
+    table = BinaryTable(path)
+    opened = time.perf_counter() - start
+    print(f"{path}: {table.kind}, {len(table):,} rows, {os.path.getsize(path) / 1024:.1f} KB, "
+          f"opened in {opened * 1000:.2f}ms")
+    for name, column in table.columns.items():
+        print(f"  {name:<18} {column['type']:<8} at {column['offset']}")
+    if len(table):
+        print(f"  row 0: {table.record(0)}")
+    table.close()
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--players', default=None, metavar='PATH',
+                        help=f"Convert a player file (JSON array or .ndjson) to {BINARY_PATH}")
+    parser.add_argument('--history', action='store_true',
+                        help=f"Export the player-seasons in the history store to {HISTORY_BINARY_PATH}")
+    parser.add_argument('--output', default=None,
+                        help="Write the table here instead of the default path")
+    parser.add_argument('--info', default=None, metavar='PATH',
+                        help="Print a table's schema, size and open time")
+
+def run(args):
+    if args.players:
+        import rankings
+
+        builder = TableBuilder()
+        for player in rankings.load_players(args.players):
+            builder.add(player)
+        path = args.output or BINARY_PATH
+        print(f"Saved {len(builder)} players to {path} ({builder.write(path) / 1024:.1f} KB)")
+    if args.history:
+        path = args.output or HISTORY_BINARY_PATH
+        rows, size = write_history(path)
+        print(f"Saved {rows} player-seasons to {path} ({size / 1024:.1f} KB)")
+    if args.info:
+        print_info(args.info)
+    if not (args.players or args.history or args.info):
+        print_info(BINARY_PATH)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write or inspect the memory-mapped binary player table")
+    add_arguments(parser)
+    run(parser.parse_args())
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import random
+import tempfile
+
+# Reproducible builds. Every random draw in the generators comes from a
+# generator seeded with (build seed, player key, stage), so a player's numbers
+# don't depend on fetch order or on which other players are in the build.
+# Each generator also hashes its inputs (parameters, static tables, fetched
+# records and its own code); when the hash and the output files match the
+# last build recorded in data/build_state.json, the build is skipped.
+
+BUILD_STATE_PATH = 'data/build_state.json'
+DEFAULT_SEED = 2024
+
+def player_rng(seed, *key):
+    """random.Random seeded from the build seed and a per-player key"""
+    return random.Random(':'.join(str(part) for part in (seed,) + key))
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class InputHash:
+    """Content hash over everything a build's output depends on"""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.digest = hashlib.sha256()
+        self.update('generator', generator)
+
+    def update(self, label, value):
+        """Hash a JSON-serializable value under a label"""
+        self.digest.update(label.encode())
+        self.digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+
+    def update_code(self, *modules):
+        """Hash module sources so a code change invalidates the last build"""
+        for module in modules:
+            path = module if isinstance(module, str) else module.__file__
+            self.update('code', os.path.basename(path))
+            self.digest.update(file_digest(path).encode())
+
+    def spool(self, label, records):
+        """Hash a stream of records under a label without holding it in memory
+
+        The records go to a temporary file as they're hashed; the returned
+        Spool replays them once the hash has decided there is a build to do.
+        """
+        self.digest.update(label.encode())
+        spool = Spool()
+        for record in records:
+            self.digest.update(json.dumps(record, sort_keys=True, default=str).encode())
+            spool.append(record)
+        return spool
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+class Spool:
+    """Records in a temporary NDJSON file; each iteration reads them back from the start"""
+
+    def __init__(self):
+        self.handle = tempfile.TemporaryFile('w+')
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def append(self, record):
+        self.handle.write(json.dumps(record))
+        self.handle.write('\n')
+        self.length += 1
+
+    def __iter__(self):
+        self.handle.seek(0)
+        for line in self.handle:
+            yield json.loads(line)
+
+    def close(self):
+        self.handle.close()
+
+def load_state(path=BUILD_STATE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def is_current(inputs, path=BUILD_STATE_PATH):
+    """True if the last build of this generator had the same inputs and its outputs are untouched"""
+    entry = load_state(path).get(inputs.generator)
+    if not entry or entry.get('inputHash') != inputs.hexdigest():
+        return False
+
+    for output, digest in entry.get('outputs', {}).items():
+        if not os.path.exists(output) or file_digest(output) != digest:
+            return False
+    return True
+
+def record(inputs, outputs, path=BUILD_STATE_PATH):
+    """Remember the input hash and output file hashes of a finished build"""
+    state = load_state(path)
+    state[inputs.generator] = {
+        'inputHash': inputs.hexdigest(),
+        'outputs': {output: file_digest(output) for output in outputs if os.path.exists(output)}
+    }
+    with open(path, 'w') as f:
+        json.dump(state, f, indent=2)
+
+def current_builds(owning=None, path=BUILD_STATE_PATH):
+    """Generators whose recorded outputs are all untouched on disk
+
+    With `owning`, only the builds that wrote that file.
+    """
+    builds = []
+    for generator, entry in load_state(path).items():
+        outputs = entry.get('outputs', {})
+        if owning is not None and os.path.normpath(owning) not in map(os.path.normpath, outputs):
+            continue
+        if all(os.path.exists(output) and file_digest(output) == digest for output, digest in outputs.items()):
+            builds.append(generator)
+    return builds
+
+def refresh_outputs(generators, path=BUILD_STATE_PATH):
+    """Re-hash the outputs of these builds after a tool rewrote them in place (simulation.py)"""
+    state = load_state(path)
+    for generator in generators:
+        outputs = state.get(generator, {}).get('outputs', {})
+        for output in outputs:
+            if os.path.exists(output):
+                outputs[output] = file_digest(output)
+    with open(path, 'w') as f:
+        json.dump(state, f, indent=2)
+
+def skip_if_current(inputs, force=False):
+    """Print and return True when the build can be skipped"""
+    if force or not is_current(inputs):
+        return False
+    print(f"Inputs unchanged since the last build ({inputs.hexdigest()[:12]}), nothing to do. "
+          f"Use --force to rebuild anyway.")
+    return True
+
+def add_build_arguments(parser):
+    """Seed and skip options shared by the generator scripts"""
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f"Seed for every projection and injury draw (default: {DEFAULT_SEED})")
+    parser.add_argument('--force', action='store_true',
+                        help="Rebuild even when the inputs match the last build")
@@ -0,0 +1,142 @@
+import json
+import os
+
+# Columnar (struct-of-arrays) export of the player stream for the browser.
+# Numeric fields become one array per field with a declared element type the
+# draft board loads into typed arrays, position/team are dictionary encoded,
+# and `byPosition` lists row indexes per position sorted by projected points,
+# so ranking code can walk presorted lists instead of filtering and sorting.
+
+COLUMNAR_PATH = 'data/players.columns.json'
+FORMAT_VERSION = 1
+
+# column -> (typed array type, path into the player record)
+NUMERIC_COLUMNS = {
+    'id': ('uint32', ('id',)),
+    'gamesPlayed': ('uint8', ('stats', 'gamesPlayed')),
+    'totalPoints': ('float32', ('stats', 'totalPoints')),
+    'averagePoints': ('float32', ('stats', 'averagePoints')),
+    'consistency': ('float32', ('stats', 'consistency')),
+    'riskScore': ('float32', ('injury', 'riskScore')),
+    'gamesInjured': ('uint8', ('injury', 'gamesInjured')),
+    # Season outcome percentiles from simulation.py (0 when not simulated)
+    'simP10': ('float32', ('simulation', 'p10')),
+    'simP50': ('float32', ('simulation', 'p50')),
+    'simP90': ('float32', ('simulation', 'p90')),
+    # Previous season from history.py (season 0 when the store has none)
+    'prevSeason': ('uint16', ('previousYearStats', 'season')),
+    'prevGamesPlayed': ('uint8', ('previousYearStats', 'gamesPlayed')),
+    'prevTotalPoints': ('float32', ('previousYearStats', 'totalPoints')),
+    'prevAveragePoints': ('float32', ('previousYearStats', 'averagePoints')),
+    'prevConsistency': ('float32', ('previousYearStats', 'consistency'))
+}
+
+DICTIONARY_COLUMNS = ['position', 'team']
+
+FLOAT_DIGITS = 3
+
+def _field(record, path):
+    value = record
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+class ColumnarBuilder:
+    """Accumulates records column by column; call add() per player, then write()"""
+
+    def __init__(self):
+        self.names = []
+        self.numeric = {column: [] for column in NUMERIC_COLUMNS}
+        self.dictionaries = {column: [] for column in DICTIONARY_COLUMNS}
+        self.codes = {column: [] for column in DICTIONARY_COLUMNS}
+        self.lookup = {column: {} for column in DICTIONARY_COLUMNS}
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, record):
+        self.names.append(record.get('name'))
+
+        for column, (kind, path) in NUMERIC_COLUMNS.items():
+            value = _field(record, path) or 0
+            if kind == 'float32':
+                value = round(float(value), FLOAT_DIGITS)
+            else:
+                value = int(value)
+            self.numeric[column].append(value)
+
+        for column in DICTIONARY_COLUMNS:
+            value = record.get(column)
+            code = self.lookup[column].get(value)
+            if code is None:
+                code = len(self.dictionaries[column])
+                self.lookup[column][value] = code
+                self.dictionaries[column].append(value)
+            self.codes[column].append(code)
+        return record
+
+    def position_indexes(self):
+        """Row indexes per position, highest projected points first"""
+        points = self.numeric['totalPoints']
+        indexes = {}
+        for row, code in enumerate(self.codes['position']):
+            indexes.setdefault(self.dictionaries['position'][code], []).append(row)
+        for rows in indexes.values():
+            rows.sort(key=lambda row: -points[row])
+        return indexes
+
+    def to_dict(self):
+        return {
+            'version': FORMAT_VERSION,
+            'length': len(self),
+            'types': {column: kind for column, (kind, path) in NUMERIC_COLUMNS.items()},
+            'columns': {
+                'name': self.names,
+                **self.numeric,
+                **{column: {'dictionary': self.dictionaries[column], 'codes': self.codes[column]}
+                   for column in DICTIONARY_COLUMNS}
+            },
+            'byPosition': self.position_indexes()
+        }
+
+    def write(self, path=COLUMNAR_PATH):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+def columns_to_players(data):
+    """Rebuild nested player records from a columnar export"""
+    columns = data['columns']
+    players = []
+    for row in range(data['length']):
+        decoded = {column: columns[column]['dictionary'][columns[column]['codes'][row]]
+                   for column in DICTIONARY_COLUMNS}
+        players.append({
+            'id': columns['id'][row],
+            'name': columns['name'][row],
+            'position': decoded['position'],
+            'team': decoded['team'],
+            'stats': {
+                'gamesPlayed': columns['gamesPlayed'][row],
+                'totalPoints': columns['totalPoints'][row],
+                'averagePoints': columns['averagePoints'][row],
+                'consistency': columns['consistency'][row]
+            },
+            'injury': {
+                'gamesInjured': columns['gamesInjured'][row],
+                'riskScore': columns['riskScore'][row]
+            }
+        })
+        if columns.get('simP50') and columns['simP50'][row]:
+            players[-1]['simulation'] = {key: columns[f"simP{key[1:]}"][row] for key in ('p10', 'p50', 'p90')}
+        if columns.get('prevSeason') and columns['prevSeason'][row]:
+            players[-1]['previousYearStats'] = {
+                'season': columns['prevSeason'][row],
+                'gamesPlayed': columns['prevGamesPlayed'][row],
+                'totalPoints': columns['prevTotalPoints'][row],
+                'averagePoints': columns['prevAveragePoints'][row],
+                'consistency': columns['prevConsistency'][row]
+            }
+    return players
@@ -0,0 +1,56 @@
+import importlib
+import sys
+
+# One entry point for every data build:
+#
+#   python3 draft.py static            # players.json from the built-in lists
+#   python3 draft.py espn --offline    # ESPN / FantasyPros rankings from the cache
+#   python3 draft.py rosters --help
+#
+# Each subcommand lives in its own script, which still runs on its own. Only
+# the chosen script is imported, and requests, bs4 and numpy are imported by
+# the code that needs them, so --help and the offline/static builds start fast.
+
+COMMANDS = {
+    'fetch-raw': ('fetch_nfl_stats', "Fetch raw NFL data from public APIs"),
+    'espn': ('scrape_nfl_data', "Scrape fantasy rankings from ESPN / FantasyPros"),
+    'rosters': ('scrape_all_nfl_players', "Collect fantasy data for every NFL roster"),
+    'static': ('scrape_comprehensive_nfl', "Build players.json from the built-in 2024 player lists"),
+    'merge': ('merge', "Merge several player sources into one players.json"),
+    'rank': ('rankings', "Precompute draft rankings for common league configurations"),
+    'history': ('history', "Import a past season or list the seasons in the history store"),
+    'game-logs': ('game_logs', "Ingest weekly game logs and compute player consistency"),
+    'table': ('binary_table', "Write or inspect the memory-mapped binary player table")
+}
+
+def print_usage(out=sys.stdout):
+    print("usage: draft.py <command> [options]\n", file=out)
+    print("Build the draft board's player data.\n", file=out)
+    print("commands:", file=out)
+    for name, (module, help_text) in COMMANDS.items():
+        print(f"  {name:<11}{help_text}", file=out)
+    print("\nRun `draft.py <command> --help` for a command's options.", file=out)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0
+
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"draft.py: unknown command '{name}'\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        return 2
+
+    import argparse
+
+    module_name, help_text = COMMANDS[name]
+    module = importlib.import_module(module_name)
+    parser = argparse.ArgumentParser(prog=f"draft.py {name}", description=help_text)
+    module.add_arguments(parser)
+    module.run(parser.parse_args(rest))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import importlib.util
+import re
+
+# Parsing for the FantasyPros position ranking pages. The fast path builds only
+# the page's tables (SoupStrainer) with lxml when it is installed; the legacy
+# path parses the whole page with html.parser and is kept for comparison.
+# bs4 is imported when a page is first parsed, not when this module loads.
+
+RANKINGS_URL = "https://www.fantasypros.com/nfl/rankings/{position}.php"
+POSITIONS = ['qb', 'rb', 'wr', 'te', 'k', 'dst']
+
+FAST_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+HEADER_RE = re.compile('Player|Rank', re.I)
+TRAILING_TEAM_RE = re.compile(r'\s+[A-Z]{2,3}$')
+TEAM_RE = re.compile(r'\b([A-Z]{2,3})\b')
+
+_tables_only = None
+
+def tables_only():
+    """SoupStrainer that builds only <table> subtrees, skipping the nav, scripts and articles"""
+    global _tables_only
+    if _tables_only is None:
+        from bs4 import SoupStrainer
+        _tables_only = SoupStrainer('table')
+    return _tables_only
+
+def find_rankings_table(soup):
+    """The rankings table in a parsed page, or None"""
+    table = soup.find('table', {'id': 'ranking-table'})
+    if not table:
+        table = soup.find('table', {'class': 'rankings-table'})
+    if not table:
+        # Try to find any table with player data
+        for t in soup.find_all('table'):
+            if t.find('th', string=HEADER_RE):
+                return t
+    return table
+
+def parse_player_cell(player_cell):
+    """(name, team) from a rankings row's player cell"""
+    player_link = player_cell.find('a')
+    team_text = player_cell.get_text(strip=True)
+
+    if player_link:
+        player_name = player_link.text.strip()
+    else:
+        # Remove team abbreviation if present
+        player_name = TRAILING_TEAM_RE.sub('', team_text)
+
+    team_match = TEAM_RE.search(team_text)
+    return player_name, team_match.group(1) if team_match else 'FA'
+
+def parse_rankings(html, limit=50, fast=True):
+    """(name, team) for the top `limit` rows of a rankings page, or None if no table is found"""
+    from bs4 import BeautifulSoup
+
+    if fast:
+        soup = BeautifulSoup(html, FAST_PARSER, parse_only=tables_only())
+    else:
+        soup = BeautifulSoup(html, 'html.parser')
+
+    table = find_rankings_table(soup)
+    if not table:
+        return None
+
+    players = []
+    for row in table.find_all('tr')[1:limit + 1]:  # Skip header row
+        cells = row.find_all('td')
+        if len(cells) < 2:
+            continue
+        # Player name is usually in the second column
+        players.append(parse_player_cell(cells[1]))
+    return players
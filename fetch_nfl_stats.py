@@ -1,21 +1,19 @@
+import argparse
 import json
-import requests
 from datetime import datetime
 
+import http_client
+
 def fetch_nfl_stats():
     """Fetch NFL player stats from public APIs"""
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     # Try ESPN's public API endpoints
     print("Attempting to fetch NFL data from ESPN public API...")
     
     try:
         # ESPN NFL scoreboard endpoint - this is public
         scoreboard_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-        response = requests.get(scoreboard_url, headers=headers)
+        response = http_client.get(scoreboard_url)
         
         if response.status_code == 200:
             print("Successfully connected to ESPN API")
@@ -23,7 +21,7 @@ def fetch_nfl_stats():
             
             # Try to get team and player information
             teams_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams"
-            teams_response = requests.get(teams_url, headers=headers)
+            teams_response = http_client.get(teams_url)
             
             if teams_response.status_code == 200:
                 teams_data = teams_response.json()
@@ -48,7 +46,7 @@ def fetch_nfl_stats():
     try:
         # The Sports DB provides free sports data
         players_url = "https://www.thesportsdb.com/api/v1/json/3/searchplayers.php?p=Tom%20Brady"
-        response = requests.get(players_url, headers=headers)
+        response = http_client.get(players_url)
         
         if response.status_code == 200:
             data = response.json()
@@ -64,9 +62,24 @@ def fetch_nfl_stats():
     
     return False
 
-if __name__ == "__main__":
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--offline', action='store_true',
+                        help="Serve every request from the response cache, never the network")
+    parser.add_argument('--base-url', default=None,
+                        help="Send every request to this server instead, e.g. http://127.0.0.1:8765 for mock_server.py")
+
+def run(args):
+    http_client.use_mock_root(args.base_url)
+    http_client.configure(offline=args.offline, base_url=args.base_url)
+    
     success = fetch_nfl_stats()
     if success:
         print("\nSuccessfully fetched some NFL data. Check the data directory for raw files.")
     else:
-        print("\nUnable to fetch live NFL data. The application will use the generated data with real player names.")
\ No newline at end of file
+        print("\nUnable to fetch live NFL data. The application will use the generated data with real player names.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch raw NFL data from public APIs")
+    add_arguments(parser)
+    run(parser.parse_args())
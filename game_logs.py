@@ -0,0 +1,378 @@
+import argparse
+import os
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import history
+import http_client
+import player_ids
+import player_names
+
+# Weekly game logs, so `stats.consistency` can come from how a player actually
+# scored week to week instead of an ownership or rank heuristic. Ingestion
+# walks the ESPN scoreboard one week at a time, fetches that week's boxscores
+# concurrently, scores every player's line (half-PPR, like the projections) and
+# stores one row per player-week in the history store. Weeks whose games are
+# all final are never fetched again, so an in-season refresh pulls just the
+# newest week.
+#
+# The generators read the stored weeks back into a players x weeks array and
+# compute coefficient of variation, weekly percentiles and boom/bust rates in
+# one vectorized pass (see load_consistency).
+#
+#   python3 game_logs.py --season 2024            # fetch new weeks, print a summary
+#   python3 game_logs.py --season 2024 --refresh  # re-fetch every week
+
+SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+SUMMARY_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/summary"
+REGULAR_SEASON_WEEKS = 18
+
+# (boxscore category, stat key) -> fantasy points per unit, half-PPR
+SCORING = {
+    ('passing', 'passingYards'): 0.04,
+    ('passing', 'passingTouchdowns'): 4,
+    ('passing', 'interceptions'): -2,
+    ('rushing', 'rushingYards'): 0.1,
+    ('rushing', 'rushingTouchdowns'): 6,
+    ('receiving', 'receptions'): 0.5,
+    ('receiving', 'receivingYards'): 0.1,
+    ('receiving', 'receivingTouchdowns'): 6,
+    ('fumbles', 'fumblesLost'): -2,
+    ('kicking', 'fieldGoalsMade'): 3,
+    ('kicking', 'extraPointsMade'): 1
+}
+
+# Boxscores don't list positions, so each player-week records the position
+# group its points came from (the athlete's own position when the payload has
+# one). TEs score the way WRs do, so they share a group.
+CATEGORY_GROUPS = {'passing': 'QB', 'rushing': 'RB', 'receiving': 'WR', 'kicking': 'K'}
+POSITION_GROUPS = {'QB': 'QB', 'RB': 'RB', 'WR': 'WR', 'TE': 'WR', 'K': 'K'}
+
+# Games needed before the observed consistency replaces the projected one
+MIN_GAMES = 4
+
+# A boom week is at least 1.5x the player's average, a bust at most half of it
+BOOM_RATIO = 1.5
+BUST_RATIO = 0.5
+
+# Observed consistency is 1 / (1 + CV) of a player's weekly points. Weekly
+# fantasy CVs are typically 0.5-0.7, which maps to 0.67-0.59, inside the
+# range of the projected consistency it replaces, so observed and projected
+# players rank on one scale. 1 - 2 * CV would make the board's
+# std = average * (1 - consistency) * 0.5 equal the observed spread, but it
+# sends every CV above 0.45 to the floor; simulation.py takes its spread from
+# the observed CV instead. Clipped so nobody is perfectly steady.
+CONSISTENCY_RANGE = (0.05, 0.95)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_weeks (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    source_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    team TEXT,
+    points REAL NOT NULL,
+    position TEXT,
+    PRIMARY KEY (season, week, source_id)
+);
+CREATE TABLE IF NOT EXISTS game_weeks (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (season, week)
+);
+"""
+
+INSERT_WEEK = """
+INSERT INTO player_weeks (season, week, source_id, name, team, position, points)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+def connect(path=history.HISTORY_PATH):
+    connection = history.connect(path)
+    connection.executescript(SCHEMA)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(player_weeks)")}
+    if 'position' not in columns:
+        # Weeks stored before positions were recorded are fetched again
+        with connection:
+            connection.execute("ALTER TABLE player_weeks ADD COLUMN position TEXT")
+            connection.execute("DELETE FROM game_weeks")
+    return connection
+
+def stat_number(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return 0.0
+
+def boxscore_points(summary):
+    """{source_id: (name, team, position group, points)} for every scored player in one game summary"""
+    players = {}
+    for team_stats in summary.get('boxscore', {}).get('players', []):
+        team = team_stats.get('team', {}).get('abbreviation')
+        for category in team_stats.get('statistics', []):
+            name = category.get('name')
+            keys = category.get('keys', [])
+            if not any((name, part) in SCORING for key in keys for part in key.split('/')):
+                continue
+            for entry in category.get('athletes', []):
+                athlete = entry.get('athlete', {})
+                if not athlete.get('id'):
+                    continue
+                points = 0.0
+                # "fieldGoalsMade/fieldGoalAttempts" keys hold "2/3" values
+                for key, value in zip(keys, entry.get('stats', [])):
+                    for part, number in zip(key.split('/'), str(value).split('/')):
+                        points += SCORING.get((name, part), 0) * stat_number(number)
+                player = players.setdefault(player_ids.espn_key(athlete['id']), {
+                    'name': athlete.get('displayName', 'Unknown'),
+                    'team': team,
+                    'position': POSITION_GROUPS.get((athlete.get('position') or {}).get('abbreviation')),
+                    'groups': {},
+                    'points': 0.0
+                })
+                player['points'] += points
+                if name in CATEGORY_GROUPS:
+                    group = CATEGORY_GROUPS[name]
+                    player['groups'][group] = player['groups'].get(group, 0.0) + points
+
+    # Without a listed position, the group the player scored most in (the first one on a tie)
+    return {source_id: (player['name'], player['team'],
+                        player['position'] or max(player['groups'], key=player['groups'].get, default=None),
+                        player['points'])
+            for source_id, player in players.items()}
+
+def fetch_scoreboard(season=None, week=None, refresh=False):
+    url = SCOREBOARD_URL if week is None else f"{SCOREBOARD_URL}?seasontype=2&week={week}&dates={season}"
+    response = http_client.get(url, refresh=refresh)
+    if response.status_code != 200:
+        raise RuntimeError(f"Scoreboard for week {week} returned {response.status_code}")
+    return response.json()
+
+def latest_week(season):
+    """Last regular-season week of `season` that has started, from the current scoreboard"""
+    data = fetch_scoreboard(refresh=True)
+    year = data.get('season', {}).get('year', season)
+    season_type = data.get('season', {}).get('type', 2)
+    if year > season or season_type in (3, 4):
+        return REGULAR_SEASON_WEEKS
+    if year < season or season_type == 1:
+        return 0
+    return min(data.get('week', {}).get('number', 0), REGULAR_SEASON_WEEKS)
+
+def game_completed(event):
+    competitions = event.get('competitions') or [{}]
+    status = event.get('status') or competitions[0].get('status') or {}
+    return bool(status.get('type', {}).get('completed'))
+
+def fetch_game(event_id, refresh=False):
+    try:
+        response = http_client.get(f"{SUMMARY_URL}?event={event_id}", refresh=refresh)
+        if response.status_code == 200:
+            return boxscore_points(response.json())
+        print(f"  Boxscore for game {event_id} returned {response.status_code}")
+    except Exception as e:
+        print(f"  Error fetching boxscore for game {event_id}: {e}")
+    return None
+
+def fetch_week(season, week, max_workers=8, refresh=False):
+    """(player rows, games, completed) for one week; the boxscores are fetched concurrently"""
+    events = fetch_scoreboard(season, week, refresh=refresh).get('events', [])
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        games = list(executor.map(lambda event: fetch_game(event['id'], refresh), events))
+
+    rows = {}
+    for game in games:
+        for source_id, (name, team, position, points) in (game or {}).items():
+            rows[source_id] = (season, week, source_id, name, team, position, round(points, 2))
+    completed = bool(events) and None not in games and all(game_completed(event) for event in events)
+    return list(rows.values()), len(events), completed
+
+def stored_weeks(connection, season):
+    """{week: completed} for the weeks of `season` already ingested"""
+    return dict(connection.execute("SELECT week, completed FROM game_weeks WHERE season = ?", (season,)))
+
+def ingest(season, through_week=None, max_workers=8, refresh=False, path=history.HISTORY_PATH):
+    """Fetch every week up to `through_week` that isn't stored complete yet; returns the weeks fetched"""
+    if through_week is None:
+        through_week = latest_week(season)
+    connection = connect(path)
+    try:
+        stored = stored_weeks(connection, season)
+        done = {week for week, completed in stored.items() if completed}
+        weeks = [week for week in range(1, through_week + 1) if refresh or week not in done]
+        print(f"Season {season}: {len(done)} complete weeks stored, fetching {len(weeks)} "
+              f"(through week {through_week})")
+
+        for week in weeks:
+            start = time.perf_counter()
+            rows, games, completed = fetch_week(season, week, max_workers, refresh=refresh or week in stored)
+            # One transaction per week, replacing any partial copy of it
+            with connection:
+                connection.execute("DELETE FROM player_weeks WHERE season = ? AND week = ?", (season, week))
+                connection.executemany(INSERT_WEEK, rows)
+                connection.execute("INSERT OR REPLACE INTO game_weeks VALUES (?, ?, ?, ?, ?)",
+                                   (season, week, games, int(completed), datetime.now().isoformat()))
+            state = 'final' if completed else 'in progress'
+            print(f"  Week {week}: {games} games, {len(rows)} players ({state}) "
+                  f"in {time.perf_counter() - start:.2f}s")
+    finally:
+        connection.close()
+    return weeks
+
+def load_weekly_points(season, path=history.HISTORY_PATH):
+    """(source IDs, names, position groups, players x weeks float32 array with NaN for weeks not played)
+
+    Rows stream out of SQLite into flat typed arrays, then scatter into the
+    matrix in one step. A player's group is the one most of their weeks have.
+    The matrix is None when the season has no weeks stored.
+    """
+    source_ids, names, groups, row_of = [], [], [], {}
+    rows, weeks, points = array('q'), array('q'), array('f')
+    connection = connect(path)
+    try:
+        for source_id, name, position, week, value in connection.execute(
+                "SELECT source_id, name, position, week, points FROM player_weeks WHERE season = ?", (season,)):
+            row = row_of.get(source_id)
+            if row is None:
+                row = row_of[source_id] = len(source_ids)
+                source_ids.append(source_id)
+                names.append(name)
+                groups.append({})
+            if position:
+                groups[row][position] = groups[row].get(position, 0) + 1
+            rows.append(row)
+            weeks.append(week - 1)
+            points.append(value)
+    finally:
+        connection.close()
+    if not source_ids:
+        return source_ids, names, [], None
+
+    # numpy only once there are weeks, so builds without game logs don't load it
+    import numpy as np
+
+    matrix = np.full((len(source_ids), max(weeks, default=-1) + 1), np.nan, dtype=np.float32)
+    matrix[np.frombuffer(rows, dtype=np.int64), np.frombuffer(weeks, dtype=np.int64)] = \
+        np.frombuffer(points, dtype=np.float32)
+    positions = [max(counts, key=counts.get, default=None) for counts in groups]
+    return source_ids, names, positions, matrix
+
+def consistency_stats(matrix):
+    """Per-player game count, mean, CV, P10/P50/P90 and boom/bust rates over a players x weeks array"""
+    import numpy as np
+
+    played = ~np.isnan(matrix)
+    games = played.sum(axis=1)
+    mean = np.nanmean(matrix, axis=1)
+    std = np.nanstd(matrix, axis=1)
+    cv = np.divide(std, mean, out=np.zeros_like(mean), where=mean > 0)
+    p10, p50, p90 = np.nanpercentile(matrix, [10, 50, 90], axis=1)
+    with np.errstate(invalid='ignore'):
+        boom = (matrix >= BOOM_RATIO * mean[:, None]).sum(axis=1) / games
+        bust = (matrix <= BUST_RATIO * mean[:, None]).sum(axis=1) / games
+    consistency = np.clip(1 / (1 + cv), *CONSISTENCY_RANGE)
+    consistency[mean <= 0] = CONSISTENCY_RANGE[0]
+    return {'games': games, 'averagePoints': mean, 'cv': cv, 'p10': p10, 'p50': p50, 'p90': p90,
+            'boomRate': boom, 'bustRate': bust, 'consistency': consistency}
+
+class GameLogStats:
+    """Observed weekly stats per player, looked up by ESPN key or by position group and name"""
+
+    def __init__(self, season, by_source):
+        self.season = season
+        self.by_source = by_source
+        self.by_name = {}
+        for entry in by_source.values():
+            if entry['position']:
+                self.by_name.setdefault((entry['position'], player_names.canonical(entry['name'])), entry)
+
+    def __len__(self):
+        return len(self.by_source)
+
+    def lookup(self, player):
+        entry = self.by_source.get(player.get('sourceId'))
+        if entry is None and player['position'] != 'DEF':
+            key = (POSITION_GROUPS.get(player['position']), player_names.canonical(player['name']))
+            entry = self.by_name.get(key)
+        return entry
+
+    def attach(self, players):
+        """Stage: replace projected consistency with the observed one and add a `gameLog` block"""
+        for player in players:
+            entry = self.lookup(player)
+            if entry is not None:
+                player['gameLog'] = {key: value for key, value in entry.items() if key not in ('name', 'position')}
+                player['stats']['consistency'] = entry['consistency']
+            yield player
+
+def load_consistency(season, path=history.HISTORY_PATH):
+    """GameLogStats for the latest of `season` and the season before with MIN_GAMES games per player"""
+    by_source = {}
+    if os.path.exists(path):
+        for logged_season in (season - 1, season):
+            source_ids, names, positions, matrix = load_weekly_points(logged_season, path)
+            if not source_ids:
+                continue
+            stats = consistency_stats(matrix)
+            for row, source_id in enumerate(source_ids):
+                if stats['games'][row] < MIN_GAMES:
+                    continue
+                by_source[source_id] = {
+                    'name': names[row],
+                    'position': positions[row],
+                    'season': logged_season,
+                    'games': int(stats['games'][row]),
+                    'averagePoints': round(float(stats['averagePoints'][row]), 2),
+                    'cv': round(float(stats['cv'][row]), 3),
+                    'p10': round(float(stats['p10'][row]), 2),
+                    'p50': round(float(stats['p50'][row]), 2),
+                    'p90': round(float(stats['p90'][row]), 2),
+                    'boomRate': round(float(stats['boomRate'][row]), 3),
+                    'bustRate': round(float(stats['bustRate'][row]), 3),
+                    'consistency': round(float(stats['consistency'][row]), 3)
+                }
+    logs = GameLogStats(season, by_source)
+    if logs:
+        print(f"Loaded weekly consistency for {len(logs)} players from {path}")
+    return logs
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--season', type=int, default=history.CURRENT_SEASON,
+                        help=f"Season to ingest (default: {history.CURRENT_SEASON})")
+    parser.add_argument('--through-week', type=int, default=None,
+                        help="Last week to fetch (default: the current week from the live scoreboard)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Re-fetch weeks that are already stored as final")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="Number of boxscores fetched concurrently (default: 8)")
+    parser.add_argument('--rate', type=float, default=4.0,
+                        help="Maximum requests per second to each host (default: 4)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Serve every request from the response cache, never the network")
+    parser.add_argument('--base-url', default=None,
+                        help="Send every request to this server instead, e.g. http://127.0.0.1:8765 for mock_server.py")
+    parser.add_argument('--path', default=history.HISTORY_PATH,
+                        help=f"History database (default: {history.HISTORY_PATH})")
+
+def run(args):
+    http_client.use_mock_root(args.base_url)
+    http_client.configure(requests_per_second=args.rate, offline=args.offline, base_url=args.base_url)
+    ingest(args.season, args.through_week, args.workers, args.refresh, args.path)
+
+    logs = load_consistency(args.season, args.path)
+    top_scorers = sorted(logs.by_source.values(), key=lambda entry: -entry['averagePoints'])
+    for entry in top_scorers[:10]:
+        print(f"  {entry['name']:<28} {entry['games']:>2} games  {entry['averagePoints']:>5.1f} avg  "
+              f"CV {entry['cv']:.2f}  P10/P50/P90 {entry['p10']:.1f}/{entry['p50']:.1f}/{entry['p90']:.1f}  "
+              f"boom {entry['boomRate']:.0%} bust {entry['bustRate']:.0%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest weekly game logs and compute player consistency")
+    add_arguments(parser)
+    run(parser.parse_args())
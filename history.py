@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+from datetime import datetime
+
+import player_ids
+import player_names
+
+# Season history store. Every build appends the season it produced to a
+# SQLite database, one row per player, season and source (espn, rosters,
+# static), so the next season's build can export real previous-season stats
+# as `previousYearStats` for the yearWeight model instead of the draft board
+# inventing them. Rebuilding a season replaces only that season's rows for
+# that source; other seasons are never rewritten.
+#
+#   python3 history.py                      # seasons and row counts
+#   python3 history.py --import old/players.json --season 2023 --source espn
+
+HISTORY_PATH = 'data/history.sqlite'
+CURRENT_SEASON = 2024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_seasons (
+    player_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    source_id TEXT,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    team TEXT,
+    games_played INTEGER,
+    total_points REAL,
+    average_points REAL,
+    consistency REAL,
+    risk_score REAL,
+    games_injured INTEGER,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (player_id, season, source)
+);
+CREATE INDEX IF NOT EXISTS player_seasons_by_season ON player_seasons (season, position);
+"""
+
+INSERT_ROW = """
+INSERT OR REPLACE INTO player_seasons
+    (player_id, season, source, source_id, name, position, team, games_played,
+     total_points, average_points, consistency, risk_score, games_injured, recorded_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# previousYearStats key -> column
+STATS_FIELDS = {
+    'gamesPlayed': 'games_played',
+    'totalPoints': 'total_points',
+    'averagePoints': 'average_points',
+    'consistency': 'consistency'
+}
+
+STATS_COLUMNS = ['player_id', 'source_id', 'name', 'position'] + list(STATS_FIELDS.values())
+
+def connect(path=HISTORY_PATH):
+    # sqlite3 is imported here, so the generators' --help doesn't pay for it
+    import sqlite3
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+def season_row(player, season, source, recorded_at):
+    stats = player.get('stats') or {}
+    injury = player.get('injury') or {}
+    return (player['id'], season, source, player.get('sourceId'), player['name'], player['position'],
+            player.get('team'), stats.get('gamesPlayed'), stats.get('totalPoints'),
+            stats.get('averagePoints'), stats.get('consistency'), injury.get('riskScore'),
+            injury.get('gamesInjured'), recorded_at)
+
+def record_season(players, season, source, path=HISTORY_PATH):
+    """Store `players` as `source`'s rows for `season`, replacing any earlier run of the same season"""
+    recorded_at = datetime.now().isoformat()
+    connection = connect(path)
+    try:
+        with connection:
+            connection.execute("DELETE FROM player_seasons WHERE season = ? AND source = ?", (season, source))
+            connection.executemany(INSERT_ROW, (season_row(player, season, source, recorded_at)
+                                                for player in players))
+            count = connection.execute("SELECT COUNT(*) FROM player_seasons WHERE season = ? AND source = ?",
+                                       (season, source)).fetchone()[0]
+    finally:
+        connection.close()
+    print(f"Recorded {count} {source} players for the {season} season in {path}")
+    return count
+
+class SeasonStats:
+    """One season's stats from the store, looked up by player ID or by position and name"""
+
+    def __init__(self, season, rows):
+        self.season = season
+        self.rows = rows
+        self.by_id = {}
+        self.by_name = {}
+        for row in rows:
+            self.by_id.setdefault(row['player_id'], row)
+            self.by_name.setdefault((row['position'], player_names.canonical(row['name'])), row)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lookup(self, player):
+        """The stored row for `player`: same ID first, then same position and name
+
+        An ID hit only counts when the row is the same player, by upstream key
+        or by position and name, so rows stored under another tree's IDs can't
+        hand a player someone else's season.
+        """
+        key = (player['position'], player_names.canonical(player['name']))
+        row = self.by_id.get(player['id'])
+        if row is not None:
+            if row['source_id'] and row['source_id'] == player.get('sourceId'):
+                return row
+            if (row['position'], player_names.canonical(row['name'])) == key:
+                return row
+        return self.by_name.get(key)
+
+    def attach(self, players):
+        """Stage: give each player with a stored season a `previousYearStats` block"""
+        for player in players:
+            row = self.lookup(player)
+            if row is not None:
+                # Columns the old season lacks fall back to this season's value
+                current = player.get('stats') or {}
+                player['previousYearStats'] = {'season': self.season}
+                for key, column in STATS_FIELDS.items():
+                    value = row[column]
+                    player['previousYearStats'][key] = value if value is not None else current.get(key)
+            yield player
+
+def load_season(season, source=None, path=HISTORY_PATH):
+    """Stats for `season`, with `source`'s rows preferred over other sources for the same player"""
+    if not os.path.exists(path):
+        return SeasonStats(season, [])
+    import sqlite3
+
+    connection = connect(path)
+    connection.row_factory = sqlite3.Row
+    try:
+        # Served by the (season, position) index
+        rows = connection.execute(
+            f"SELECT {', '.join(STATS_COLUMNS)} FROM player_seasons WHERE season = ? "
+            "ORDER BY source = ? DESC, source, player_id", (season, source)).fetchall()
+    finally:
+        connection.close()
+    stats = SeasonStats(season, [dict(row) for row in rows])
+    if stats:
+        print(f"Loaded {len(stats)} player rows for the {season} season from {path}")
+    return stats
+
+def remap_ids(players, source, id_map):
+    """Give imported players this tree's IDs: by upstream key, else by source, position and name"""
+    for player in players:
+        key = player.get('sourceId') or player_ids.name_key(source, player['position'], player['name'])
+        yield dict(player, id=id_map.assign(key))
+
+def season_counts(path=HISTORY_PATH):
+    """[(season, source, players)] for every season in the store"""
+    if not os.path.exists(path):
+        return []
+    connection = connect(path)
+    try:
+        return connection.execute("SELECT season, source, COUNT(*) FROM player_seasons "
+                                  "GROUP BY season, source ORDER BY season, source").fetchall()
+    finally:
+        connection.close()
+
+def add_history_arguments(parser):
+    parser.add_argument('--season', type=int, default=CURRENT_SEASON,
+                        help=f"Season this build is recorded as in {HISTORY_PATH}; the season before "
+                             f"it supplies previousYearStats (default: {CURRENT_SEASON})")
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--import', dest='import_path', default=None, metavar='PATH',
+                        help="Append the players in PATH (JSON array or .ndjson) as a past season")
+    parser.add_argument('--season', type=int, default=None,
+                        help="Season of the imported players (required with --import)")
+    parser.add_argument('--source', default='espn',
+                        help="Source the imported players came from (default: espn)")
+    parser.add_argument('--path', default=HISTORY_PATH,
+                        help=f"History database (default: {HISTORY_PATH})")
+
+def run(args):
+    if args.import_path:
+        if args.season is None:
+            raise SystemExit("--import needs --season")
+        with open(args.import_path) as f:
+            if args.import_path.endswith('.ndjson'):
+                players = [json.loads(line) for line in f if line.strip()]
+            else:
+                players = json.load(f)
+        # IDs in another build's files come from its own player_ids.json
+        id_map = player_ids.PlayerIdMap()
+        record_season(list(remap_ids(players, args.source, id_map)), args.season, args.source, args.path)
+        id_map.save()
+
+    counts = season_counts(args.path)
+    if not counts:
+        print(f"No seasons stored in {args.path} yet")
+    for season, source, players in counts:
+        print(f"  {season} {source}: {players} players")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a past season or list the seasons in the history store")
+    add_arguments(parser)
+    run(parser.parse_args())
@@ -0,0 +1,177 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# Persistent response cache for the scrapers. Entries are keyed by URL plus the
+# x-fantasy-filter header, expire per endpoint class and are revalidated with
+# ETag / Last-Modified once stale. The least recently used entries are evicted
+# when the cache grows past its size cap.
+
+CACHE_DIR = 'data/cache'
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+# Seconds before an entry must be revalidated, by endpoint class
+ENDPOINT_TTLS = {
+    'teams': 24 * 3600,
+    'roster': 12 * 3600,
+    'players': 6 * 3600,
+    'rankings': 12 * 3600,
+    'scoreboard': 10 * 60,
+    'other': 3600
+}
+
+class OfflineCacheMiss(Exception):
+    """Raised in offline mode when a URL has never been cached"""
+
+def endpoint_class(url):
+    """Bucket a URL into one of the ENDPOINT_TTLS classes"""
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/')
+
+    if path.endswith('/roster'):
+        return 'roster'
+    if path.endswith('/teams'):
+        return 'teams'
+    if path.endswith('/scoreboard'):
+        return 'scoreboard'
+    if path.endswith('/players'):
+        return 'players'
+    if 'fantasypros.com' in parsed.netloc:
+        return 'rankings'
+    return 'other'
+
+def cache_key(url, headers=None):
+    """Stable key for a request: URL plus the ESPN fantasy filter header"""
+    fantasy_filter = (headers or {}).get('x-fantasy-filter', '')
+    return hashlib.sha256(f"{url}\n{fantasy_filter}".encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """On-disk cache of response bodies with a JSON index"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, ttls=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = dict(ENDPOINT_TTLS, **(ttls or {}))
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.dirty = False
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+        atexit.register(self.save)
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    def lookup(self, url, headers=None):
+        """Return the index entry for a request, or None"""
+        key = cache_key(url, headers)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None or not os.path.exists(self._body_path(key)):
+                self.stats['misses'] += 1
+                return None
+            entry['lastAccess'] = time.time()
+            self.dirty = True
+            return dict(entry, key=key)
+
+    def is_fresh(self, entry):
+        ttl = self.ttls.get(endpoint_class(entry['url']), self.ttls['other'])
+        return time.time() - entry['storedAt'] < ttl
+
+    def conditional_headers(self, entry):
+        """Headers that let the server answer 304 Not Modified"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('lastModified'):
+            headers['If-Modified-Since'] = entry['lastModified']
+        return headers
+
+    def read_body(self, entry):
+        with open(self._body_path(entry['key']), 'rb') as f:
+            return f.read()
+
+    def record_hit(self):
+        with self.lock:
+            self.stats['hits'] += 1
+
+    def revalidated(self, entry, response_headers):
+        """A 304 came back: the cached body is good for another TTL"""
+        with self.lock:
+            stored = self.index.get(entry['key'])
+            if stored is not None:
+                stored['storedAt'] = time.time()
+                stored['etag'] = response_headers.get('ETag', stored.get('etag'))
+                stored['lastModified'] = response_headers.get('Last-Modified', stored.get('lastModified'))
+                self.dirty = True
+            self.stats['revalidated'] += 1
+
+    def store(self, url, headers, status_code, body, response_headers, encoding=None):
+        """Persist a successful response body"""
+        key = cache_key(url, headers)
+        tmp_path = self._body_path(key) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, self._body_path(key))
+
+        now = time.time()
+        with self.lock:
+            self.index[key] = {
+                'url': url,
+                'fantasyFilter': (headers or {}).get('x-fantasy-filter'),
+                'status': status_code,
+                'size': len(body),
+                'storedAt': now,
+                'lastAccess': now,
+                'etag': response_headers.get('ETag'),
+                'lastModified': response_headers.get('Last-Modified'),
+                'contentType': response_headers.get('Content-Type'),
+                'encoding': encoding
+            }
+            self.stats['stored'] += 1
+            self.dirty = True
+            self._evict()
+        self.save()
+
+    def _evict(self):
+        # Caller holds the lock
+        total = sum(entry['size'] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]['lastAccess']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+            total -= entry['size']
+            del self.index[key]
+            self.stats['evicted'] += 1
+
+    def save(self):
+        """Write the index back to disk if it changed"""
+        with self.save_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                snapshot = json.dumps(self.index)
+                self.dirty = False
+
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.index_path)
@@ -0,0 +1,296 @@
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse, urlunparse
+
+from http_cache import OfflineCacheMiss, ResponseCache
+
+# Shared HTTP client used by every scraper: one pooled session, default
+# timeouts, retries with exponential backoff, a token bucket per host and an
+# optional on-disk response cache (see http_cache). With `base_url` every
+# request goes to that server instead (same path and query), e.g. the local
+# stand-in in mock_server.py; rate limits and latency stay keyed by the real host.
+# requests is imported when the first request goes out, so runs served from
+# the cache (and CLI starts) skip it.
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+ID_SEGMENT_RE = re.compile(r'/\d+(?=/|$)')
+
+class CachedResponse:
+    """The parts of requests.Response the scrapers use, for bodies served from the cache"""
+
+    def __init__(self, url, status_code, content, encoding=None, content_type=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.headers = {'Content-Type': content_type} if content_type else {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self, **kwargs):
+        return json.loads(self.content, **kwargs)
+
+def endpoint_name(url):
+    """Host and path with numeric segments folded, e.g. site.api.espn.com/.../teams/{id}/roster"""
+    parts = urlparse(url)
+    return parts.netloc + ID_SEGMENT_RE.sub('/{id}', parts.path)
+
+class TokenBucket:
+    """Token bucket limiter: `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        if self.rate <= 0:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now so concurrent callers queue up behind us
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+class HttpClient:
+    """Pooled requests session with timeouts, retries and per-host rate limiting"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=3, backoff=0.5,
+                 requests_per_second=4.0, burst=None, pool_size=16,
+                 cache=None, offline=False, base_url=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.cache = cache
+        self.offline = offline
+        self.base_url = urlparse(base_url) if base_url else None
+        self.pool_size = pool_size
+        self._session = None
+
+        self.buckets = {}
+        self.latencies = {}  # endpoint -> list of request durations in seconds
+        self.bytes = {}      # endpoint -> response bytes downloaded
+        self.retries = 0
+        self.lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Pooled requests session, created on the first request that goes out"""
+        with self.lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers['User-Agent'] = USER_AGENT
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+
+    def _bucket(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def _record(self, endpoint, elapsed, response=None):
+        size = len(response.content) if response is not None else 0
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(elapsed)
+            self.bytes[endpoint] = self.bytes.get(endpoint, 0) + size
+
+    def _retry_delay(self, response, attempt):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt)
+
+    def get(self, url, headers=None, refresh=False, **kwargs):
+        """GET `url`, served from the response cache when possible
+
+        refresh=True skips the TTL check and always revalidates with the server.
+        """
+        if self.cache is None:
+            if self.offline:
+                raise OfflineCacheMiss(f"No response cache configured for offline mode: {url}")
+            return self._fetch(url, headers, **kwargs)
+
+        entry = self.cache.lookup(url, headers)
+        if entry is not None and (self.offline or (not refresh and self.cache.is_fresh(entry))):
+            self.cache.record_hit()
+            return self._cached_response(url, entry)
+        if self.offline:
+            raise OfflineCacheMiss(f"Not in cache (offline mode): {url}")
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(self.cache.conditional_headers(entry))
+
+        response = self._fetch(url, request_headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated(entry, response.headers)
+            return self._cached_response(url, entry)
+        if response.status_code == 200:
+            self.cache.store(url, headers, response.status_code, response.content,
+                             response.headers, response.encoding)
+        return response
+
+    def _cached_response(self, url, entry):
+        return CachedResponse(url, entry['status'], self.cache.read_body(entry),
+                              entry.get('encoding'), entry.get('contentType'))
+
+    def _redirect(self, url):
+        """`url` with its scheme and host replaced by base_url"""
+        parts = urlparse(url)
+        path = self.base_url.path.rstrip('/') + parts.path
+        return urlunparse((self.base_url.scheme, self.base_url.netloc, path, '', parts.query, ''))
+
+    def _fetch(self, url, headers=None, **kwargs):
+        """GET `url`, retrying on connection errors, timeouts, 429 and 5xx"""
+        import requests
+
+        host = urlparse(url).netloc
+        endpoint = endpoint_name(url)
+        if self.base_url:
+            url = self._redirect(url)
+        bucket = self._bucket(host)
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(endpoint, time.perf_counter() - start)
+                if attempt == self.max_retries:
+                    raise
+                response = None
+            else:
+                self._record(endpoint, time.perf_counter() - start, response)
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+
+            with self.lock:
+                self.retries += 1
+            time.sleep(self._retry_delay(response, attempt))
+
+    def latency_stats(self):
+        """Per-endpoint request counts, bytes and latency figures in milliseconds"""
+        stats = {}
+        with self.lock:
+            latencies = {endpoint: list(values) for endpoint, values in self.latencies.items()}
+            sizes = dict(self.bytes)
+
+        for endpoint, values in latencies.items():
+            values.sort()
+            stats[endpoint] = {
+                'requests': len(values),
+                'bytes': sizes.get(endpoint, 0),
+                'meanMs': sum(values) / len(values) * 1000,
+                'p50Ms': values[len(values) // 2] * 1000,
+                'p95Ms': values[int(len(values) * 0.95)] * 1000,
+                'p99Ms': values[int(len(values) * 0.99)] * 1000,
+                'maxMs': max(values) * 1000,
+                'totalMs': sum(values) * 1000
+            }
+        return stats
+
+    def request_metrics(self):
+        """Totals plus per-endpoint figures for the build metrics in summary.json"""
+        endpoints = {endpoint: {key: round(value, 1) for key, value in stats.items()}
+                     for endpoint, stats in sorted(self.latency_stats().items())}
+        return {
+            'requests': sum(stats['requests'] for stats in endpoints.values()),
+            'bytes': sum(stats['bytes'] for stats in endpoints.values()),
+            'retries': self.retries,
+            'cache': dict(self.cache.stats) if self.cache is not None else None,
+            'endpoints': endpoints
+        }
+
+    def print_latency_stats(self):
+        for endpoint, stats in sorted(self.latency_stats().items()):
+            print(f"  {endpoint}: {stats['requests']} requests, {stats['bytes'] / 1024:.0f} KB, "
+                  f"mean {stats['meanMs']:.0f}ms, p95 {stats['p95Ms']:.0f}ms, "
+                  f"p99 {stats['p99Ms']:.0f}ms, max {stats['maxMs']:.0f}ms")
+        if self.retries:
+            print(f"  {self.retries} retries")
+        if self.cache is not None:
+            stats = self.cache.stats
+            print(f"  cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+                  f"{stats['misses']} misses")
+
+_client = None
+_client_lock = threading.Lock()
+
+MOCK_ROOT = 'mock_run'
+
+def use_mock_root(base_url, root=MOCK_ROOT):
+    """Run from `root` when requests go to a stand-in server (base_url)
+
+    Every path the scripts write is relative to data/, so a mock run's
+    players, IDs, teams, history and build state all land in root/data and
+    never replace the real ones.
+    """
+    if not base_url:
+        return
+    root = os.path.abspath(root)
+    os.makedirs(os.path.join(root, 'data'), exist_ok=True)
+    os.chdir(root)
+    print(f"Requests go to {base_url}; writing to {os.path.join(root, 'data')}")
+
+def configure(use_cache=True, cache_dir=None, **kwargs):
+    """Replace the shared client, e.g. configure(requests_per_second=2, offline=True)
+
+    A client with a base_url never uses the response cache, so stand-in
+    responses can't end up cached under the real URLs.
+    """
+    global _client
+    if use_cache and 'cache' not in kwargs and not kwargs.get('base_url'):
+        kwargs['cache'] = ResponseCache(cache_dir) if cache_dir else ResponseCache()
+    with _client_lock:
+        _client = HttpClient(**kwargs)
+    return _client
+
+def get_client():
+    """Return the process-wide shared client, creating it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(cache=ResponseCache())
+        return _client
+
+def get(url, headers=None, refresh=False, **kwargs):
+    """GET through the shared client"""
+    return get_client().get(url, headers=headers, refresh=refresh, **kwargs)
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+from datetime import datetime
+
+# Support for incremental refreshes: remember when each team's roster was last
+# fetched, reuse the previous players.json for fresh teams, and report what
+# changed between two builds.
+
+ROSTER_STATE_PATH = 'data/roster_state.json'
+CHANGE_REPORT_PATH = 'data/changes.json'
+DEFAULT_MAX_AGE = 12 * 3600  # seconds before a team's roster is refetched
+
+# Fields compared when deciding whether a player was modified
+TRACKED_FIELDS = ['name', 'position', 'team', 'details']
+
+class RosterState:
+    """Per-team record of when a roster was last fetched"""
+
+    def __init__(self, path=ROSTER_STATE_PATH):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.teams = json.load(f)['teams']
+        except (OSError, ValueError, KeyError):
+            self.teams = {}
+
+    def is_stale(self, team_id, max_age=DEFAULT_MAX_AGE):
+        entry = self.teams.get(str(team_id))
+        return entry is None or time.time() - entry['fetchedAt'] >= max_age
+
+    def mark_fetched(self, team_id, team_abbr, player_count):
+        self.teams[str(team_id)] = {
+            'abbreviation': team_abbr,
+            'fetchedAt': time.time(),
+            'players': player_count
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'teams': self.teams}, f, indent=2)
+
+def load_previous_players(path='data/players.json'):
+    """Previous build keyed by sourceId; empty if missing or built without sourceIds"""
+    try:
+        with open(path) as f:
+            players = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not all('sourceId' in player for player in players):
+        return {}
+    return {player['sourceId']: player for player in players}
+
+def diff_players(previous, current):
+    """Compare two {sourceId: player} maps and list added, removed and modified players"""
+    added = []
+    removed = []
+    modified = []
+
+    for key, player in current.items():
+        old = previous.get(key)
+        if old is None:
+            added.append({'sourceId': key, 'id': player['id'], 'name': player['name'],
+                          'position': player['position'], 'team': player['team']})
+            continue
+
+        changes = {}
+        for field in TRACKED_FIELDS:
+            if old.get(field) != player.get(field):
+                changes[field] = {'from': old.get(field), 'to': player.get(field)}
+        if changes:
+            modified.append({'sourceId': key, 'id': player['id'], 'name': player['name'],
+                             'changes': changes})
+
+    for key, player in previous.items():
+        if key not in current:
+            removed.append({'sourceId': key, 'id': player['id'], 'name': player['name'],
+                            'position': player['position'], 'team': player['team']})
+
+    return {
+        'generatedAt': datetime.now().isoformat(),
+        'added': added,
+        'removed': removed,
+        'modified': modified
+    }
+
+def write_change_report(report, path=CHANGE_REPORT_PATH):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Change report: {len(report['added'])} added, {len(report['removed'])} removed, "
+          f"{len(report['modified'])} modified (see {path})")
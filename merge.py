@@ -0,0 +1,305 @@
+import argparse
+import importlib
+import json
+from datetime import datetime
+
+import binary_table
+import build_state
+import columnar
+import game_logs
+import history
+import http_client
+import metrics
+import pipeline
+import player_ids
+import player_names
+import projection_engine
+import rankings
+
+# Combine the player sources into one players.json instead of letting each
+# generator overwrite it. Records from every source are hash-joined in a
+# single pass: on the upstream ESPN athlete ID when both sides have one,
+# otherwise on the canonical name (player_names.canonical), with D/ST units
+# keyed by team. Each field of a merged player comes from the highest
+# priority source that has it, and a second record for the same player from
+# the same source (the static list has a few) is flagged as a duplicate.
+
+# Default sources, in the order that also breaks ties for unlisted fields
+SOURCES = ['espn', 'rosters', 'static']
+
+# field -> sources in priority order; fields not listed follow SOURCES order
+FIELD_PRIORITY = {
+    'position': ['rosters', 'espn', 'static'],
+    'team': ['rosters', 'espn', 'static'],
+    'stats': ['espn', 'static', 'rosters'],
+    'injury': ['espn', 'static', 'rosters'],
+    'details': ['rosters']
+}
+
+def espn_source(id_map, seed):
+    """ESPN fantasy feed (FantasyPros when ESPN is down) with injuries and projections"""
+    import scrape_nfl_data
+
+    players = pipeline.first_nonempty(
+        ("ESPN API", lambda: scrape_nfl_data.iter_espn_fantasy_players(id_map)),
+        ("FantasyPros", lambda: scrape_nfl_data.iter_fantasy_pros_rankings(id_map, seed=seed))
+    )
+    return scrape_nfl_data.project_if_missing(scrape_nfl_data.iter_injury_data(players, seed), seed)
+
+def rosters_source(id_map, seed):
+    """Every ESPN team roster plus D/ST units"""
+    import incremental
+    import scrape_all_nfl_players
+    import team_registry
+
+    teams = team_registry.get_registry().teams
+    rosters = scrape_all_nfl_players.fetch_all_rosters(teams)
+    return scrape_all_nfl_players.iter_all_players(teams, teams, rosters, id_map,
+                                                   incremental.RosterState(), None, seed)
+
+def static_source(id_map, seed):
+    """The built-in 2024 player lists"""
+    import scrape_comprehensive_nfl
+
+    return scrape_comprehensive_nfl.project_players(scrape_comprehensive_nfl.iter_static_players(id_map), seed)
+
+SOURCE_LOADERS = {
+    'espn': espn_source,
+    'rosters': rosters_source,
+    'static': static_source
+}
+
+# Generator module behind each source, hashed into the build inputs
+SOURCE_MODULES = {
+    'espn': 'scrape_nfl_data',
+    'rosters': 'scrape_all_nfl_players',
+    'static': 'scrape_comprehensive_nfl'
+}
+
+def upstream_id(record):
+    """The record's ESPN athlete key, or None for sources keyed by name"""
+    source_id = record.get('sourceId') or ''
+    return source_id if source_id.startswith('espn:') else None
+
+def identity_key(record):
+    """Join key for records without a shared upstream ID"""
+    if record['position'] == 'DEF':
+        return player_ids.defense_key(record['team'])
+    return player_names.canonical(record['name'])
+
+def find_entry(record, candidates, entries):
+    """The merged entry a name match belongs to: same team first, then same position
+
+    Two records that both carry ESPN IDs only join on that ID, so namesakes
+    (two Mike Williamses) stay apart.
+    """
+    record_id = upstream_id(record)
+    fallback = None
+    for number in candidates:
+        entry = entries[number]
+        if record_id and any(upstream_id(other) not in (None, record_id) for other in entry.values()):
+            continue
+        if any(other['team'] == record['team'] for other in entry.values()):
+            return number
+        if fallback is None and any(other['position'] == record['position'] for other in entry.values()):
+            fallback = number
+    return fallback
+
+def resolve(records, order, priority=FIELD_PRIORITY, conflicts=None):
+    """One player from its {source: record} map, each field taken by source priority"""
+    merged = {}
+    for source in order:
+        for field in records.get(source, ()):
+            if field in merged:
+                continue
+            for ranked in priority.get(field, []) + order:
+                value = records.get(ranked, {}).get(field)
+                if value is not None:
+                    merged[field] = value
+                    break
+
+    # Count scalar fields the sources disagree on (team changes, positions)
+    if conflicts is not None:
+        for field in priority:
+            values = {record.get(field) for record in records.values()
+                      if isinstance(record.get(field), (str, int, float))}
+            if len(values) > 1:
+                conflicts[field] = conflicts.get(field, 0) + 1
+
+    merged['sources'] = [source for source in order if source in records]
+    return merged
+
+def merge_sources(sources, priority=FIELD_PRIORITY):
+    """Hash-join the (source name, records) pairs into one player list
+
+    Returns a dict with the merged players (in first-seen order), the
+    duplicates found within a single source, per-field conflict counts and
+    the number of records each source contributed.
+    """
+    order = [name for name, records in sources]
+    entries = []        # entry number -> {source: record}
+    by_upstream = {}    # ESPN athlete key -> entry number
+    by_identity = {}    # identity key -> entry numbers
+    duplicates = []
+    counts = {}
+
+    for source, records in sources:
+        counts[source] = 0
+        for record in records:
+            counts[source] += 1
+            record_id = upstream_id(record)
+            key = identity_key(record)
+
+            number = by_upstream.get(record_id) if record_id else None
+            if number is None:
+                number = find_entry(record, by_identity.get(key, ()), entries)
+
+            if number is None:
+                number = len(entries)
+                entries.append({})
+                by_identity.setdefault(key, []).append(number)
+            elif source in entries[number]:
+                kept = entries[number][source]
+                duplicates.append({
+                    'name': record['name'],
+                    'source': source,
+                    'kept': f"{kept['position']} {kept['team']}",
+                    'dropped': f"{record['position']} {record['team']}"
+                })
+                continue
+
+            entries[number][source] = record
+            if record_id:
+                by_upstream[record_id] = number
+
+    conflicts = {}
+    players = [resolve(entry, order, priority, conflicts) for entry in entries]
+    return {'players': players, 'duplicates': duplicates, 'conflicts': conflicts, 'sources': counts}
+
+def main(sources=SOURCES, offline=False, base_url=None, output_format='json', sort=True,
+         memory_budget=pipeline.DEFAULT_MEMORY_BUDGET, columnar_export=False,
+         seed=build_state.DEFAULT_SEED, force=False, prometheus_path=None, season=history.CURRENT_SEASON,
+         binary_export=False, search_export=False,
+         simulate_seasons=0):
+    print(f"Merging player sources: {', '.join(sources)}")
+    build_metrics = metrics.BuildMetrics('merge')
+    http_client.use_mock_root(base_url)
+    http_client.configure(offline=offline, base_url=base_url)
+    id_map = player_ids.PlayerIdMap()
+
+    # Each source is hashed as it loads and spooled to disk until the merge
+    inputs = build_state.InputHash('merge')
+    inputs.update('params', [sources, output_format, sort, columnar_export, binary_export, search_export,
+                             simulate_seasons, seed, season])
+    loaded = []
+    for name in sources:
+        with build_metrics.stage(f'fetch_{name}'):
+            loaded.append((name, inputs.spool(name, SOURCE_LOADERS[name](id_map, seed))))
+        print(f"{name}: {len(loaded[-1][1])} players")
+
+    # Previous-season rows from the first source that has them
+    previous = history.load_season(season - 1, sources[0])
+    weekly = game_logs.load_consistency(season)
+
+    inputs.update('priority', FIELD_PRIORITY)
+    inputs.update('previousSeason', previous.rows)
+    inputs.update('gameLogs', weekly.by_source)
+    inputs.update_code(__file__, binary_table, build_state, columnar, game_logs, history, pipeline, player_ids,
+                       player_names, projection_engine, rankings,
+                       *(importlib.import_module(SOURCE_MODULES[name]) for name in sources))
+    if simulate_seasons:
+        import simulation
+        inputs.update_code(simulation)
+    if build_state.skip_if_current(inputs, force):
+        return
+
+    with build_metrics.stage('merge'):
+        result = merge_sources(loaded)
+    players = result['players']
+    print(f"\nMerged {sum(result['sources'].values())} records into {len(players)} players")
+    for duplicate in result['duplicates']:
+        print(f"  Duplicate in {duplicate['source']}: {duplicate['name']} "
+              f"(kept {duplicate['kept']}, dropped {duplicate['dropped']})")
+    for field, count in sorted(result['conflicts'].items()):
+        print(f"  {count} players with conflicting {field}, resolved by source priority")
+
+    players = build_metrics.track('game_logs', weekly.attach(players))
+    players = build_metrics.track('previous_season', previous.attach(players))
+    if sort:
+        players = build_metrics.track('sort', pipeline.sort_stream(
+            players, key=lambda x: (x['position'], -x['stats']['totalPoints']), memory_budget=memory_budget))
+
+    with build_metrics.stage('write'):
+        written = pipeline.write_players(players, output_format,
+                                         columnar_path=columnar.COLUMNAR_PATH if columnar_export else None,
+                                         binary_path=binary_table.BINARY_PATH if binary_export else None,
+                                         search=search_export)
+
+    # Season percentiles for the floors and ceilings, before rankings read them
+    if simulate_seasons:
+        with build_metrics.stage('simulation'):
+            written = simulation.simulate_file(written['path'], simulate_seasons, seed=seed,
+                                               columnar_path=written.get('columnarPath'),
+                                               binary_path=written.get('binaryPath'),
+                                               search=bool(written.get('searchPath')))
+    print(f"\nSaved {written['totalPlayers']} players to {written['path']}")
+    id_map.save()
+
+    with build_metrics.stage('rankings'):
+        rankings.write_rankings(rankings.load_players(written['path']))
+
+    # Each source's records go into the history store under its own name
+    with build_metrics.stage('history'):
+        for name, records in loaded:
+            history.record_season(records, season, name)
+
+    summary = {
+        'lastUpdated': datetime.now().isoformat(),
+        'totalPlayers': written['totalPlayers'],
+        'positions': written['positions'],
+        'dataSource': f"Merged: {', '.join(sources)}",
+        'merge': {
+            'sources': result['sources'],
+            'duplicates': result['duplicates'],
+            'conflicts': result['conflicts']
+        },
+        **pipeline.summary_fields(written),
+        'metrics': build_metrics.to_dict(http_client.get_client())
+    }
+
+    with open('data/summary.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+    pipeline.print_file_sizes(written)
+    if prometheus_path:
+        metrics.write_prometheus(summary['metrics'], prometheus_path)
+    build_state.record(inputs, list(written['files']) + ['data/summary.json', rankings.RANKINGS_PATH])
+    build_metrics.print_stages()
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--sources', default=','.join(SOURCES),
+                        help=f"Comma-separated sources to merge, first wins unlisted fields (default: {','.join(SOURCES)})")
+    parser.add_argument('--offline', action='store_true',
+                        help="Serve every request from the response cache, never the network")
+    parser.add_argument('--base-url', default=None,
+                        help="Send every request to this server instead, e.g. http://127.0.0.1:8765 for mock_server.py")
+    pipeline.add_output_arguments(parser)
+    build_state.add_build_arguments(parser)
+    metrics.add_metrics_arguments(parser)
+    history.add_history_arguments(parser)
+
+def run(args):
+    sources = [name.strip() for name in args.sources.split(',') if name.strip()]
+    unknown = [name for name in sources if name not in SOURCE_LOADERS]
+    if unknown:
+        raise SystemExit(f"Unknown source(s): {', '.join(unknown)} (choose from {', '.join(SOURCE_LOADERS)})")
+    main(sources=sources, offline=args.offline, base_url=args.base_url, output_format=args.format,
+         sort=not args.no_sort, memory_budget=args.memory_budget, columnar_export=args.columnar,
+         seed=args.seed, force=args.force, prometheus_path=args.prometheus,
+         season=args.season, binary_export=args.binary, search_export=args.search_index,
+         simulate_seasons=args.simulate)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge several player sources into one players.json")
+    add_arguments(parser)
+    run(parser.parse_args())
@@ -0,0 +1,138 @@
+import os
+import time
+from contextlib import contextmanager
+
+# Build instrumentation: wall time per pipeline stage plus the shared HTTP
+# client's request, byte, retry, cache and per-endpoint latency figures. The
+# generators put the result in summary.json under `metrics`, and optionally
+# in a Prometheus text-format file for a node_exporter textfile collector.
+#
+# Stages are either eager blocks (`with metrics.stage('write'):`) or streamed
+# generator stages (`metrics.track('injury', players)`). A streamed stage is
+# only charged for the time spent in its own code, not upstream of it, so
+# wrap the stages of a chain in pipeline order.
+
+PROMETHEUS_PREFIX = 'draft'
+
+class BuildMetrics:
+    """Stage timings for one generator run"""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.started = time.perf_counter()
+        self.seconds = {}    # stage -> time charged to the stage itself
+        self.inclusive = {}  # stage -> time including everything it pulled from upstream
+        self.tail = None     # last streamed stage wrapped so far
+
+    def _charge(self, name, elapsed, upstream_before):
+        """Add `elapsed` to a stage minus whatever the upstream stage accumulated meanwhile"""
+        upstream = self.inclusive.get(self.tail, 0.0) - upstream_before
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - upstream
+
+    @contextmanager
+    def stage(self, name):
+        """Time an eager block; time spent draining streamed stages inside it is theirs"""
+        upstream_before = self.inclusive.get(self.tail, 0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._charge(name, time.perf_counter() - start, upstream_before)
+
+    def track(self, name, records):
+        """Wrap a streamed stage so the time spent producing its records is recorded"""
+        upstream = self.tail
+        self.tail = name
+        self.seconds.setdefault(name, 0.0)
+        self.inclusive.setdefault(name, 0.0)
+        return self._timed(name, upstream, iter(records))
+
+    def _timed(self, name, upstream, iterator):
+        while True:
+            upstream_before = self.inclusive.get(upstream, 0.0)
+            start = time.perf_counter()
+            try:
+                record = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed = time.perf_counter() - start
+                self.inclusive[name] += elapsed
+                self.seconds[name] += elapsed - (self.inclusive.get(upstream, 0.0) - upstream_before)
+            yield record
+
+    def to_dict(self, client=None):
+        metrics = {
+            'generator': self.generator,
+            'wallSeconds': round(time.perf_counter() - self.started, 3),
+            'stages': {name: round(seconds, 3) for name, seconds in self.seconds.items()}
+        }
+        if client is not None:
+            metrics['requests'] = client.request_metrics()
+        return metrics
+
+    def print_stages(self):
+        print("\nStage timings:")
+        for name, seconds in self.seconds.items():
+            print(f"  {name}: {seconds:.2f}s")
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+def prometheus_lines(metrics):
+    """Prometheus text exposition lines for a metrics dict from BuildMetrics.to_dict()"""
+    prefix = PROMETHEUS_PREFIX
+    generator = metrics['generator']
+    lines = [
+        f"# HELP {prefix}_build_seconds Wall time of the last build",
+        f"# TYPE {prefix}_build_seconds gauge",
+        f"{prefix}_build_seconds{_labels(generator=generator)} {metrics['wallSeconds']}",
+        f"# HELP {prefix}_stage_seconds Wall time per pipeline stage in the last build",
+        f"# TYPE {prefix}_stage_seconds gauge"
+    ]
+    for stage, seconds in metrics['stages'].items():
+        lines.append(f"{prefix}_stage_seconds{_labels(generator=generator, stage=stage)} {seconds}")
+
+    requests = metrics.get('requests')
+    if requests:
+        endpoints = requests['endpoints'].items()
+        # Each family's samples have to follow its own HELP/TYPE lines
+        families = [
+            ('http_requests', 'Requests sent per endpoint in the last build',
+             [({'endpoint': endpoint}, stats['requests']) for endpoint, stats in endpoints]),
+            ('http_bytes', 'Response bytes downloaded per endpoint in the last build',
+             [({'endpoint': endpoint}, stats['bytes']) for endpoint, stats in endpoints]),
+            ('http_latency_ms', 'Request latency per endpoint in the last build',
+             [({'endpoint': endpoint, 'quantile': quantile}, stats[quantile + 'Ms'])
+              for endpoint, stats in endpoints for quantile in ('p50', 'p95', 'p99', 'max')])
+        ]
+        for name, help_text, samples in families:
+            lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} gauge"]
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{_labels(generator=generator, **labels)} {value}")
+
+        lines += [
+            f"# HELP {prefix}_http_retries Retried requests in the last build",
+            f"# TYPE {prefix}_http_retries gauge",
+            f"{prefix}_http_retries{_labels(generator=generator)} {requests['retries']}"
+        ]
+        if requests.get('cache'):
+            lines += [
+                f"# HELP {prefix}_http_cache Response cache lookups by result in the last build",
+                f"# TYPE {prefix}_http_cache gauge"
+            ]
+            for result, count in requests['cache'].items():
+                lines.append(f"{prefix}_http_cache{_labels(generator=generator, result=result)} {count}")
+    return lines
+
+def write_prometheus(metrics, path):
+    """Write the metrics in Prometheus text format, atomically so a collector never sees half a file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write('\n'.join(prometheus_lines(metrics)) + '\n')
+    os.replace(tmp_path, path)
+    print(f"Wrote Prometheus metrics to {path}")
+
+def add_metrics_arguments(parser):
+    parser.add_argument('--prometheus', default=None, metavar='PATH',
+                        help="Also write the build metrics in Prometheus text format to PATH")
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+import rankings
+
+# Snake-draft simulator. Every team drafts from its own noisy copy of the
+# ranking (rank scaled by a log-normal factor), taking the best available
+# player its roster can still hold. Roster room follows leagueSettings
+# rosterPositions the way draft-board.js fills slots: own position first,
+# then FLEX for RB/WR/TE, then BENCH. Thousands of drafts run across a
+# process pool and reduce to ADP, spread and pick-by-pick availability.
+
+ADP_PATH = 'data/adp.json'
+FLEX_POSITIONS = ['RB', 'WR', 'TE']
+DEFAULT_SPREAD = 0.25  # sd of the log-rank noise: ~25% rank disagreement between teams
+TASK_DRAFTS = 250      # drafts per pool task
+
+def pick_label(pick, teams):
+    """Overall pick number (1-based) -> round.pick, e.g. 19 in a 12-team league -> '2.07'"""
+    return f"{(pick - 1) // teams + 1}.{(pick - 1) % teams + 1:02d}"
+
+def snake_order(teams, rounds):
+    """Team index on the clock for every pick"""
+    order = []
+    for draft_round in range(rounds):
+        picks = list(range(teams))
+        order.extend(picks if draft_round % 2 == 0 else reversed(picks))
+    return np.array(order, dtype=np.int64)
+
+def draft_board(players, size, scoring_type):
+    """(player ids, positions) in ranking order for one league configuration"""
+    table = rankings.rank_configuration(players, size, scoring_type)
+    by_id = {player['id']: player for player in players}
+    ids = table['playerIds']
+    return ids, [by_id[player_id]['position'] for player_id in ids]
+
+def run_drafts(positions, roster, teams, drafts, spread, seed):
+    """Pick number (1-based, 0 = undrafted) of every player in each of `drafts` drafts"""
+    rng = np.random.default_rng(seed)
+    labels = sorted(set(positions))
+    codes = np.array([labels.index(position) for position in positions])
+    flex_ok = np.array([label in FLEX_POSITIONS for label in labels])
+    n = len(positions)
+    rounds = sum(roster.values())
+    order = snake_order(teams, rounds)
+    log_rank = np.log(np.arange(1, n + 1))
+
+    limits = np.array([roster.get(label, 0) for label in labels])
+    results = np.zeros((drafts, n), dtype=np.int16)
+
+    for draft in range(drafts):
+        # Each team's own view of the board
+        boards = log_rank + rng.normal(0, spread, (teams, n))
+        available = np.ones(n, dtype=bool)
+        filled = np.zeros((teams, len(labels)), dtype=np.int64)
+        flex = np.zeros(teams, dtype=np.int64)
+        bench = np.zeros(teams, dtype=np.int64)
+
+        for pick, team in enumerate(order):
+            bench_open = bench[team] < roster.get('BENCH', 0)
+            flex_open = flex[team] < roster.get('FLEX', 0)
+            allowed = (filled[team] < limits) | bench_open | (flex_ok & flex_open)
+            candidates = available & allowed[codes]
+            if not candidates.any():
+                continue
+
+            choice = np.argmin(np.where(candidates, boards[team], np.inf))
+            code = codes[choice]
+            if filled[team, code] < limits[code]:
+                filled[team, code] += 1
+            elif flex_ok[code] and flex_open:
+                flex[team] += 1
+            else:
+                bench[team] += 1
+            available[choice] = False
+            results[draft, choice] = pick + 1
+
+    return results
+
+def summarize(results, ids, players, teams, total_picks):
+    """Per-player ADP, standard deviation, draft rate and availability at each pick"""
+    by_id = {player['id']: player for player in players}
+    drafts = len(results)
+    summary = []
+
+    for column, player_id in enumerate(ids):
+        picks = results[:, column]
+        taken = picks[picks > 0].astype(np.float64)
+        if not len(taken):
+            continue
+        # Still on the board at pick p: undrafted, or taken at p or later
+        counts = np.bincount(picks, minlength=total_picks + 1)
+        taken_before = np.cumsum(counts[1:]) - counts[1:]
+        availability = 1 - taken_before / drafts
+
+        player = by_id[player_id]
+        summary.append({
+            'id': player_id,
+            'name': player['name'],
+            'position': player['position'],
+            'adp': round(float(taken.mean()), 2),
+            'adpLabel': pick_label(int(round(taken.mean())), teams),
+            'std': round(float(taken.std()), 2),
+            'drafted': round(len(taken) / drafts, 4),
+            'availability': [round(float(value), 3) for value in availability]
+        })
+
+    summary.sort(key=lambda entry: entry['adp'])
+    return summary
+
+def simulate(players, size=12, scoring_type='halfPPR', drafts=2000, roster=rankings.DEFAULT_ROSTER,
+             spread=DEFAULT_SPREAD, workers=None, seed=0):
+    ids, positions = draft_board(players, size, scoring_type)
+    workers = workers or os.cpu_count() or 1
+
+    tasks = max(1, -(-drafts // TASK_DRAFTS))
+    sizes = [drafts // tasks + (1 if i < drafts % tasks else 0) for i in range(tasks)]
+    seeds = np.random.SeedSequence(seed).spawn(tasks)
+
+    start = time.perf_counter()
+    if workers == 1:
+        parts = [run_drafts(positions, roster, size, count, spread, s) for count, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(run_drafts, repeat(positions), repeat(roster), repeat(size),
+                                      sizes, repeat(spread), seeds))
+    elapsed = time.perf_counter() - start
+
+    total_picks = size * sum(roster.values())
+    return {
+        'generatedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'size': size,
+        'scoringType': scoring_type,
+        'roster': roster,
+        'drafts': drafts,
+        'spread': spread,
+        'seed': seed,
+        'picks': [pick_label(pick, size) for pick in range(1, total_picks + 1)],
+        'draftsPerSecond': round(drafts / elapsed, 1),
+        'players': summarize(np.concatenate(parts), ids, players, size, total_picks)
+    }
+
+def main(path='data/players.json', output=ADP_PATH, size=12, scoring_type='halfPPR', drafts=2000,
+         spread=DEFAULT_SPREAD, workers=None, seed=0):
+    players = rankings.load_players(path)
+    print(f"Running {drafts:,} {size}-team {scoring_type} mock drafts on {workers or os.cpu_count()} processes...")
+    adp = simulate(players, size, scoring_type, drafts, spread=spread, workers=workers, seed=seed)
+    print(f"{adp['draftsPerSecond']:,} drafts/sec")
+
+    with open(output, 'w') as f:
+        json.dump(adp, f, separators=(',', ':'))
+    print(f"Saved ADP for {len(adp['players'])} players to {output}")
+
+    print("\nTop 10 by ADP:")
+    for entry in adp['players'][:10]:
+        print(f"  {entry['adp']:6.1f} ({entry['adpLabel']})  +/-{entry['std']:4.1f}  {entry['name']} ({entry['position']})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate snake drafts to estimate ADP and availability")
+    parser.add_argument('--players', default='data/players.json',
+                        help="Player file to draft from")
+    parser.add_argument('--output', default=ADP_PATH,
+                        help=f"Where to write the results (default: {ADP_PATH})")
+    parser.add_argument('--size', type=int, default=12,
+                        help="Teams in the league (default: 12)")
+    parser.add_argument('--scoring', choices=rankings.SCORING_TYPES, default='halfPPR',
+                        help="Scoring type used to rank the board (default: halfPPR)")
+    parser.add_argument('--drafts', type=int, default=2000,
+                        help="Drafts to simulate (default: 2000)")
+    parser.add_argument('--spread', type=float, default=DEFAULT_SPREAD,
+                        help="How far opponents stray from the ranking (default: 0.25)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Random seed; the same seed and inputs give the same results")
+    args = parser.parse_args()
+    main(args.players, args.output, args.size, args.scoring, args.drafts, args.spread, args.workers, args.seed)
@@ -0,0 +1,371 @@
+import argparse
+import json
+import random
+import re
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import team_registry
+
+# Local stand-in for the ESPN and FantasyPros endpoints the scrapers use, for
+# load testing without touching the real services. It serves a synthetic
+# league of any size (the first 32 teams are the real NFL teams) with
+# configurable latency, error rate and a 429 rate limit. Point a scraper at it
+# with --base-url; the client keeps the real path and query, so one server
+# answers for every host.
+#
+#   python3 mock_server.py --teams 500 --latency 40 --error-rate 0.02 --rate-limit 200
+#   python3 scrape_all_nfl_players.py --base-url http://127.0.0.1:8765 --refresh-teams --workers 32 --rate 0
+
+DEFAULT_PORT = 8765
+
+# Fantasy players generated per team, and roster positions as ESPN names them
+ROSTER_SIZES = {'QB': 3, 'RB': 5, 'WR': 7, 'TE': 3, 'K': 1}
+
+# kona_player_info filterSlotIds -> position
+SLOT_POSITIONS = {1: 'QB', 2: 'RB', 3: 'WR', 4: 'TE', 5: 'K', 16: 'D/ST'}
+
+# FantasyPros page name -> position
+RANKING_PAGES = {'qb': 'QB', 'rb': 'RB', 'wr': 'WR', 'te': 'TE', 'k': 'K', 'dst': 'D/ST'}
+
+SEASON_POINTS = {'QB': 330, 'RB': 230, 'WR': 210, 'TE': 140, 'K': 130, 'D/ST': 120}
+
+# Season the scoreboard reports; weeks up to --week have final boxscores
+SEASON = 2024
+DEFAULT_WEEK = 10
+
+ROSTER_RE = re.compile(r'^/apis/site/v2/sports/football/nfl/teams/(\w+)/roster$')
+KONA_RE = re.compile(r'^/apis/v3/games/ffl/seasons/\d+/players$')
+RANKINGS_RE = re.compile(r'^/nfl/rankings/(\w+)\.php$')
+
+def synthetic_teams(count):
+    """The real teams first, then numbered expansion teams"""
+    teams = [dict(team) for team in team_registry.FALLBACK_TEAMS[:count]]
+    for number in range(len(teams) + 1, count + 1):
+        teams.append({'id': str(100 + number), 'abbreviation': f"X{number:03d}", 'name': f"Team {number}",
+                      'displayName': f"Expansion Team {number}", 'location': f"City {number}"})
+    return teams
+
+class League:
+    """Teams and players behind every response, generated once from a seed"""
+
+    def __init__(self, team_count=32, seed=0, week=DEFAULT_WEEK):
+        rng = random.Random(seed)
+        self.seed = seed
+        self.week = week
+        self.teams = synthetic_teams(team_count)
+        self.players = []
+
+        next_id = 1
+        for team in self.teams:
+            for position, count in ROSTER_SIZES.items():
+                for depth in range(count):
+                    self.players.append({
+                        'id': next_id,
+                        'name': f"{team['location']} {position}{depth + 1}",
+                        'position': position,
+                        'teamId': team['id'],
+                        'team': team['abbreviation'],
+                        'age': rng.randint(21, 36),
+                        'experience': rng.randint(0, 14),
+                        'points': SEASON_POINTS[position] * rng.uniform(0.2, 1.0) / (depth + 1)
+                    })
+                    next_id += 1
+            self.players.append({
+                'id': -int(team['id']),
+                'name': f"{team['name']} D/ST",
+                'position': 'D/ST',
+                'teamId': team['id'],
+                'team': team['abbreviation'],
+                'age': 0,
+                'experience': 0,
+                'points': SEASON_POINTS['D/ST'] * rng.uniform(0.5, 1.0)
+            })
+
+        # Ownership follows projected points within a position
+        self.by_position = {}
+        for player in sorted(self.players, key=lambda p: -p['points']):
+            self.by_position.setdefault(player['position'], []).append(player)
+        for players in self.by_position.values():
+            for rank, player in enumerate(players):
+                player['percentOwned'] = round(100 * 0.985 ** rank, 2)
+
+        # Static bodies are serialized once so the server spends its time on I/O
+        self.teams_body = json.dumps(self.teams_payload()).encode()
+        self.scoreboard_body = json.dumps(self.scoreboard_payload()).encode()
+        self.roster_bodies = {team['id']: json.dumps(self.roster_payload(team)).encode() for team in self.teams}
+        self.ranking_bodies = {page: self.rankings_page(position).encode() for page, position in RANKING_PAGES.items()}
+
+    def teams_payload(self):
+        return {'sports': [{'leagues': [{'teams': [{'team': team} for team in self.teams]}]}]}
+
+    def scoreboard_payload(self, week=None):
+        """The week's games; without a week, the current one"""
+        week = week or self.week
+        events = []
+        for home, away in zip(self.teams[0::2], self.teams[1::2]):
+            events.append({
+                'id': f"{week}-{home['id']}-{away['id']}",
+                'name': f"{away['displayName']} at {home['displayName']}",
+                'status': {'type': {'completed': week <= self.week}},
+                'competitions': [{'competitors': [{'homeAway': 'home', 'team': home},
+                                                  {'homeAway': 'away', 'team': away}]}]
+            })
+        return {'season': {'year': SEASON, 'type': 2}, 'week': {'number': week}, 'events': events}
+
+    def stat_line(self, player, week):
+        """(category, keys, stats) boxscore lines for one player-week, or [] for a missed game"""
+        rng = random.Random(f"{self.seed}:{player['id']}:{week}")
+        if rng.random() < 0.08:
+            return []
+        target = player['points'] / 17 * rng.lognormvariate(0, 0.45)
+        touchdowns = lambda share, value: int(target * share / value + rng.random())
+        position = player['position']
+        if position == 'QB':
+            interceptions = rng.choice([0, 0, 1, 1, 2])
+            return [('passing', ['completions/passingAttempts', 'passingYards', 'passingTouchdowns', 'interceptions'],
+                     ['20/31', str(round(target * 0.45 / 0.04)), str(touchdowns(0.4, 4)), str(interceptions)]),
+                    ('rushing', ['rushingAttempts', 'rushingYards', 'rushingTouchdowns'],
+                     ['4', str(round(target * 0.15 / 0.1)), '0'])]
+        if position == 'RB':
+            return [('rushing', ['rushingAttempts', 'rushingYards', 'rushingTouchdowns'],
+                     ['15', str(round(target * 0.5 / 0.1)), str(touchdowns(0.3, 6))]),
+                    ('receiving', ['receptions', 'receivingYards', 'receivingTouchdowns'],
+                     [str(round(target * 0.1 / 0.5)), str(round(target)), '0'])]
+        if position in ('WR', 'TE'):
+            return [('receiving', ['receptions', 'receivingYards', 'receivingTouchdowns'],
+                     [str(round(target * 0.15 / 0.5)), str(round(target * 0.55 / 0.1)), str(touchdowns(0.3, 6))])]
+        made, extra = round(target * 0.7 / 3), round(target * 0.3)
+        return [('kicking', ['fieldGoalsMade/fieldGoalAttempts', 'extraPointsMade/extraPointAttempts'],
+                 [f"{made}/{made + rng.randint(0, 1)}", f"{extra}/{extra}"])]
+
+    def summary_payload(self, event_id):
+        """Boxscore for a "week-home-away" game id, or None for an unknown game"""
+        try:
+            week, home, away = event_id.split('-')
+            week = int(week)
+        except ValueError:
+            return None
+        teams = []
+        for team in (t for t in self.teams if t['id'] in (home, away)):
+            categories = {}
+            for player in self.players:
+                if player['teamId'] != team['id'] or player['position'] == 'D/ST':
+                    continue
+                for name, keys, stats in self.stat_line(player, week):
+                    category = categories.setdefault(name, {'name': name, 'keys': keys, 'athletes': []})
+                    category['athletes'].append({'athlete': {'id': str(player['id']), 'displayName': player['name']},
+                                                 'stats': stats})
+            teams.append({'team': team, 'statistics': list(categories.values())})
+        return {'boxscore': {'players': teams}}
+
+    def roster_payload(self, team):
+        groups = {}
+        for player in self.players:
+            if player['teamId'] != team['id'] or player['position'] == 'D/ST':
+                continue
+            groups.setdefault(player['position'], []).append({
+                'id': str(player['id']),
+                'fullName': player['name'],
+                'age': player['age'],
+                'experience': {'years': player['experience']},
+                'status': {'type': {'name': 'Active'}}
+            })
+        return {'athletes': [{'position': position, 'items': items} for position, items in groups.items()]}
+
+    def kona_players(self, fantasy_filter):
+        """kona_player_info players for an x-fantasy-filter: slot, offset/limit, ownership order"""
+        slots = fantasy_filter.get('filterSlotIds', {}).get('value', [])
+        players = []
+        for slot in slots:
+            players.extend(self.by_position.get(SLOT_POSITIONS.get(slot), []))
+        players.sort(key=lambda p: -p['percentOwned'])
+
+        offset = fantasy_filter.get('offset', 0)
+        limit = fantasy_filter.get('limit', 50)
+        return [{
+            'id': player['id'],
+            'player': {
+                'id': player['id'],
+                'fullName': player['name'],
+                'proTeamId': int(player['teamId']),
+                'ownership': {'percentOwned': player['percentOwned']},
+                'stats': [{'scoringPeriodId': 0, 'statSourceId': 1, 'appliedTotal': round(player['points'], 2)}]
+            }
+        } for player in players[offset:offset + limit]]
+
+    def rankings_page(self, position):
+        rows = []
+        for rank, player in enumerate(self.by_position.get(position, [])[:300], 1):
+            rows.append(f'<tr class="player-row"><td>{rank}</td><td><div class="player-cell">'
+                        f'<a href="/nfl/players/{player["id"]}.php">{player["name"]}</a> '
+                        f'<small class="grey">{player["team"]}</small></div></td></tr>')
+        return ('<!DOCTYPE html><html><head><title>Rankings</title></head><body>'
+                '<table id="ranking-table"><thead><tr><th>Rank</th><th>Player</th></tr></thead><tbody>'
+                + ''.join(rows) + '</tbody></table></body></html>')
+
+class Faults:
+    """Latency, random errors and a server-wide request rate limit"""
+
+    def __init__(self, latency=0.0, spread=0.5, error_rate=0.0, rate_limit=0.0, seed=0):
+        self.latency = latency
+        self.spread = spread
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self.tokens = max(1.0, rate_limit)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def delay(self):
+        """Seconds to wait: log-normal around `latency`, so there is a tail"""
+        if self.latency <= 0:
+            return 0.0
+        with self.lock:
+            return self.latency * self.rng.lognormvariate(0, self.spread)
+
+    def throttled(self):
+        if self.rate_limit <= 0:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(max(1.0, self.rate_limit), self.tokens + (now - self.updated) * self.rate_limit)
+            self.updated = now
+            if self.tokens < 1:
+                return True
+            self.tokens -= 1
+            return False
+
+    def failed(self):
+        if self.error_rate <= 0:
+            return False
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+class Stats:
+    def __init__(self):
+        self.counts = {}
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def count(self, status):
+        with self.lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def print(self):
+        elapsed = time.monotonic() - self.started
+        total = sum(self.counts.values())
+        print(f"\n{total} requests in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.1f}/s)")
+        for status, count in sorted(self.counts.items()):
+            print(f"  {status}: {count}")
+
+def make_handler(league, faults, stats):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def send(self, status, body=b'', content_type='application/json', headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            stats.count(status)
+
+        def route(self):
+            """(status, body, content type) for the request path"""
+            url = urlparse(self.path)
+            if url.path == '/apis/site/v2/sports/football/nfl/teams':
+                return 200, league.teams_body, 'application/json'
+            if url.path == '/apis/site/v2/sports/football/nfl/scoreboard':
+                week = parse_qs(url.query).get('week')
+                if week:
+                    return 200, json.dumps(league.scoreboard_payload(int(week[0]))).encode(), 'application/json'
+                return 200, league.scoreboard_body, 'application/json'
+            if url.path == '/apis/site/v2/sports/football/nfl/summary':
+                payload = league.summary_payload(parse_qs(url.query).get('event', [''])[0])
+                if payload is None:
+                    return 404, b'{"error": "unknown event"}', 'application/json'
+                return 200, json.dumps(payload).encode(), 'application/json'
+
+            match = ROSTER_RE.match(url.path)
+            if match:
+                body = league.roster_bodies.get(match.group(1))
+                return (200, body, 'application/json') if body else (404, b'{}', 'application/json')
+
+            if KONA_RE.match(url.path):
+                try:
+                    fantasy_filter = json.loads(self.headers.get('x-fantasy-filter') or '{}')
+                except ValueError:
+                    return 400, b'{"error": "bad x-fantasy-filter"}', 'application/json'
+                return 200, json.dumps({'players': league.kona_players(fantasy_filter)}).encode(), 'application/json'
+
+            match = RANKINGS_RE.match(url.path)
+            if match and match.group(1) in league.ranking_bodies:
+                return 200, league.ranking_bodies[match.group(1)], 'text/html; charset=utf-8'
+
+            return 404, b'{"error": "not found"}', 'application/json'
+
+        def do_GET(self):
+            time.sleep(faults.delay())
+            if faults.throttled():
+                self.send(429, b'{"error": "rate limited"}', headers={'Retry-After': '1'})
+            elif faults.failed():
+                self.send(503, b'{"error": "injected failure"}')
+            else:
+                self.send(*self.route())
+
+    return Handler
+
+def main(host='127.0.0.1', port=DEFAULT_PORT, teams=32, latency=0.0, spread=0.5, error_rate=0.0,
+         rate_limit=0.0, seed=0, week=DEFAULT_WEEK):
+    league = League(teams, seed, week)
+    faults = Faults(latency / 1000, spread, error_rate, rate_limit, seed)
+    stats = Stats()
+    server = ThreadingHTTPServer((host, port), make_handler(league, faults, stats))
+    server.daemon_threads = True
+
+    print(f"Serving {len(league.teams)} teams / {len(league.players)} players on http://{host}:{port}")
+    print(f"Latency {latency:.0f}ms (spread {spread}), error rate {error_rate:.1%}, "
+          f"rate limit {rate_limit or 'off'}; Ctrl-C to stop")
+    # Stop cleanly (and print the request counts) when killed from a load-test script too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats.print()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in ESPN/FantasyPros server for load testing")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--teams', type=int, default=32,
+                        help="Teams in the synthetic league (default: 32)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Median response delay in milliseconds (default: 0)")
+    parser.add_argument('--spread', type=float, default=0.5,
+                        help="Log-normal sigma of the delay; higher means a longer tail (default: 0.5)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Fraction of requests answered with 503 (default: 0)")
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help="Requests per second before answering 429 (default: off)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Seed for the league and the injected faults (default: 0)")
+    parser.add_argument('--week', type=int, default=DEFAULT_WEEK,
+                        help=f"Current week of the {SEASON} season; earlier weeks have boxscores (default: {DEFAULT_WEEK})")
+    args = parser.parse_args()
+    main(args.host, args.port, args.teams, args.latency, args.spread, args.error_rate, args.rate_limit, args.seed,
+         args.week)
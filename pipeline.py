@@ -0,0 +1,301 @@
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import shutil
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import binary_table
+import columnar
+import search_index
+
+# Streaming building blocks shared by the generator scripts. Every stage takes
+# an iterable of player records and yields records, so a run is a chain of
+# generators:  source -> normalize -> injury enrichment -> projection -> writer
+# and only the optional sort ever holds more than one record at a time.
+
+DEFAULT_MEMORY_BUDGET = 100000  # records the sort keeps in memory before spilling
+FLOAT_DIGITS = 3  # decimals kept in the compact players.min.json
+
+def map_stage(records, fn):
+    """Apply a per-record function lazily"""
+    for record in records:
+        yield fn(record)
+
+def first_nonempty(*sources):
+    """Yield from the first source that completes with records.
+
+    Each source is a (label, callable) pair where the callable returns an
+    iterable. A source that raises or yields nothing hands over to the next
+    one, even part way through: records are spooled to a temporary file and
+    only replayed once their source has finished, so a failed source never
+    ends up as a truncated build.
+    """
+    for label, source in sources:
+        spool = tempfile.TemporaryFile('w+')
+        count = 0
+        try:
+            for record in source():
+                spool.write(json.dumps(record))
+                spool.write('\n')
+                count += 1
+        except Exception as e:
+            spool.close()
+            print(f"{label} failed after {count} players ({e}), trying the next source...")
+            continue
+        if not count:
+            spool.close()
+            print(f"{label} returned no players, trying the next source...")
+            continue
+
+        spool.seek(0)
+        try:
+            yield from _read_run(spool)
+        finally:
+            spool.close()
+        return
+
+def peek(records):
+    """Return (first record or None, iterator over all records)"""
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
+        return None, iter(())
+    return first, itertools.chain([first], records)
+
+def _spill(chunk, key):
+    chunk.sort(key=key)
+    handle = tempfile.TemporaryFile('w+')
+    for record in chunk:
+        handle.write(json.dumps(record))
+        handle.write('\n')
+    handle.seek(0)
+    return handle
+
+def _read_run(handle):
+    for line in handle:
+        yield json.loads(line)
+
+def sort_stream(records, key, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """Sort a stream, spilling sorted runs to disk and merging them when it outgrows the budget"""
+    chunk = []
+    runs = []
+
+    for record in records:
+        chunk.append(record)
+        if memory_budget and len(chunk) >= memory_budget:
+            runs.append(_spill(chunk, key))
+            chunk = []
+
+    if not runs:
+        chunk.sort(key=key)
+        yield from chunk
+        return
+
+    if chunk:
+        runs.append(_spill(chunk, key))
+    try:
+        yield from heapq.merge(*(_read_run(run) for run in runs), key=key)
+    finally:
+        for run in runs:
+            run.close()
+
+def _count(record, stats):
+    stats['totalPlayers'] += 1
+    position = record.get('position')
+    stats['positions'][position] = stats['positions'].get(position, 0) + 1
+
+def round_floats(value, digits=FLOAT_DIGITS):
+    """Copy of a JSON value with every float rounded to `digits` decimals"""
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: round_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [round_floats(item, digits) for item in value]
+    return value
+
+def compact_path(path):
+    """data/players.json -> data/players.min.json"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.min{ext}"
+
+def write_json_array(records, path, compact=True):
+    """Stream records into a JSON array laid out exactly like json.dump(..., indent=2)
+
+    With compact=True the same pass also writes a minified copy with rounded
+    floats next to it; the content hash in the stats is taken over that copy.
+    """
+    stats = {'totalPlayers': 0, 'positions': {}}
+    tmp_path = path + '.tmp'
+    min_path = compact_path(path)
+    digest = hashlib.sha256()
+
+    with open(tmp_path, 'w') as f, open(min_path + '.tmp', 'w') as m:
+        for record in records:
+            first = stats['totalPlayers'] == 0
+            pretty = ('[\n  ' if first else ',\n  ') + json.dumps(record, indent=2).replace('\n', '\n  ')
+            f.write(pretty)
+            if compact:
+                minified = ('[' if first else ',') + json.dumps(round_floats(record), separators=(',', ':'))
+                m.write(minified)
+                digest.update(minified.encode())
+            else:
+                digest.update(pretty.encode())
+            _count(record, stats)
+
+        f.write('\n]' if stats['totalPlayers'] else '[]')
+        m.write(']' if stats['totalPlayers'] else '[]')
+
+    os.replace(tmp_path, path)
+    if compact:
+        os.replace(min_path + '.tmp', min_path)
+        stats['compactPath'] = min_path
+    else:
+        os.remove(min_path + '.tmp')
+    stats['contentHash'] = digest.hexdigest()[:16]
+    return stats
+
+def write_compressed_siblings(path):
+    """Write `path`.gz (and `path`.br when brotli is installed); return {path: bytes}"""
+    sizes = {path: os.path.getsize(path)}
+
+    # mtime=0 keeps the .gz byte-identical when the content is unchanged
+    with open(path, 'rb') as src, open(path + '.gz.tmp', 'wb') as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=9, mtime=0) as dst:
+            shutil.copyfileobj(src, dst)
+    os.replace(path + '.gz.tmp', path + '.gz')
+    sizes[path + '.gz'] = os.path.getsize(path + '.gz')
+
+    if brotli is None:
+        print("brotli not installed, skipping the .br variant (pip install brotli)")
+        return sizes
+
+    compressor = brotli.Compressor(quality=11)
+    with open(path, 'rb') as src, open(path + '.br.tmp', 'wb') as dst:
+        for block in iter(lambda: src.read(1 << 16), b''):
+            dst.write(compressor.process(block))
+        dst.write(compressor.finish())
+    os.replace(path + '.br.tmp', path + '.br')
+    sizes[path + '.br'] = os.path.getsize(path + '.br')
+    return sizes
+
+def write_ndjson(records, path):
+    """Stream records as newline-delimited JSON, one record per line"""
+    stats = {'totalPlayers': 0, 'positions': {}}
+    tmp_path = path + '.tmp'
+    digest = hashlib.sha256()
+
+    with open(tmp_path, 'w') as f:
+        for record in records:
+            line = json.dumps(record, separators=(',', ':')) + '\n'
+            f.write(line)
+            digest.update(line.encode())
+            _count(record, stats)
+
+    os.replace(tmp_path, path)
+    stats['contentHash'] = digest.hexdigest()[:16]
+    return stats
+
+def write_players(records, output_format='json', path=None, compact=True, columnar_path=None, binary_path=None,
+                  search=False):
+    """Write the stream in the requested format and return counts for summary.json
+
+    JSON output also gets players.min.json plus precompressed .gz/.br copies
+    of it for the browser; see summary_fields(). With `columnar_path` the
+    same pass also fills a columnar export written there, with `binary_path`
+    the memory-mapped binary table (binary_table.py) and with `search` the
+    search index next to the player file (players.search.json).
+    """
+    builder = None
+    if columnar_path:
+        builder = columnar.ColumnarBuilder()
+        records = map_stage(records, builder.add)
+    table = None
+    if binary_path:
+        table = binary_table.TableBuilder()
+        records = map_stage(records, table.add)
+    index = None
+    if search:
+        index = search_index.SearchIndexBuilder()
+        records = map_stage(records, index.add)
+
+    if output_format == 'ndjson':
+        path = path or 'data/players.ndjson'
+        stats = write_ndjson(records, path)
+    else:
+        path = path or 'data/players.json'
+        stats = write_json_array(records, path, compact=compact)
+
+    stats['path'] = path
+    stats['files'] = {path: os.path.getsize(path)}
+    if stats.get('compactPath'):
+        stats['files'].update(write_compressed_siblings(stats['compactPath']))
+    if builder is not None:
+        builder.write(columnar_path)
+        stats['columnarPath'] = columnar_path
+        stats['files'].update(write_compressed_siblings(columnar_path))
+    if table is not None:
+        stats['files'][binary_path] = table.write(binary_path)
+        stats['binaryPath'] = binary_path
+    if index is not None:
+        stats['searchPath'] = search_index.search_path(path)
+        index.write(stats['searchPath'])
+        stats['files'].update(write_compressed_siblings(stats['searchPath']))
+    return stats
+
+def summary_fields(written):
+    """Cache-busting fields for summary.json: content hash, compact file name and sizes"""
+    fields = {'contentHash': written['contentHash']}
+    if written.get('compactPath'):
+        fields['compactFile'] = os.path.basename(written['compactPath'])
+    if written.get('columnarPath'):
+        fields['columnarFile'] = os.path.basename(written['columnarPath'])
+    if written.get('binaryPath'):
+        fields['binaryFile'] = os.path.basename(written['binaryPath'])
+    if written.get('searchPath'):
+        fields['searchFile'] = os.path.basename(written['searchPath'])
+    fields['files'] = {os.path.basename(name): size for name, size in written['files'].items()}
+    return fields
+
+def update_summary(written, path='data/summary.json'):
+    """Refresh the file fields of an existing summary.json after rewriting the player files"""
+    try:
+        with open(path) as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        summary = {}
+    for key in ('compactFile', 'columnarFile', 'binaryFile', 'searchFile'):
+        summary.pop(key, None)
+    summary.update(summary_fields(written))
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+def print_file_sizes(written):
+    for name, size in written['files'].items():
+        print(f"  {name}: {size / 1024:.1f} KB")
+
+def add_output_arguments(parser, sort=True):
+    """Output options shared by the generator scripts"""
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json',
+                        help="Write data/players.json (default) or stream to data/players.ndjson")
+    parser.add_argument('--memory-budget', type=int, default=DEFAULT_MEMORY_BUDGET,
+                        help="Records held in memory while sorting before spilling to disk")
+    parser.add_argument('--columnar', action='store_true',
+                        help=f"Also write a columnar export to {columnar.COLUMNAR_PATH} for the draft board")
+    parser.add_argument('--binary', action='store_true',
+                        help=f"Also write a memory-mapped binary table to {binary_table.BINARY_PATH} for analysis")
+    parser.add_argument('--search-index', action='store_true',
+                        help="Also write a search index next to the player file for the draft board's search box")
+    parser.add_argument('--simulate', type=int, default=0, metavar='SEASONS',
+                        help="Run simulation.py's season simulation as part of the build (default: off)")
+    if sort:
+        parser.add_argument('--no-sort', action='store_true',
+                            help="Write players in fetch order instead of sorting by position and points")
@@ -0,0 +1,48 @@
+import json
+import os
+
+# Stable numeric player IDs. The browser keys draft state (fantasyDraftState in
+# localStorage) by player['id'], so an ID must not change between runs. Each
+# generator derives an upstream key for a player (the ESPN athlete ID where we
+# have one) and this map hands out the same number for that key every time.
+
+ID_MAP_PATH = 'data/player_ids.json'
+
+def espn_key(athlete_id):
+    return f"espn:{athlete_id}"
+
+def defense_key(team_abbr):
+    return f"dst:{team_abbr}"
+
+def name_key(source, position, name):
+    """Key for sources without upstream IDs (static lists, scraped pages)"""
+    return f"{source}:{position}:{name}"
+
+class PlayerIdMap:
+    """Persistent upstream key -> numeric player ID assignment"""
+
+    def __init__(self, path=ID_MAP_PATH):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.ids = json.load(f)['ids']
+        except (OSError, ValueError, KeyError):
+            self.ids = {}
+        self.next_id = max(self.ids.values(), default=0) + 1
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def assign(self, key):
+        """ID for `key`, allocating the next free number for unseen keys"""
+        player_id = self.ids.get(key)
+        if player_id is None:
+            player_id = self.next_id
+            self.ids[key] = player_id
+            self.next_id += 1
+        return player_id
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'ids': self.ids}, f, indent=2)
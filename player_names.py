@@ -0,0 +1,177 @@
+import functools
+import math
+import re
+import unicodedata
+
+# Name normalization shared by every lookup that goes by player name. ESPN's
+# fullName, FantasyPros' table text and the static lists disagree on
+# suffixes ("Jr.", "III"), punctuation ("J.K." / "JK"), apostrophes and
+# accents, so exact dict lookups on the raw name silently miss.
+#
+# NameIndex is built once per run from a name -> value table. Exact lookups
+# go through the canonical key (plus a small alias table for nicknames) and
+# stay O(1); names that still miss fall back to trigram similarity. Only each
+# name's rarest trigrams are indexed (prefix filtering), which is enough to
+# find every match above the threshold while skipping the huge posting lists
+# of common trigrams like first names. A fuzzy hit can be held to the
+# caller's position and team (`where`), since a close name on another
+# position ("Darren Wallace" / Darren Waller) is a different player.
+
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Canonical key -> canonical key of the name the other sources use
+ALIASES = {
+    'hollywood brown': 'marquise brown',
+    'chig okonkwo': 'chigoziem okonkwo',
+    'gabe davis': 'gabriel davis',
+    'josh palmer': 'joshua palmer',
+    'mitch trubisky': 'mitchell trubisky',
+    'scotty miller': 'scott miller',
+}
+
+DEFAULT_THRESHOLD = 0.75  # minimum Dice similarity for a fuzzy match
+
+PUNCTUATION_RE = re.compile(r"['’.]")
+SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+@functools.lru_cache(maxsize=1 << 16)
+def canonical(name):
+    """Lowercase ASCII key without punctuation or generational suffixes
+
+    canonical("Travis Etienne Jr.") == canonical("travis etienne") == "travis etienne"
+    canonical("Ja'Marr Chase") == "jamarr chase"
+
+    Memoized: a build canonicalizes the same names in several stages.
+    """
+    if not name.isascii():
+        name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    name = name.lower()
+    words = SEPARATOR_RE.sub(' ', PUNCTUATION_RE.sub('', name)).split()
+    while len(words) > 2 and words[-1] in SUFFIXES:
+        words.pop()
+    key = ' '.join(words)
+    return ALIASES.get(key, key)
+
+def trigrams(key):
+    """Character trigrams of a canonical key, padded so word starts and ends count"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def prefix_length(size, threshold):
+    """How many of a name's rarest trigrams a match at `threshold` must share at least one of
+
+    Dice >= threshold needs at least threshold * size / (2 - threshold)
+    shared trigrams, whatever the other name's length.
+    """
+    return size - math.ceil(threshold * size / (2 - threshold)) + 1
+
+class NameIndex:
+    """Name -> value lookups that tolerate the spelling differences between sources"""
+
+    def __init__(self, entries=(), threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.values = {}        # canonical key -> value
+        self.names = {}         # canonical key -> name as first added
+        self.keys = []          # key number -> canonical key
+        self.gram_sets = []     # key number -> trigrams of the key
+        self.gram_counts = {}   # trigram -> number of keys containing it
+        self.prefixes = None    # trigram -> key numbers with it among their rarest trigrams
+        self.fuzzy_cache = {}
+
+        if hasattr(entries, 'items'):
+            entries = entries.items()
+        for name, value in entries:
+            self.add(name, value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, name):
+        return canonical(name) in self.values
+
+    def add(self, name, value):
+        """Index `value` under `name`; the first value added for a key wins"""
+        key = canonical(name)
+        if key in self.values:
+            return
+        self.values[key] = value
+        self.names[key] = name
+
+        self.keys.append(key)
+        grams = frozenset(trigrams(key))
+        self.gram_sets.append(grams)
+        for gram in grams:
+            self.gram_counts[gram] = self.gram_counts.get(gram, 0) + 1
+        self.prefixes = None
+        self.fuzzy_cache.clear()
+
+    def _rarest_first(self, grams):
+        # One global order (rarity, then the gram itself) for keys and queries alike
+        return sorted(grams, key=lambda gram: (self.gram_counts.get(gram, 0), gram))
+
+    def _prefix_index(self):
+        """Posting lists over each key's rarest trigrams only, built on the first fuzzy lookup"""
+        if self.prefixes is None:
+            self.prefixes = {}
+            for number, grams in enumerate(self.gram_sets):
+                for gram in self._rarest_first(grams)[:prefix_length(len(grams), self.threshold)]:
+                    self.prefixes.setdefault(gram, []).append(number)
+        return self.prefixes
+
+    def _agrees(self, number, where):
+        # Fields the entry doesn't have, or the caller doesn't know, aren't checked
+        value = self.values[self.keys[number]]
+        known = value if isinstance(value, dict) else {}
+        return all(known.get(field) in (None, wanted) for field, wanted in where.items() if wanted is not None)
+
+    def match(self, name, where=None):
+        """(indexed name, score) of the closest entry, or (None, 0.0) when nothing clears the threshold
+
+        Exact and alias matches score 1.0. Otherwise the score is the Dice
+        coefficient of the two names' trigram sets, and with `where` (e.g.
+        {'position': 'RB', 'team': 'DEN'}) only entries whose values agree on
+        those fields are considered.
+        """
+        return self._match_key(canonical(name), where)
+
+    def _match_key(self, key, where=None):
+        if key in self.values:
+            return self.names[key], 1.0
+        cache_key = (key, tuple(where.items())) if where else key
+        if cache_key in self.fuzzy_cache:
+            return self.fuzzy_cache[cache_key]
+
+        # Two names that clear the threshold share a trigram within both
+        # their prefixes, so common trigrams (first names) are never scanned
+        prefixes = self._prefix_index()
+        grams = frozenset(trigrams(key))
+        candidates = set()
+        for gram in self._rarest_first(grams)[:prefix_length(len(grams), self.threshold)]:
+            candidates.update(prefixes.get(gram, ()))
+
+        gram_sets, size = self.gram_sets, len(grams)
+        best, best_score = None, 0.0
+        for number in candidates:
+            if where and not self._agrees(number, where):
+                continue
+            other = gram_sets[number]
+            score = 2.0 * len(grams & other) / (size + len(other))
+            if score > best_score:
+                best, best_score = number, score
+
+        result = (None, 0.0)
+        if best_score >= self.threshold:
+            result = (self.names[self.keys[best]], best_score)
+        self.fuzzy_cache[cache_key] = result
+        return result
+
+    def get(self, name, default=None, where=None):
+        """Value for `name`: exact canonical match first, then the closest fuzzy match agreeing with `where`"""
+        key = canonical(name)
+        value = self.values.get(key)
+        if value is not None:
+            return value
+        matched, score = self._match_key(key, where)
+        if matched is None:
+            return default
+        return self.values[canonical(matched)]
@@ -0,0 +1,225 @@
+# Projection and injury-risk model shared by the generators. The tables are
+# used by the per-player functions in scrape_all_nfl_players.py and
+# scrape_comprehensive_nfl.py; the batch functions below apply the same model
+# to whole arrays of players in one vectorized pass with a seeded generator,
+# for multi-season and simulation-sized datasets. numpy is imported on first
+# use so the per-player path (and every CLI start) doesn't pay for it.
+
+# Rank-based projection tiers: (first rank, last rank, (min points, max points))
+PROJECTION_TIERS = {
+    'QB': [
+        (1, 5, (350, 450)),    # Elite
+        (6, 12, (280, 350)),   # QB1
+        (13, 24, (220, 280)),  # QB2
+        (25, 40, (150, 220)),  # Backup
+    ],
+    'RB': [
+        (1, 5, (280, 350)),    # Elite
+        (6, 12, (220, 280)),   # RB1
+        (13, 24, (160, 220)),  # RB2
+        (25, 36, (100, 160)),  # RB3
+        (37, 50, (60, 100)),   # Backup
+    ],
+    'WR': [
+        (1, 5, (250, 320)),    # Elite
+        (6, 12, (200, 250)),   # WR1
+        (13, 24, (150, 200)),  # WR2
+        (25, 36, (100, 150)),  # WR3
+        (37, 60, (50, 100)),   # WR4/5
+    ],
+    'TE': [
+        (1, 3, (180, 250)),    # Elite
+        (4, 8, (120, 180)),    # TE1
+        (9, 16, (80, 120)),    # TE2
+        (17, 30, (40, 80)),    # Backup
+    ],
+    'K': [
+        (1, 10, (130, 160)),   # K1
+        (11, 20, (110, 130)),  # K2
+        (21, 32, (90, 110)),   # K3
+    ],
+    'DEF': [
+        (1, 10, (120, 160)),   # DEF1
+        (11, 20, (90, 120)),   # DEF2
+        (21, 32, (60, 90)),    # DEF3
+    ]
+}
+DEFAULT_TIER_RANGE = (50, 150)
+
+# Experience-based projections for full rosters (standard scoring)
+BASE_PROJECTIONS = {
+    'QB': {'min': 150, 'max': 400, 'avg': 250},
+    'RB': {'min': 50, 'max': 300, 'avg': 150},
+    'WR': {'min': 50, 'max': 250, 'avg': 120},
+    'TE': {'min': 30, 'max': 200, 'avg': 80},
+    'K': {'min': 80, 'max': 150, 'avg': 110},
+    'PK': {'min': 80, 'max': 150, 'avg': 110},
+    'DEF': {'min': 60, 'max': 150, 'avg': 100}
+}
+DEFAULT_PROJECTION = {'min': 0, 'max': 100, 'avg': 50}
+
+# Base injury risk by position
+POSITION_RISK = {
+    'QB': 0.20,
+    'RB': 0.35,
+    'WR': 0.25,
+    'TE': 0.30,
+    'K': 0.05,
+    'PK': 0.05,
+    'DEF': 0.15
+}
+DEFAULT_RISK = 0.20
+
+# Every risk score, per-player or batch, is clipped to this range
+MIN_RISK = 0.05
+MAX_RISK = 0.9
+
+GAMES = 17
+
+def tier_range(position, rank_in_position):
+    """(min, max) projected points for a rank within its position"""
+    for start, end, points in PROJECTION_TIERS.get(position, []):
+        if start <= rank_in_position <= end:
+            return points
+    return DEFAULT_TIER_RANGE
+
+def age_risk_adjustment(age):
+    """Older players, and the youngest, get hurt more often"""
+    if age > 30:
+        return 0.1
+    if age > 28:
+        return 0.05
+    if age < 23:
+        return 0.05  # Rookies also have slightly higher risk
+    return 0.0
+
+def _require_numpy():
+    """The numpy module, imported on first use"""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("The batch projection engine needs numpy (pip install numpy)")
+    return numpy
+
+def encode_positions(positions):
+    """Position labels -> (unique labels, integer code per row)
+
+    The batch functions accept either raw labels or this pair; encode once
+    when the same players go through several of them.
+    """
+    np = _require_numpy()
+    labels, codes = np.unique(np.asarray(positions, dtype=str), return_inverse=True)
+    return labels, codes
+
+def _encode(positions):
+    if isinstance(positions, tuple):
+        return positions
+    return encode_positions(positions)
+
+def _lookup(labels, codes, table, default):
+    np = _require_numpy()
+    return np.array([table.get(label, default) for label in labels], dtype=float)[codes]
+
+def default_rng(seed=None):
+    np = _require_numpy()
+    return np.random.default_rng(seed)
+
+def project_by_rank(positions, ranks, rng=None):
+    """Rank-tier projections for arrays of positions and ranks within the position
+
+    Vectorized calculate_fantasy_projections from scrape_comprehensive_nfl.py.
+    Returns a dict of arrays: totalPoints, averagePoints, consistency.
+    """
+    np = _require_numpy()
+    rng = rng if rng is not None else default_rng()
+    ranks = np.asarray(ranks, dtype=np.int64)
+    labels, codes = _encode(positions)
+    n = len(ranks)
+
+    min_points = np.full(n, DEFAULT_TIER_RANGE[0], dtype=float)
+    max_points = np.full(n, DEFAULT_TIER_RANGE[1], dtype=float)
+    for code, label in enumerate(labels):
+        tiers = PROJECTION_TIERS.get(label)
+        if not tiers:
+            continue
+        rows = np.flatnonzero(codes == code)
+        starts = np.array([tier[0] for tier in tiers])
+        ends = np.array([tier[1] for tier in tiers])
+        row_ranks = ranks[rows]
+        # First tier whose last rank is >= the player's rank, if it also starts at or before it
+        tier = np.searchsorted(ends, row_ranks, side='left')
+        found = tier < len(tiers)
+        tier = np.minimum(tier, len(tiers) - 1)
+        found &= starts[tier] <= row_ranks
+        rows, tier = rows[found], tier[found]
+        min_points[rows] = np.array([t[2][0] for t in tiers], dtype=float)[tier]
+        max_points[rows] = np.array([t[2][1] for t in tiers], dtype=float)[tier]
+
+    base_points = min_points + (max_points - min_points) * (1 - (ranks - 1) / 50)
+    total_points = base_points * (1 + rng.uniform(-0.1, 0.1, n))
+
+    consistency = np.select([ranks <= 5, ranks <= 20], [0.75, 0.65], 0.55) + rng.uniform(0, 0.15, n)
+
+    return {
+        'totalPoints': total_points,
+        'averagePoints': total_points / GAMES,
+        'consistency': np.minimum(0.95, consistency)
+    }
+
+def project_by_experience(positions, experience, rng=None):
+    """Experience-based projections for whole rosters
+
+    Vectorized calculate_fantasy_projections from scrape_all_nfl_players.py.
+    """
+    np = _require_numpy()
+    rng = rng if rng is not None else default_rng()
+    experience = np.asarray(experience, dtype=float)
+    labels, codes = _encode(positions)
+    n = len(experience)
+
+    avg = _lookup(labels, codes, {k: v['avg'] for k, v in BASE_PROJECTIONS.items()}, DEFAULT_PROJECTION['avg'])
+    low = _lookup(labels, codes, {k: v['min'] for k, v in BASE_PROJECTIONS.items()}, DEFAULT_PROJECTION['min'])
+    high = _lookup(labels, codes, {k: v['max'] for k, v in BASE_PROJECTIONS.items()}, DEFAULT_PROJECTION['max'])
+
+    # Rookies get lower projections
+    exp_multiplier = np.minimum(1.0, 0.7 + experience * 0.1)
+    total_points = np.clip(avg * exp_multiplier * (1 + rng.uniform(-0.3, 0.3, n)), low, high)
+
+    return {
+        'totalPoints': total_points,
+        'averagePoints': total_points / GAMES,
+        'consistency': 0.7 + rng.uniform(-0.2, 0.1, n)
+    }
+
+def injury_risk(positions, ages=None, games_missed=None, rng=None, noise=0.1):
+    """Injury risk for arrays of players
+
+    Position base risk plus the age adjustment (when `ages` is given). Players
+    with `games_missed` > 0 get the history-based risk used for known
+    injury-prone players; everyone else gets +/- `noise` random spread.
+    Returns a dict of arrays: riskScore, gamesInjured.
+    """
+    np = _require_numpy()
+    rng = rng if rng is not None else default_rng()
+    labels, codes = _encode(positions)
+    n = len(codes)
+
+    risk = _lookup(labels, codes, POSITION_RISK, DEFAULT_RISK)
+    if ages is not None:
+        ages = np.asarray(ages, dtype=float)
+        risk = risk + np.select([ages > 30, ages > 28, ages < 23], [0.1, 0.05, 0.05], 0.0)
+
+    risk_score = np.clip(risk + rng.uniform(-noise, noise, n), MIN_RISK, MAX_RISK)
+    games_injured = np.zeros(n, dtype=np.int64)
+
+    if games_missed is not None:
+        games_missed = np.asarray(games_missed, dtype=np.int64)
+        history = games_missed > 0
+        history_risk = np.minimum(MAX_RISK, risk + np.minimum(0.5, games_missed / GAMES))
+        risk_score = np.where(history, history_risk, risk_score)
+        games_injured = np.where(history, np.minimum(games_missed, 8), 0)
+
+    return {
+        'riskScore': risk_score,
+        'gamesInjured': games_injured
+    }
@@ -0,0 +1,275 @@
+import argparse
+import json
+import math
+import os
+
+# Python mirror of the draft board's ranking model in app.js
+# (calculateReplacementLevels, calculateAdvancedStats, calculateVORP,
+# calculatePositionalScarcity, calculatePlayerScore). It precomputes
+# replacement levels, VORP, scores and tiers for the common league grid into
+# data/rankings.json and is the reference the JS model is checked against.
+
+RANKINGS_PATH = 'data/rankings.json'
+
+LEAGUE_SIZES = [8, 10, 12, 14]
+SCORING_TYPES = ['standard', 'halfPPR', 'PPR']
+
+# Same defaults as leagueSettings / modelSettings in app.js
+DEFAULT_ROSTER = {
+    'QB': 1,
+    'RB': 2,
+    'WR': 2,
+    'TE': 1,
+    'FLEX': 1,
+    'K': 1,
+    'DEF': 1,
+    'BENCH': 6
+}
+
+DEFAULT_MODEL_SETTINGS = {
+    'riskTolerance': 0.5,
+    'positionPriority': 'balanced',
+    'vorpWeight': 0.7,
+    'consistencyWeight': 0.3,
+    'injuryWeight': 0.5,
+    'yearWeight': 0.6
+}
+
+# Projections are half-PPR. Standard and full PPR shift each position by about
+# half its share of points that come from receptions.
+SCORING_MULTIPLIERS = {
+    'standard': {'RB': 0.93, 'WR': 0.88, 'TE': 0.88},
+    'halfPPR': {},
+    'PPR': {'RB': 1.07, 'WR': 1.12, 'TE': 1.12}
+}
+
+SCARCITY_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+SCARCITY_DEPTH = 20  # top undrafted players used for the drop-off
+TIER_DEPTH = 60      # players per position split into tiers
+
+def scoring_multiplier(player, scoring_type='halfPPR'):
+    return SCORING_MULTIPLIERS[scoring_type].get(player['position'], 1.0)
+
+def replacement_ranks(size, roster=DEFAULT_ROSTER):
+    """Draft rank of the replacement-level player at each position"""
+    bench_depth = math.ceil(roster['BENCH'] / 5)  # Rough bench allocation
+    return {
+        'QB': size * (roster['QB'] + math.ceil(bench_depth * 0.5)),
+        'RB': size * (roster['RB'] + roster['FLEX'] * 0.4 + bench_depth * 1.5),
+        'WR': size * (roster['WR'] + roster['FLEX'] * 0.4 + bench_depth * 1.5),
+        'TE': size * (roster['TE'] + roster['FLEX'] * 0.2 + bench_depth * 0.5),
+        'K': size * roster['K'],
+        'DEF': size * roster['DEF']
+    }
+
+def by_position(players, points):
+    """{position: [player, ...]} sorted by points, highest first"""
+    positions = {}
+    for player in players:
+        positions.setdefault(player['position'], []).append(player)
+    for group in positions.values():
+        group.sort(key=lambda p: -points[p['id']])
+    return positions
+
+def replacement_levels(positions, points, size, roster=DEFAULT_ROSTER):
+    levels = {}
+    for position, rank in replacement_ranks(size, roster).items():
+        group = positions.get(position, [])
+        index = min(int(rank) - 1, len(group) - 1)
+        levels[position] = points[group[index]['id']] if index >= 0 else 0
+    return levels
+
+def positional_scarcity(positions, points):
+    scarcity = {}
+    for position in SCARCITY_POSITIONS:
+        group = positions.get(position, [])[:SCARCITY_DEPTH]
+        if len(group) >= 2:
+            # Average drop-off between consecutive players
+            dropoff = sum(points[a['id']] - points[b['id']] for a, b in zip(group, group[1:]))
+            scarcity[position] = dropoff / (len(group) - 1)
+        else:
+            scarcity[position] = 0
+
+    max_scarcity = max(scarcity.values())
+    for position in scarcity:
+        scarcity[position] = scarcity[position] / max_scarcity if max_scarcity else 0
+
+    scarcity['K'] = 0.1    # Kickers have low scarcity
+    scarcity['DEF'] = 0.2  # Defenses have low-medium scarcity
+    return scarcity
+
+def advanced_stats(player, multiplier=1.0, settings=DEFAULT_MODEL_SETTINGS):
+    """Year-weighted projection, floor/ceiling and injury adjustment"""
+    stats = player['stats']
+    current = dict(stats, totalPoints=stats['totalPoints'] * multiplier,
+                   averagePoints=stats['averagePoints'] * multiplier)
+    previous = player.get('previousYearStats')
+    if previous:
+        # Last season is half-PPR as well, so it gets the same scoring adjustment
+        previous = dict(previous, totalPoints=previous['totalPoints'] * multiplier,
+                        averagePoints=previous['averagePoints'] * multiplier)
+    else:
+        previous = current
+
+    weight = settings['yearWeight']
+    prev_weight = 1 - weight
+    total = current['totalPoints'] * weight + previous['totalPoints'] * prev_weight
+    average = current['averagePoints'] * weight + previous['averagePoints'] * prev_weight
+    consistency = current['consistency'] * weight + previous['consistency'] * prev_weight
+
+    volatility = 1 - consistency
+    std_dev = average * volatility * 0.5  # Approximation
+    floor = max(0, average - 1.5 * std_dev) * 17
+    ceiling = (average + 1.5 * std_dev) * 17
+
+    injury_adjustment = 1 - player['injury']['riskScore'] * settings['injuryWeight']
+    floor *= injury_adjustment
+    ceiling *= injury_adjustment
+
+    simulation = player.get('simulation')
+    if simulation and simulation.get('p50'):
+        # The simulation sets the spread (P10/P90 relative to its median); the
+        # year and injury weights set the center, as for the range above
+        expected = average * 17 * injury_adjustment
+        floor = simulation['p10'] / simulation['p50'] * expected
+        ceiling = simulation['p90'] / simulation['p50'] * expected
+
+    return {
+        'floor': floor,
+        'ceiling': ceiling,
+        'volatility': volatility,
+        'adjustedProjection': total * injury_adjustment,
+        'weightedConsistency': consistency
+    }
+
+def player_value(player, multiplier, levels, scarcity, settings=DEFAULT_MODEL_SETTINGS):
+    """VORP and final score for one player, as calculatePlayerScore does it"""
+    adv = advanced_stats(player, multiplier, settings)
+    replacement = levels.get(player['position'], 0)
+
+    raw_vorp = max(0, adv['adjustedProjection'] - replacement)
+    risk_adjusted = adv['floor'] + (adv['ceiling'] - adv['floor']) * settings['riskTolerance']
+    risk_adjusted_vorp = max(0, risk_adjusted - replacement)
+
+    score = risk_adjusted_vorp * settings['vorpWeight']
+    score += adv['adjustedProjection'] * adv['weightedConsistency'] * settings['consistencyWeight'] * 0.1
+    score *= 1 + scarcity.get(player['position'], 0) * 0.3
+
+    priority = settings['positionPriority']
+    if priority == 'RB-heavy' and player['position'] == 'RB':
+        score *= 1.15
+    elif priority == 'WR-heavy' and player['position'] == 'WR':
+        score *= 1.15
+    elif priority == 'elite-QB' and player['position'] == 'QB' and raw_vorp > 50:
+        score *= 1.2
+
+    return {
+        'vorp': raw_vorp,
+        'riskAdjustedVORP': risk_adjusted_vorp,
+        'floor': adv['floor'],
+        'ceiling': adv['ceiling'],
+        'score': score
+    }
+
+def tiers(group, values, depth=TIER_DEPTH):
+    """Split a sorted position group where the drop to the next player is unusually large
+
+    A new tier starts after any gap larger than the mean gap plus one standard
+    deviation among the top `depth` players. Returns the rank range and the
+    value range of each tier.
+    """
+    group = group[:depth]
+    if not group:
+        return []
+
+    breaks = []
+    gaps = [values[a['id']] - values[b['id']] for a, b in zip(group, group[1:])]
+    if gaps:
+        mean = sum(gaps) / len(gaps)
+        std = (sum((gap - mean) ** 2 for gap in gaps) / len(gaps)) ** 0.5
+        breaks = [i + 1 for i, gap in enumerate(gaps) if gap > mean + std]
+
+    result = []
+    start = 0
+    for end in breaks + [len(group)]:
+        result.append({
+            'tier': len(result) + 1,
+            'fromRank': start + 1,
+            'toRank': end,
+            'maxValue': round(values[group[start]['id']], 2),
+            'minValue': round(values[group[end - 1]['id']], 2)
+        })
+        start = end
+    return result
+
+def rank_configuration(players, size, scoring_type, settings=DEFAULT_MODEL_SETTINGS, roster=DEFAULT_ROSTER):
+    """Replacement levels, scarcity, per-player values and tiers for one league setup"""
+    multipliers = {player['id']: scoring_multiplier(player, scoring_type) for player in players}
+    points = {player['id']: player['stats']['totalPoints'] * multipliers[player['id']] for player in players}
+    positions = by_position(players, points)
+    levels = replacement_levels(positions, points, size, roster)
+    scarcity = positional_scarcity(positions, points)
+
+    values = {player['id']: player_value(player, multipliers[player['id']], levels, scarcity, settings)
+              for player in players}
+    ordered = sorted(players, key=lambda p: -values[p['id']]['score'])
+
+    position_tiers = {position: tiers(group, points) for position, group in positions.items()}
+
+    return {
+        'size': size,
+        'scoringType': scoring_type,
+        'replacementRanks': replacement_ranks(size, roster),
+        'replacementLevels': {pos: round(level, 2) for pos, level in levels.items()},
+        'scarcity': {pos: round(value, 4) for pos, value in scarcity.items()},
+        'tiers': position_tiers,
+        # Parallel arrays in overall rank order
+        'playerIds': [player['id'] for player in ordered],
+        'vorp': [round(values[p['id']]['vorp'], 2) for p in ordered],
+        'riskAdjustedVORP': [round(values[p['id']]['riskAdjustedVORP'], 2) for p in ordered],
+        'score': [round(values[p['id']]['score'], 2) for p in ordered]
+    }
+
+def build_rankings(players, sizes=LEAGUE_SIZES, scoring_types=SCORING_TYPES, settings=DEFAULT_MODEL_SETTINGS):
+    configurations = {}
+    for size in sizes:
+        for scoring_type in scoring_types:
+            configurations[f"{size}-{scoring_type}"] = rank_configuration(players, size, scoring_type, settings)
+
+    return {
+        'totalPlayers': len(players),
+        'roster': DEFAULT_ROSTER,
+        'modelSettings': settings,
+        'configurations': configurations
+    }
+
+def load_players(path='data/players.json'):
+    """Players from a JSON array or NDJSON build"""
+    with open(path) as f:
+        if path.endswith('.ndjson'):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+def write_rankings(players, path=RANKINGS_PATH):
+    rankings = build_rankings(players)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(rankings, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    print(f"Saved rankings for {len(rankings['configurations'])} league configurations to {path}")
+    return rankings
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--players', default='data/players.json',
+                        help="Player file to rank (JSON array or .ndjson)")
+    parser.add_argument('--output', default=RANKINGS_PATH,
+                        help=f"Where to write the ranking tables (default: {RANKINGS_PATH})")
+
+def run(args):
+    write_rankings(load_players(args.players), args.output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute draft rankings for common league configurations")
+    add_arguments(parser)
+    run(parser.parse_args())
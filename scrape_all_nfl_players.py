@@ -1,56 +1,32 @@
+import argparse
 import json
-import requests
-from bs4 import BeautifulSoup
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import re
 
-def fetch_all_nfl_teams():
-    """Fetch all NFL teams from ESPN API"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    teams = []
-    
-    try:
-        # ESPN teams endpoint
-        url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams"
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            for team in data.get('sports', [{}])[0].get('leagues', [{}])[0].get('teams', []):
-                team_info = team.get('team', {})
-                teams.append({
-                    'id': team_info.get('id'),
-                    'name': team_info.get('name'),
-                    'abbreviation': team_info.get('abbreviation'),
-                    'displayName': team_info.get('displayName'),
-                    'location': team_info.get('location')
-                })
-            
-            print(f"Found {len(teams)} NFL teams")
-            return teams
-    
-    except Exception as e:
-        print(f"Error fetching teams: {e}")
-    
-    return []
+import binary_table
+import build_state
+import columnar
+import game_logs
+import history
+import http_client
+import incremental
+import metrics
+import pipeline
+import player_ids
+import projection_engine
+import rankings
+import team_registry
 
-def fetch_team_roster(team_id, team_abbr):
+def fetch_team_roster(team_id, team_abbr, refresh=False):
     """Fetch roster for a specific team from ESPN"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     players = []
     
     try:
         # ESPN roster endpoint
         url = f"https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams/{team_id}/roster"
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, refresh=refresh)
         
         if response.status_code == 200:
             data = response.json()
@@ -87,9 +63,24 @@ def fetch_team_roster(team_id, team_abbr):
     
     return players
 
-def fetch_defense_units():
+def fetch_all_rosters(teams, max_workers=8, refresh=False):
+    """Fetch every team roster concurrently, yielded in the same order as `teams`"""
+    start = time.perf_counter()
+    
+    # Per-host pacing is handled by the shared client's token bucket
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        yield from executor.map(
+            lambda team: fetch_team_roster(team['id'], team['abbreviation'], refresh),
+            teams
+        )
+    
+    elapsed = time.perf_counter() - start
+    print(f"Fetched {len(teams)} rosters in {elapsed:.2f}s ({max_workers} workers)")
+
+def fetch_defense_units(teams=None):
     """Create defense/special teams units for each team"""
-    teams = fetch_all_nfl_teams()
+    if teams is None:
+        teams = team_registry.get_registry()
     defenses = []
     
     for i, team in enumerate(teams):
@@ -104,222 +95,308 @@ def fetch_defense_units():
     
     return defenses
 
-def calculate_fantasy_projections(player):
+def calculate_fantasy_projections(player, rng=random):
     """Calculate fantasy projections based on position and experience"""
     position = player.get('position', '')
     experience = player.get('experience', 0)
     
-    # Base projections by position (standard scoring)
-    base_projections = {
-        'QB': {'min': 150, 'max': 400, 'avg': 250},
-        'RB': {'min': 50, 'max': 300, 'avg': 150},
-        'WR': {'min': 50, 'max': 250, 'avg': 120},
-        'TE': {'min': 30, 'max': 200, 'avg': 80},
-        'K': {'min': 80, 'max': 150, 'avg': 110},
-        'PK': {'min': 80, 'max': 150, 'avg': 110},
-        'DEF': {'min': 60, 'max': 150, 'avg': 100}
-    }
-    
-    proj = base_projections.get(position, {'min': 0, 'max': 100, 'avg': 50})
+    proj = projection_engine.BASE_PROJECTIONS.get(position, projection_engine.DEFAULT_PROJECTION)
     
     # Adjust based on experience (rookies get lower projections)
     exp_multiplier = min(1.0, 0.7 + (experience * 0.1))
     
     # Calculate projected points
-    import random
     base_points = proj['avg'] * exp_multiplier
-    variance = random.uniform(-0.3, 0.3)
+    variance = rng.uniform(-0.3, 0.3)
     total_points = max(proj['min'], min(proj['max'], base_points * (1 + variance)))
     
     return {
         'gamesPlayed': 17,
         'totalPoints': total_points,
         'averagePoints': total_points / 17,
-        'consistency': 0.7 + random.uniform(-0.2, 0.1)
+        'consistency': 0.7 + rng.uniform(-0.2, 0.1)
     }
 
-def calculate_injury_risk(player):
+def calculate_injury_risk(player, rng=random):
     """Calculate injury risk based on position and age"""
     position = player.get('position', '')
     age = player.get('age', 25)
     
-    # Base injury risk by position
-    position_risk = {
-        'QB': 0.20,
-        'RB': 0.35,
-        'WR': 0.25,
-        'TE': 0.30,
-        'K': 0.05,
-        'PK': 0.05,
-        'DEF': 0.15
-    }
-    
-    base_risk = position_risk.get(position, 0.20)
+    base_risk = projection_engine.POSITION_RISK.get(position, projection_engine.DEFAULT_RISK)
+    base_risk += projection_engine.age_risk_adjustment(age)
     
-    # Adjust for age (older players have higher risk)
-    if age > 30:
-        base_risk += 0.1
-    elif age > 28:
-        base_risk += 0.05
-    elif age < 23:
-        base_risk += 0.05  # Rookies also have slightly higher risk
-    
-    import random
     return {
         'gamesInjured': 0,
         'injuryHistory': [],
-        'riskScore': min(0.9, max(0.05, base_risk + random.uniform(-0.1, 0.1)))
+        'riskScore': min(projection_engine.MAX_RISK,
+                         max(projection_engine.MIN_RISK, base_risk + rng.uniform(-0.1, 0.1)))
     }
 
-def main():
-    print("Starting comprehensive NFL player data collection...")
+def build_player(source_id, player_data, id_map, details, previous=None, seed=build_state.DEFAULT_SEED):
+    """Create a player record, reusing the previous projection if nothing about the player changed"""
+    player = {
+        'id': id_map.assign(source_id),
+        'sourceId': source_id,
+        'name': player_data['name'],
+        'position': player_data['position'],
+        'team': player_data['team'],
+        'stats': None,
+        'injury': None,
+        'details': details
+    }
     
-    all_players = []
-    player_id = 1
-    
-    # First, fetch all teams
-    teams = fetch_all_nfl_teams()
-    
-    if not teams:
-        print("Failed to fetch teams. Using fallback team list...")
-        # Fallback team list
-        teams = [
-            {'id': '1', 'abbreviation': 'ARI', 'name': 'Cardinals'},
-            {'id': '2', 'abbreviation': 'ATL', 'name': 'Falcons'},
-            {'id': '3', 'abbreviation': 'BAL', 'name': 'Ravens'},
-            {'id': '4', 'abbreviation': 'BUF', 'name': 'Bills'},
-            {'id': '5', 'abbreviation': 'CAR', 'name': 'Panthers'},
-            {'id': '6', 'abbreviation': 'CHI', 'name': 'Bears'},
-            {'id': '7', 'abbreviation': 'CIN', 'name': 'Bengals'},
-            {'id': '8', 'abbreviation': 'CLE', 'name': 'Browns'},
-            {'id': '9', 'abbreviation': 'DAL', 'name': 'Cowboys'},
-            {'id': '10', 'abbreviation': 'DEN', 'name': 'Broncos'},
-            {'id': '11', 'abbreviation': 'DET', 'name': 'Lions'},
-            {'id': '12', 'abbreviation': 'GB', 'name': 'Packers'},
-            {'id': '13', 'abbreviation': 'HOU', 'name': 'Texans'},
-            {'id': '14', 'abbreviation': 'IND', 'name': 'Colts'},
-            {'id': '15', 'abbreviation': 'JAX', 'name': 'Jaguars'},
-            {'id': '16', 'abbreviation': 'KC', 'name': 'Chiefs'},
-            {'id': '17', 'abbreviation': 'LAC', 'name': 'Chargers'},
-            {'id': '18', 'abbreviation': 'LAR', 'name': 'Rams'},
-            {'id': '19', 'abbreviation': 'LV', 'name': 'Raiders'},
-            {'id': '20', 'abbreviation': 'MIA', 'name': 'Dolphins'},
-            {'id': '21', 'abbreviation': 'MIN', 'name': 'Vikings'},
-            {'id': '22', 'abbreviation': 'NE', 'name': 'Patriots'},
-            {'id': '23', 'abbreviation': 'NO', 'name': 'Saints'},
-            {'id': '24', 'abbreviation': 'NYG', 'name': 'Giants'},
-            {'id': '25', 'abbreviation': 'NYJ', 'name': 'Jets'},
-            {'id': '26', 'abbreviation': 'PHI', 'name': 'Eagles'},
-            {'id': '27', 'abbreviation': 'PIT', 'name': 'Steelers'},
-            {'id': '28', 'abbreviation': 'SF', 'name': '49ers'},
-            {'id': '29', 'abbreviation': 'SEA', 'name': 'Seahawks'},
-            {'id': '30', 'abbreviation': 'TB', 'name': 'Buccaneers'},
-            {'id': '31', 'abbreviation': 'TEN', 'name': 'Titans'},
-            {'id': '32', 'abbreviation': 'WAS', 'name': 'Commanders'}
-        ]
-    
-    # Fetch roster for each team
-    for team in teams:
-        print(f"\nFetching roster for {team.get('name', team.get('abbreviation'))}...")
-        roster = fetch_team_roster(team['id'], team['abbreviation'])
+    old = previous.get(source_id) if previous else None
+    if old and all(old.get(field) == player[field] for field in incremental.TRACKED_FIELDS):
+        player['stats'] = old['stats']
+        player['injury'] = old['injury']
+    else:
+        rng = build_state.player_rng(seed, source_id)
+        player['stats'] = calculate_fantasy_projections(player_data, rng)
+        player['injury'] = calculate_injury_risk(player_data, rng)
+    
+    return player
+
+def roster_details(player_data):
+    return {
+        'age': player_data.get('age', 0),
+        'experience': player_data.get('experience', 0),
+        'college': player_data.get('college', ''),
+        'height': player_data.get('height', ''),
+        'weight': player_data.get('weight', ''),
+        'jersey': player_data.get('jersey', '')
+    }
+
+FREE_AGENTS = [
+    {'name': 'Calvin Ridley', 'position': 'WR', 'team': 'FA'},
+    {'name': 'Michael Thomas', 'position': 'WR', 'team': 'FA'},
+    {'name': 'Dalvin Cook', 'position': 'RB', 'team': 'FA'},
+    {'name': 'Ezekiel Elliott', 'position': 'RB', 'team': 'FA'},
+    {'name': 'Leonard Fournette', 'position': 'RB', 'team': 'FA'},
+    {'name': 'JuJu Smith-Schuster', 'position': 'WR', 'team': 'FA'},
+    {'name': 'Hunter Henry', 'position': 'TE', 'team': 'FA'},
+    {'name': 'Marvin Jones Jr.', 'position': 'WR', 'team': 'FA'},
+    {'name': 'Randall Cobb', 'position': 'WR', 'team': 'FA'},
+    {'name': 'Zach Ertz', 'position': 'TE', 'team': 'FA'}
+]
+
+def iter_all_players(teams, stale_teams, rosters, id_map, roster_state, reusable, seed=build_state.DEFAULT_SEED):
+    """Yield rostered players, kept players, D/ST units and (if short) free agents"""
+    count = 0
+    fetched_ids = set()
+    refreshed_teams = set()
+    for team, roster in zip(stale_teams, rosters):
+        # An empty roster means the fetch failed; keep that team's previous players
+        if not roster:
+            continue
+        refreshed_teams.add(team['abbreviation'])
+        roster_state.mark_fetched(team['id'], team['abbreviation'], len(roster))
         
         # Process each player
         for player_data in roster:
-            player = {
-                'id': player_id,
-                'name': player_data['name'],
-                'position': player_data['position'],
-                'team': player_data['team'],
-                'stats': calculate_fantasy_projections(player_data),
-                'injury': calculate_injury_risk(player_data),
-                'details': {
-                    'age': player_data.get('age', 0),
-                    'experience': player_data.get('experience', 0),
-                    'college': player_data.get('college', ''),
-                    'height': player_data.get('height', ''),
-                    'weight': player_data.get('weight', ''),
-                    'jersey': player_data.get('jersey', '')
-                }
-            }
-            
-            all_players.append(player)
-            player_id += 1
-        
-        time.sleep(0.5)  # Be respectful with API calls
+            source_id = player_ids.espn_key(player_data['id'])
+            if source_id in fetched_ids:
+                continue
+            fetched_ids.add(source_id)
+            count += 1
+            yield build_player(source_id, player_data, id_map, roster_details(player_data), reusable, seed)
+    
+    # Carry over rostered players from teams that were not refetched
+    if reusable:
+        kept = 0
+        for source_id, player in reusable.items():
+            if (source_id.startswith('espn:') and source_id not in fetched_ids
+                    and player['team'] not in refreshed_teams):
+                id_map.assign(source_id)
+                kept += 1
+                yield player
+        count += kept
+        print(f"Kept {kept} players from {len(teams) - len(refreshed_teams)} unchanged teams")
     
     # Add defense/special teams units
     print("\nAdding defense/special teams units...")
-    defenses = fetch_defense_units()
-    for defense in defenses:
-        player = {
-            'id': player_id,
-            'name': defense['name'],
-            'position': 'DEF',
-            'team': defense['team'],
-            'stats': calculate_fantasy_projections(defense),
-            'injury': calculate_injury_risk(defense),
-            'details': {}
-        }
-        all_players.append(player)
-        player_id += 1
+    for defense in fetch_defense_units(teams):
+        count += 1
+        yield build_player(player_ids.defense_key(defense['team']), defense, id_map, {}, reusable, seed)
     
     # If we didn't get enough players, add top free agents
-    if len(all_players) < 500:
+    if count < 500:
         print("\nAdding notable free agents and rookies...")
-        free_agents = [
-            {'name': 'Calvin Ridley', 'position': 'WR', 'team': 'FA'},
-            {'name': 'Michael Thomas', 'position': 'WR', 'team': 'FA'},
-            {'name': 'Dalvin Cook', 'position': 'RB', 'team': 'FA'},
-            {'name': 'Ezekiel Elliott', 'position': 'RB', 'team': 'FA'},
-            {'name': 'Leonard Fournette', 'position': 'RB', 'team': 'FA'},
-            {'name': 'JuJu Smith-Schuster', 'position': 'WR', 'team': 'FA'},
-            {'name': 'Hunter Henry', 'position': 'TE', 'team': 'FA'},
-            {'name': 'Marvin Jones Jr.', 'position': 'WR', 'team': 'FA'},
-            {'name': 'Randall Cobb', 'position': 'WR', 'team': 'FA'},
-            {'name': 'Zach Ertz', 'position': 'TE', 'team': 'FA'}
-        ]
-        
-        for fa in free_agents:
-            player = {
-                'id': player_id,
-                'name': fa['name'],
-                'position': fa['position'],
-                'team': fa['team'],
-                'stats': calculate_fantasy_projections(fa),
-                'injury': calculate_injury_risk(fa),
-                'details': {}
-            }
-            all_players.append(player)
-            player_id += 1
-    
-    # Sort players by projected points within each position
-    all_players.sort(key=lambda x: (x['position'], -x['stats']['totalPoints']))
-    
-    # Save to JSON
-    print(f"\nSaving {len(all_players)} players to data/players.json...")
-    with open('data/players.json', 'w') as f:
-        json.dump(all_players, f, indent=2)
-    
-    # Create summary
-    position_counts = {}
-    for player in all_players:
-        pos = player['position']
-        position_counts[pos] = position_counts.get(pos, 0) + 1
+        for fa in FREE_AGENTS:
+            source_id = player_ids.name_key('fa', fa['position'], fa['name'])
+            yield build_player(source_id, fa, id_map, {}, reusable, seed)
+
+def track_changes(players, current):
+    """Pass players through, remembering the fields the change report compares"""
+    for player in players:
+        tracked = {field: player.get(field) for field in incremental.TRACKED_FIELDS}
+        tracked['id'] = player['id']
+        current[player['sourceId']] = tracked
+        yield player
+
+def main(max_workers=8, requests_per_second=4.0, offline=False, refresh_teams=False,
+         incremental_refresh=False, max_age=incremental.DEFAULT_MAX_AGE, force_teams=None,
+         output_format='json', sort=True, memory_budget=pipeline.DEFAULT_MEMORY_BUDGET,
+         columnar_export=False, seed=build_state.DEFAULT_SEED, force=False, base_url=None,
+         prometheus_path=None, season=history.CURRENT_SEASON, binary_export=False, search_export=False,
+         simulate_seasons=0):
+    print("Starting comprehensive NFL player data collection...")
+    build_metrics = metrics.BuildMetrics('all_players')
+    http_client.use_mock_root(base_url)
+    http_client.configure(requests_per_second=requests_per_second, offline=offline, base_url=base_url)
+    
+    id_map = player_ids.PlayerIdMap()
+    roster_state = incremental.RosterState()
+    previous_players = incremental.load_previous_players()
+    
+    # Only an incremental run reuses previous projections, and only from a
+    # roster build: a static or ESPN rankings build has no roster records to keep
+    reusable = previous_players if incremental_refresh else None
+    kept_per_team = {}
+    for source_id, player in (reusable or {}).items():
+        if source_id.startswith('espn:'):
+            kept_per_team[player['team']] = kept_per_team.get(player['team'], 0) + 1
+    if incremental_refresh and not kept_per_team:
+        print("No previous roster build with stable IDs found, doing a full refresh...")
+        reusable = None
+    
+    # First, load the team registry (saved file, ESPN, or the built-in list)
+    with build_metrics.stage('teams'):
+        teams = team_registry.get_registry(refresh=refresh_teams).teams
+    
+    # Decide which rosters need fetching
+    force_teams = set(force_teams or [])
+    if reusable:
+        # A team with no kept players is refetched however recent roster_state says it is
+        stale_teams = [team for team in teams
+                       if team['abbreviation'] in force_teams or not kept_per_team.get(team['abbreviation'])
+                       or roster_state.is_stale(team['id'], max_age)]
+    else:
+        stale_teams = teams
+    
+    # Skip the rest when the fetched data, options and code match the last
+    # build; rosters are hashed as they arrive and spooled to disk
+    inputs = build_state.InputHash('all_players')
+    inputs.update('params', [output_format, sort, columnar_export, binary_export, search_export, simulate_seasons,
+                             seed, bool(reusable), season])
+    inputs.update('teams', teams)
+    print(f"\nFetching rosters for {len(stale_teams)} of {len(teams)} teams...")
+    with build_metrics.stage('fetch'):
+        rosters = inputs.spool('rosters', fetch_all_rosters(stale_teams, max_workers, refresh=incremental_refresh))
+    
+    previous = history.load_season(season - 1, 'rosters')
+    weekly = game_logs.load_consistency(season)
+    if reusable:
+        inputs.update('previous', reusable)
+    inputs.update('freeAgents', FREE_AGENTS)
+    inputs.update('previousSeason', previous.rows)
+    inputs.update('gameLogs', weekly.by_source)
+    inputs.update_code(__file__, binary_table, build_state, columnar, game_logs, history, incremental, pipeline,
+                       player_ids, projection_engine, rankings)
+    if simulate_seasons:
+        import simulation
+        inputs.update_code(simulation)
+    if build_state.skip_if_current(inputs, force):
+        return
+    
+    current = {}
+    players = iter_all_players(teams, stale_teams, rosters, id_map, roster_state, reusable, seed)
+    players = build_metrics.track('projections', track_changes(players, current))
+    players = build_metrics.track('game_logs', weekly.attach(players))
+    players = build_metrics.track('previous_season', previous.attach(players))
+    if sort:
+        # Sort players by projected points within each position
+        players = build_metrics.track('sort', pipeline.sort_stream(
+            players, key=lambda x: (x['position'], -x['stats']['totalPoints']), memory_budget=memory_budget))
+    
+    with build_metrics.stage('write'):
+        written = pipeline.write_players(players, output_format,
+                                         columnar_path=columnar.COLUMNAR_PATH if columnar_export else None,
+                                         binary_path=binary_table.BINARY_PATH if binary_export else None,
+                                         search=search_export)
+    
+    # Season percentiles for the floors and ceilings, before rankings read them
+    if simulate_seasons:
+        with build_metrics.stage('simulation'):
+            written = simulation.simulate_file(written['path'], simulate_seasons, seed=seed,
+                                               columnar_path=written.get('columnarPath'),
+                                               binary_path=written.get('binaryPath'),
+                                               search=bool(written.get('searchPath')))
+    print(f"\nSaved {written['totalPlayers']} players to {written['path']}")
+    position_counts = written['positions']
+    
+    # Precompute rankings for the common league configurations
+    with build_metrics.stage('rankings'):
+        saved = rankings.load_players(written['path'])
+        rankings.write_rankings(saved)
+    
+    # Append this season to the history store for next season's build
+    with build_metrics.stage('history'):
+        history.record_season(saved, season, 'rosters')
     
     summary = {
         'lastUpdated': datetime.now().isoformat(),
-        'totalPlayers': len(all_players),
+        'totalPlayers': written['totalPlayers'],
         'positions': position_counts,
-        'dataSource': 'ESPN API - Complete NFL Rosters with Fantasy Projections'
+        'dataSource': 'ESPN API - Complete NFL Rosters with Fantasy Projections',
+        **pipeline.summary_fields(written),
+        'metrics': build_metrics.to_dict(http_client.get_client())
     }
     
     with open('data/summary.json', 'w') as f:
         json.dump(summary, f, indent=2)
+    pipeline.print_file_sizes(written)
+    if prometheus_path:
+        metrics.write_prometheus(summary['metrics'], prometheus_path)
+    
+    id_map.save()
+    roster_state.save()
+    incremental.write_change_report(incremental.diff_players(previous_players, current))
+    build_state.record(inputs, list(written['files']) + ['data/summary.json', rankings.RANKINGS_PATH])
     
-    print(f"\nSuccessfully collected data for {len(all_players)} NFL players!")
+    print(f"\nSuccessfully collected data for {written['totalPlayers']} NFL players!")
     print("Position breakdown:")
     for pos, count in sorted(position_counts.items()):
         print(f"  {pos}: {count} players")
+    
+    build_metrics.print_stages()
+    print("\nRequest latency:")
+    http_client.get_client().print_latency_stats()
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--workers', type=int, default=8,
+                        help="Number of rosters fetched concurrently (default: 8)")
+    parser.add_argument('--rate', type=float, default=4.0,
+                        help="Maximum requests per second to each host (default: 4)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Serve every request from the response cache, never the network")
+    parser.add_argument('--base-url', default=None,
+                        help="Send every request to this server instead, e.g. http://127.0.0.1:8765 for mock_server.py")
+    parser.add_argument('--refresh-teams', action='store_true',
+                        help="Re-fetch the team list instead of using data/teams.json")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only refetch stale rosters and keep everything else from data/players.json")
+    parser.add_argument('--max-age', type=float, default=incremental.DEFAULT_MAX_AGE / 3600,
+                        help="Hours before a team's roster counts as stale (default: 12)")
+    parser.add_argument('--teams', default='',
+                        help="Comma-separated team abbreviations to refetch regardless of age, e.g. KC,BUF")
+    pipeline.add_output_arguments(parser)
+    build_state.add_build_arguments(parser)
+    metrics.add_metrics_arguments(parser)
+    history.add_history_arguments(parser)
+
+def run(args):
+    main(max_workers=args.workers, requests_per_second=args.rate, offline=args.offline,
+         refresh_teams=args.refresh_teams, incremental_refresh=args.incremental,
+         max_age=args.max_age * 3600,
+         force_teams=[abbr.strip().upper() for abbr in args.teams.split(',') if abbr.strip()],
+         output_format=args.format, sort=not args.no_sort, memory_budget=args.memory_budget,
+         columnar_export=args.columnar, seed=args.seed, force=args.force,
+         base_url=args.base_url, prometheus_path=args.prometheus, season=args.season,
+         binary_export=args.binary, search_export=args.search_index,
+         simulate_seasons=args.simulate)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Collect fantasy data for every NFL roster")
+    add_arguments(parser)
+    run(parser.parse_args())
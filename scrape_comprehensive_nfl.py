@@ -1,9 +1,17 @@
+import argparse
 import json
-import requests
-from bs4 import BeautifulSoup
-import time
+import random
 from datetime import datetime
-import re
+
+import build_state
+import columnar
+import history
+import metrics
+import pipeline
+import player_ids
+import player_names
+import projection_engine
+import rankings
 
 # Comprehensive list of NFL players by position for 2024 season
 NFL_PLAYERS_2024 = {
@@ -321,89 +329,42 @@ NFL_PLAYERS_2024 = {
 
 # Known injury history for 2023-2024
 INJURY_HISTORY = {
-    'Nick Chubb': {'injuries': ['knee'], 'games_missed': 15},
-    'J.K. Dobbins': {'injuries': ['achilles'], 'games_missed': 17},
-    'Cooper Kupp': {'injuries': ['hamstring'], 'games_missed': 4},
-    'Keenan Allen': {'injuries': ['heel'], 'games_missed': 4},
-    'Justin Herbert': {'injuries': ['finger'], 'games_missed': 2},
-    'Kyler Murray': {'injuries': ['knee'], 'games_missed': 8},
-    'Daniel Jones': {'injuries': ['neck', 'knee'], 'games_missed': 6},
-    'Michael Thomas': {'injuries': ['foot'], 'games_missed': 6},
-    'Darren Waller': {'injuries': ['hamstring'], 'games_missed': 9},
-    'Kyle Pitts': {'injuries': ['knee'], 'games_missed': 6},
-    'Dallas Goedert': {'injuries': ['forearm'], 'games_missed': 2},
-    'Mike Evans': {'injuries': ['hamstring'], 'games_missed': 1},
-    'Russell Wilson': {'injuries': ['calf'], 'games_missed': 1},
-    'Cam Akers': {'injuries': ['achilles'], 'games_missed': 10},
-    'Javonte Williams': {'injuries': ['knee'], 'games_missed': 4},
+    'Nick Chubb': {'position': 'RB', 'team': 'CLE', 'injuries': ['knee'], 'games_missed': 15},
+    'J.K. Dobbins': {'position': 'RB', 'team': 'LAC', 'injuries': ['achilles'], 'games_missed': 17},
+    'Cooper Kupp': {'position': 'WR', 'team': 'LAR', 'injuries': ['hamstring'], 'games_missed': 4},
+    'Keenan Allen': {'position': 'WR', 'team': 'CHI', 'injuries': ['heel'], 'games_missed': 4},
+    'Justin Herbert': {'position': 'QB', 'team': 'LAC', 'injuries': ['finger'], 'games_missed': 2},
+    'Kyler Murray': {'position': 'QB', 'team': 'ARI', 'injuries': ['knee'], 'games_missed': 8},
+    'Daniel Jones': {'position': 'QB', 'team': 'NYG', 'injuries': ['neck', 'knee'], 'games_missed': 6},
+    'Michael Thomas': {'position': 'WR', 'team': 'NO', 'injuries': ['foot'], 'games_missed': 6},
+    'Darren Waller': {'position': 'TE', 'team': 'NYG', 'injuries': ['hamstring'], 'games_missed': 9},
+    'Kyle Pitts': {'position': 'TE', 'team': 'ATL', 'injuries': ['knee'], 'games_missed': 6},
+    'Dallas Goedert': {'position': 'TE', 'team': 'PHI', 'injuries': ['forearm'], 'games_missed': 2},
+    'Mike Evans': {'position': 'WR', 'team': 'TB', 'injuries': ['hamstring'], 'games_missed': 1},
+    'Russell Wilson': {'position': 'QB', 'team': 'PIT', 'injuries': ['calf'], 'games_missed': 1},
+    'Cam Akers': {'position': 'RB', 'team': 'HOU', 'injuries': ['achilles'], 'games_missed': 10},
+    'Javonte Williams': {'position': 'RB', 'team': 'DEN', 'injuries': ['knee'], 'games_missed': 4},
 }
 
-def calculate_fantasy_projections(player, rank_in_position):
+INJURY_INDEX = player_names.NameIndex(INJURY_HISTORY)
+
+def calculate_fantasy_projections(player, rank_in_position, rng=random):
     """Calculate realistic fantasy projections based on position and rank"""
-    position = player['position']
-    
-    # Projection tiers by position
-    projection_tiers = {
-        'QB': [
-            (1, 5, (350, 450)),    # Elite
-            (6, 12, (280, 350)),   # QB1
-            (13, 24, (220, 280)),  # QB2
-            (25, 40, (150, 220)),  # Backup
-        ],
-        'RB': [
-            (1, 5, (280, 350)),    # Elite
-            (6, 12, (220, 280)),   # RB1
-            (13, 24, (160, 220)),  # RB2
-            (25, 36, (100, 160)),  # RB3
-            (37, 50, (60, 100)),   # Backup
-        ],
-        'WR': [
-            (1, 5, (250, 320)),    # Elite
-            (6, 12, (200, 250)),   # WR1
-            (13, 24, (150, 200)),  # WR2
-            (25, 36, (100, 150)),  # WR3
-            (37, 60, (50, 100)),   # WR4/5
-        ],
-        'TE': [
-            (1, 3, (180, 250)),    # Elite
-            (4, 8, (120, 180)),    # TE1
-            (9, 16, (80, 120)),    # TE2
-            (17, 30, (40, 80)),    # Backup
-        ],
-        'K': [
-            (1, 10, (130, 160)),   # K1
-            (11, 20, (110, 130)),  # K2
-            (21, 32, (90, 110)),   # K3
-        ],
-        'DEF': [
-            (1, 10, (120, 160)),   # DEF1
-            (11, 20, (90, 120)),   # DEF2
-            (21, 32, (60, 90)),    # DEF3
-        ]
-    }
-    
     # Find appropriate tier
-    tiers = projection_tiers.get(position, [(1, 100, (50, 150))])
-    min_points, max_points = 50, 150  # Default
-    
-    for start, end, (tier_min, tier_max) in tiers:
-        if start <= rank_in_position <= end:
-            min_points, max_points = tier_min, tier_max
-            break
+    min_points, max_points = projection_engine.tier_range(player['position'], rank_in_position)
     
     # Calculate points with some variance
-    import random
     base_points = min_points + (max_points - min_points) * (1 - (rank_in_position - 1) / 50)
-    variance = random.uniform(-0.1, 0.1)
+    variance = rng.uniform(-0.1, 0.1)
     total_points = base_points * (1 + variance)
     
     # Consistency based on tier
     if rank_in_position <= 5:
-        consistency = 0.75 + random.uniform(0, 0.15)
+        consistency = 0.75 + rng.uniform(0, 0.15)
     elif rank_in_position <= 20:
-        consistency = 0.65 + random.uniform(0, 0.15)
+        consistency = 0.65 + rng.uniform(0, 0.15)
     else:
-        consistency = 0.55 + random.uniform(0, 0.15)
+        consistency = 0.55 + rng.uniform(0, 0.15)
     
     return {
         'gamesPlayed': 17,
@@ -412,32 +373,22 @@ def calculate_fantasy_projections(player, rank_in_position):
         'consistency': min(0.95, consistency)
     }
 
-def calculate_injury_risk(player):
+def calculate_injury_risk(player, rng=random):
     """Calculate injury risk based on position and history"""
     position = player['position']
     name = player['name']
     
-    # Base injury risk by position
-    position_risk = {
-        'QB': 0.20,
-        'RB': 0.35,
-        'WR': 0.25,
-        'TE': 0.30,
-        'K': 0.05,
-        'DEF': 0.15
-    }
-    
-    base_risk = position_risk.get(position, 0.20)
+    base_risk = projection_engine.POSITION_RISK.get(position, projection_engine.DEFAULT_RISK)
     
     # Check for injury history
-    if name in INJURY_HISTORY:
-        injury_data = INJURY_HISTORY[name]
+    injury_data = INJURY_INDEX.get(name, where={'position': position, 'team': player.get('team')})
+    if injury_data is not None:
         games_missed = injury_data['games_missed']
         injuries = injury_data['injuries']
         
         # Increase risk based on games missed
         risk_modifier = min(0.5, games_missed / 17.0)
-        final_risk = min(0.9, base_risk + risk_modifier)
+        final_risk = min(projection_engine.MAX_RISK, base_risk + risk_modifier)
         
         return {
             'gamesInjured': min(games_missed, 8),
@@ -446,64 +397,139 @@ def calculate_injury_risk(player):
         }
     
     # No injury history
-    import random
     return {
         'gamesInjured': 0,
         'injuryHistory': [],
-        'riskScore': base_risk + random.uniform(-0.05, 0.05)
+        'riskScore': min(projection_engine.MAX_RISK,
+                         max(projection_engine.MIN_RISK, base_risk + rng.uniform(-0.05, 0.05)))
     }
 
-def main():
-    print("Creating comprehensive NFL player database...")
-    
-    all_players = []
-    player_id = 1
-    
-    # Process each position
+def iter_static_players(id_map):
+    """Source stage: one base record per NFL_PLAYERS_2024 entry, with its rank in the position"""
     for position, players in NFL_PLAYERS_2024.items():
         print(f"\nProcessing {position} position ({len(players)} players)...")
         
         for rank, player_data in enumerate(players, 1):
-            player = {
-                'id': player_id,
+            source_id = player_ids.name_key('static', position, player_data['name'])
+            yield rank, {
+                'id': id_map.assign(source_id),
+                'sourceId': source_id,
                 'name': player_data['name'],
                 'position': position,
-                'team': player_data['team'],
-                'stats': calculate_fantasy_projections({'position': position}, rank),
-                'injury': calculate_injury_risk({'position': position, 'name': player_data['name']})
+                'team': player_data['team']
             }
-            
-            all_players.append(player)
-            player_id += 1
+
+def project_players(ranked_players, seed=build_state.DEFAULT_SEED):
+    """Projection and injury stage, with each player's draws seeded by the build seed and player key"""
+    for rank, player in ranked_players:
+        rng = build_state.player_rng(seed, player['sourceId'])
+        player['stats'] = calculate_fantasy_projections({'position': player['position']}, rank, rng)
+        player['injury'] = calculate_injury_risk({'position': player['position'], 'name': player['name'],
+                                                 'team': player['team']}, rng)
+        yield player
+
+def main(output_format='json', sort=True, memory_budget=pipeline.DEFAULT_MEMORY_BUDGET,
+         columnar_export=False, seed=build_state.DEFAULT_SEED, force=False, prometheus_path=None,
+         season=history.CURRENT_SEASON, binary_export=False, search_export=False,
+         simulate_seasons=0):
+    # Imported here so `draft.py static --help` doesn't load them
+    import binary_table
+    import game_logs
+
+    print("Creating comprehensive NFL player database...")
+    build_metrics = metrics.BuildMetrics('comprehensive')
+    previous = history.load_season(season - 1, 'static')
+    weekly = game_logs.load_consistency(season)
+    
+    # Everything the output depends on: options, the static tables and the code
+    inputs = build_state.InputHash('comprehensive')
+    inputs.update('params', [output_format, sort, columnar_export, binary_export, search_export, simulate_seasons,
+                             seed, season])
+    inputs.update('players', NFL_PLAYERS_2024)
+    inputs.update('injuries', INJURY_HISTORY)
+    inputs.update('previousSeason', previous.rows)
+    inputs.update('gameLogs', weekly.by_source)
+    inputs.update_code(__file__, binary_table, build_state, columnar, game_logs, history, pipeline, player_ids,
+                       player_names, projection_engine, rankings)
+    if simulate_seasons:
+        import simulation
+        inputs.update_code(simulation)
+    if build_state.skip_if_current(inputs, force):
+        return
+    
+    id_map = player_ids.PlayerIdMap()
+    players = build_metrics.track('projections', project_players(iter_static_players(id_map), seed))
+    players = build_metrics.track('game_logs', weekly.attach(players))
+    players = build_metrics.track('previous_season', previous.attach(players))
     
     # Sort by position and projected points
-    all_players.sort(key=lambda x: (x['position'], -x['stats']['totalPoints']))
+    if sort:
+        players = build_metrics.track('sort', pipeline.sort_stream(
+            players, key=lambda x: (x['position'], -x['stats']['totalPoints']), memory_budget=memory_budget))
     
     # Save to JSON
-    print(f"\nSaving {len(all_players)} players to data/players.json...")
-    with open('data/players.json', 'w') as f:
-        json.dump(all_players, f, indent=2)
+    with build_metrics.stage('write'):
+        written = pipeline.write_players(players, output_format,
+                                         columnar_path=columnar.COLUMNAR_PATH if columnar_export else None,
+                                         binary_path=binary_table.BINARY_PATH if binary_export else None,
+                                         search=search_export)
+    
+    # Season percentiles for the floors and ceilings, before rankings read them
+    if simulate_seasons:
+        with build_metrics.stage('simulation'):
+            written = simulation.simulate_file(written['path'], simulate_seasons, seed=seed,
+                                               columnar_path=written.get('columnarPath'),
+                                               binary_path=written.get('binaryPath'),
+                                               search=bool(written.get('searchPath')))
+    print(f"\nSaved {written['totalPlayers']} players to {written['path']}")
+    id_map.save()
+    
+    # Precompute rankings for the common league configurations
+    with build_metrics.stage('rankings'):
+        saved = rankings.load_players(written['path'])
+        rankings.write_rankings(saved)
     
-    # Create summary
-    position_counts = {}
-    for player in all_players:
-        pos = player['position']
-        position_counts[pos] = position_counts.get(pos, 0) + 1
+    # Append this season to the history store for next season's build
+    with build_metrics.stage('history'):
+        history.record_season(saved, season, 'static')
     
+    position_counts = written['positions']
     summary = {
         'lastUpdated': datetime.now().isoformat(),
-        'totalPlayers': len(all_players),
+        'totalPlayers': written['totalPlayers'],
         'positions': position_counts,
-        'dataSource': 'Comprehensive NFL Player Database - 2024 Season'
+        'dataSource': 'Comprehensive NFL Player Database - 2024 Season',
+        **pipeline.summary_fields(written),
+        'metrics': build_metrics.to_dict()
     }
     
     with open('data/summary.json', 'w') as f:
         json.dump(summary, f, indent=2)
+    pipeline.print_file_sizes(written)
+    if prometheus_path:
+        metrics.write_prometheus(summary['metrics'], prometheus_path)
+    build_state.record(inputs, list(written['files']) + ['data/summary.json', rankings.RANKINGS_PATH])
     
-    print(f"\nSuccessfully created database with {len(all_players)} NFL players!")
+    print(f"\nSuccessfully created database with {written['totalPlayers']} NFL players!")
     print("\nPosition breakdown:")
     for pos, count in sorted(position_counts.items()):
         print(f"  {pos}: {count} players")
+    build_metrics.print_stages()
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    pipeline.add_output_arguments(parser)
+    build_state.add_build_arguments(parser)
+    metrics.add_metrics_arguments(parser)
+    history.add_history_arguments(parser)
+
+def run(args):
+    main(output_format=args.format, sort=not args.no_sort, memory_budget=args.memory_budget,
+         columnar_export=args.columnar, seed=args.seed, force=args.force,
+         prometheus_path=args.prometheus, season=args.season, binary_export=args.binary,
+         search_export=args.search_index, simulate_seasons=args.simulate)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build players.json from the built-in 2024 player lists")
+    add_arguments(parser)
+    run(parser.parse_args())
@@ -1,181 +1,181 @@
+import argparse
 import json
-import requests
-from bs4 import BeautifulSoup
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import re
-import random
 
-def fetch_espn_fantasy_players():
-    """Fetch player data from ESPN's API"""
-    players = []
-    player_id = 1
-    
+import binary_table
+import build_state
+import columnar
+import fantasypros
+import game_logs
+import history
+import http_client
+import metrics
+import pipeline
+import player_ids
+import player_names
+import projection_engine
+import rankings
+import team_registry
+
+# ESPN fantasy API endpoint for player rankings
+ESPN_PLAYERS_URL = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2024/players?scoringPeriodId=0&view=kona_player_info"
+
+# ESPN's fantasy football uses specific filters for positions
+ESPN_POSITION_IDS = {
+    'QB': 1,
+    'RB': 2,
+    'WR': 3,
+    'TE': 4,
+    'K': 5,
+    'D/ST': 16
+}
+
+# How many players to pull per position; deep enough for 14-team leagues with full benches
+DEFAULT_DEPTH = {
+    'QB': 64,
+    'RB': 160,
+    'WR': 192,
+    'TE': 64,
+    'K': 40,
+    'D/ST': 32
+}
+
+ESPN_PAGE_SIZE = 50
+
+def fetch_kona_page(pos_id, offset, limit):
+    """Fetch one page of kona_player_info for a position, ordered by ownership"""
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        'x-fantasy-filter': json.dumps({
+            "filterSlotIds": {"value": [pos_id]},
+            "limit": limit,
+            "offset": offset,
+            "sortPercOwned": {"sortPriority": 1, "sortAsc": False}
+        })
     }
     
-    # ESPN API endpoints for fantasy relevant players
-    # Using the scoreboard endpoint to get current season data
-    base_url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+    response = http_client.get(ESPN_PLAYERS_URL, headers=headers)
+    if response.status_code != 200:
+        # A missing page would silently drop players; fail the source instead
+        raise RuntimeError(f"Page at offset {offset} for slot {pos_id} returned {response.status_code}")
+    return response.json().get('players', [])
+
+def iter_kona_pages(depth=None, page_size=ESPN_PAGE_SIZE, max_workers=8):
+    """Fetch every (position, offset) page concurrently, yielding each page in rank order once it lands"""
+    depth = dict(DEFAULT_DEPTH, **(depth or {}))
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for position, pos_id in ESPN_POSITION_IDS.items():
+            for offset in range(0, depth.get(position, 0), page_size):
+                limit = min(page_size, depth[position] - offset)
+                futures[executor.submit(fetch_kona_page, pos_id, offset, limit)] = (position, offset)
+        
+        # Later pages keep downloading while earlier ones are being normalized
+        for future, (position, offset) in futures.items():
+            yield position, offset, future.result()
+
+def normalize_espn_player(player_data, position, teams, id_map):
+    """Turn one kona_player_info entry into our player record"""
+    player_info = player_data.get('player', {})
+    
+    # Extract player details
+    player_name = player_info.get('fullName', 'Unknown')
+    team_id = player_info.get('proTeamId', 0)
+    
+    team = teams.abbreviation(team_id)
+    
+    # Get stats from ownership data
+    ownership = player_info.get('ownership', {})
+    percent_owned = ownership.get('percentOwned', 0)
     
-    # Also fetch player rankings from ESPN's fantasy API
-    fantasy_url = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2024"
+    # Get projected stats
+    stats = player_info.get('stats', [])
+    total_points = 0
+    games_played = 16
     
+    for stat in stats:
+        if stat.get('scoringPeriodId') == 0 and stat.get('statSourceId') == 1:
+            total_points = stat.get('appliedTotal', 0)
+            break
+    
+    source_id = player_ids.espn_key(player_info.get('id'))
+    
+    return {
+        'id': id_map.assign(source_id),
+        'sourceId': source_id,
+        'name': player_name,
+        'position': position if position != 'D/ST' else 'DEF',
+        'team': team,
+        'stats': {
+            'gamesPlayed': games_played,
+            'totalPoints': total_points,
+            'averagePoints': total_points / games_played if games_played > 0 else 0,
+            'consistency': 0.7 + (percent_owned / 1000)  # Higher owned players tend to be more consistent
+        },
+        'injury': {
+            'gamesInjured': 0,
+            'injuryHistory': [],
+            'riskScore': 0.1
+        }
+    }
+
+def iter_espn_fantasy_players(id_map, depth=None, max_workers=8):
+    """Source + normalize stage for the ESPN fantasy feed, in position and ownership order"""
     print("Fetching NFL player data from ESPN...")
+    start = time.perf_counter()
+    
+    # proTeamId in the fantasy API is the ESPN team ID
+    teams = team_registry.get_registry()
+    
+    seen = set()
+    for position, offset, page in iter_kona_pages(depth, max_workers=max_workers):
+        for player_data in page:
+            player = normalize_espn_player(player_data, position, teams, id_map)
+            # Ownership can shift between pages; keep a player's first (best) rank only
+            if player['sourceId'] in seen:
+                continue
+            seen.add(player['sourceId'])
+            yield player
+    
+    print(f"Fetched {len(seen)} ESPN players in {time.perf_counter() - start:.2f}s")
+
+def fetch_espn_fantasy_players(id_map=None, depth=None, max_workers=8):
+    """Fetch player data from ESPN's API"""
+    if id_map is None:
+        id_map = player_ids.PlayerIdMap()
     
     try:
-        # First, let's try to get player rankings data
-        # ESPN's fantasy football uses specific filters for positions
-        position_ids = {
-            'QB': 1,
-            'RB': 2,
-            'WR': 3,
-            'TE': 4,
-            'K': 5,
-            'D/ST': 16
-        }
-        
-        for position, pos_id in position_ids.items():
-            print(f"Fetching {position} rankings...")
-            
-            # ESPN fantasy API endpoint for player rankings
-            players_url = f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2024/players?scoringPeriodId=0&view=kona_player_info"
-            
-            # Use filter for specific position
-            headers['x-fantasy-filter'] = json.dumps({
-                "filterSlotIds": {"value": [pos_id]},
-                "limit": 50,
-                "sortPercOwned": {"sortPriority": 1, "sortAsc": False}
-            })
-            
-            response = requests.get(players_url, headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                for player_data in data.get('players', [])[:50]:
-                    player_info = player_data.get('player', {})
-                    
-                    # Extract player details
-                    player_name = player_info.get('fullName', 'Unknown')
-                    team_id = player_info.get('proTeamId', 0)
-                    
-                    # Map team ID to abbreviation (simplified mapping)
-                    team_map = {
-                        1: 'ATL', 2: 'BUF', 3: 'CHI', 4: 'CIN', 5: 'CLE', 6: 'DAL', 7: 'DEN',
-                        8: 'DET', 9: 'GB', 10: 'TEN', 11: 'IND', 12: 'KC', 13: 'LV', 14: 'LAR',
-                        15: 'MIA', 16: 'MIN', 17: 'NE', 18: 'NO', 19: 'NYG', 20: 'NYJ', 21: 'PHI',
-                        22: 'ARI', 23: 'PIT', 24: 'LAC', 25: 'SF', 26: 'SEA', 27: 'TB', 28: 'WAS',
-                        29: 'CAR', 30: 'JAX', 33: 'BAL', 34: 'HOU'
-                    }
-                    
-                    team = team_map.get(team_id, 'FA')
-                    
-                    # Get stats from ownership data
-                    ownership = player_info.get('ownership', {})
-                    percent_owned = ownership.get('percentOwned', 0)
-                    
-                    # Get projected stats
-                    stats = player_info.get('stats', [])
-                    total_points = 0
-                    games_played = 16
-                    
-                    for stat in stats:
-                        if stat.get('scoringPeriodId') == 0 and stat.get('statSourceId') == 1:
-                            total_points = stat.get('appliedTotal', 0)
-                            break
-                    
-                    player = {
-                        'id': player_id,
-                        'name': player_name,
-                        'position': position if position != 'D/ST' else 'DEF',
-                        'team': team,
-                        'stats': {
-                            'gamesPlayed': games_played,
-                            'totalPoints': total_points,
-                            'averagePoints': total_points / games_played if games_played > 0 else 0,
-                            'consistency': 0.7 + (percent_owned / 1000)  # Higher owned players tend to be more consistent
-                        },
-                        'injury': {
-                            'gamesInjured': 0,
-                            'injuryHistory': [],
-                            'riskScore': 0.1
-                        }
-                    }
-                    
-                    players.append(player)
-                    player_id += 1
-            
-            time.sleep(0.5)  # Be respectful with requests
-            
+        return list(iter_espn_fantasy_players(id_map, depth, max_workers))
     except Exception as e:
         print(f"Error fetching from ESPN API: {e}")
         print("Falling back to web scraping...")
-        return scrape_fantasy_pros_rankings()
-    
-    return players
+        return scrape_fantasy_pros_rankings(id_map)
 
-def scrape_fantasy_pros_rankings():
+def scrape_fantasy_pros_rankings(id_map=None):
     """Scrape player rankings and projections from FantasyPros as fallback"""
-    players = []
-    positions = ['qb', 'rb', 'wr', 'te', 'k', 'dst']
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    return list(iter_fantasy_pros_rankings(id_map))
+
+def iter_fantasy_pros_rankings(id_map=None, fast_parse=True, seed=build_state.DEFAULT_SEED):
+    """Source + normalize stage for the FantasyPros ranking pages"""
+    if id_map is None:
+        id_map = player_ids.PlayerIdMap()
     
-    for position in positions:
+    for position in fantasypros.POSITIONS:
         print(f"Scraping {position.upper()} rankings...")
-        url = f"https://www.fantasypros.com/nfl/rankings/{position}.php"
+        url = fantasypros.RANKINGS_URL.format(position=position)
         
         try:
-            response = requests.get(url, headers=headers)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for the rankings table with different possible IDs
-            table = soup.find('table', {'id': 'ranking-table'})
-            if not table:
-                table = soup.find('table', {'class': 'rankings-table'})
-            if not table:
-                # Try to find any table with player data
-                tables = soup.find_all('table')
-                for t in tables:
-                    if t.find('th', string=re.compile('Player|Rank', re.I)):
-                        table = t
-                        break
+            response = http_client.get(url)
+            rows = fantasypros.parse_rankings(response.content, fast=fast_parse)
             
-            if not table:
+            if rows is None:
                 print(f"Could not find rankings table for {position}")
                 continue
-                
-            rows = table.find_all('tr')[1:]  # Skip header row
             
-            for idx, row in enumerate(rows[:50]):  # Top 50 players per position
+            for idx, (player_name, team) in enumerate(rows):
                 try:
-                    cells = row.find_all('td')
-                    if len(cells) < 2:
-                        continue
-                    
-                    # Find player name (usually in second column)
-                    player_cell = cells[1] if len(cells) > 1 else cells[0]
-                    player_link = player_cell.find('a')
-                    
-                    if player_link:
-                        player_name = player_link.text.strip()
-                    else:
-                        # Try to extract text directly
-                        player_text = player_cell.get_text(strip=True)
-                        # Remove team abbreviation if present
-                        player_name = re.sub(r'\s+[A-Z]{2,3}$', '', player_text)
-                    
-                    # Extract team
-                    team_text = player_cell.get_text(strip=True)
-                    team_match = re.search(r'\b([A-Z]{2,3})\b', team_text)
-                    team = team_match.group(1) if team_match else 'FA'
-                    
-                    player_id = len(players) + 1
-                    
                     # Calculate realistic fantasy points based on position and ranking
                     base_points = {
                         'QB': [400, 350, 320, 300, 280, 260, 240, 220, 200, 180],
@@ -190,11 +190,16 @@ def scrape_fantasy_pros_rankings():
                     tier_idx = min(idx // 5, 9)  # Group players into tiers of 5
                     base_total = base_points.get(pos, [100])[tier_idx] if tier_idx < len(base_points.get(pos, [100])) else 50
                     
+                    source_id = player_ids.name_key('fantasypros', pos if pos != 'DST' else 'DEF', player_name)
+                    
                     # Add some variance
-                    total_points = base_total * (1 + random.uniform(-0.15, 0.15))
+                    rng = build_state.player_rng(seed, source_id, 'points')
+                    total_points = base_total * (1 + rng.uniform(-0.15, 0.15))
+                    
                     
                     player = {
-                        'id': player_id,
+                        'id': id_map.assign(source_id),
+                        'sourceId': source_id,
                         'name': player_name,
                         'position': pos if pos != 'DST' else 'DEF',
                         'team': team,
@@ -211,104 +216,117 @@ def scrape_fantasy_pros_rankings():
                         }
                     }
                     
-                    players.append(player)
                     
                 except Exception as e:
                     print(f"Error parsing row: {e}")
                     continue
-            
-            time.sleep(1)  # Be respectful with requests
+                
+                yield player
             
         except Exception as e:
             print(f"Error scraping {position}: {e}")
             continue
+
+# Real injury risk data based on position and player history
+# These are approximate injury rates based on NFL historical data
+POSITION_BASE_RISK = {
+    'RB': 0.35,   # Running backs have highest injury risk
+    'WR': 0.25,   # Wide receivers moderate risk
+    'TE': 0.30,   # Tight ends moderate-high risk
+    'QB': 0.20,   # Quarterbacks lower risk but high impact
+    'K': 0.05,    # Kickers very low risk
+    'DEF': 0.15   # Defense/ST moderate risk
+}
+
+# Known injury-prone players (2023-2024 season data)
+INJURY_HISTORY_MAP = {
+    # QBs
+    'Daniel Jones': {'position': 'QB', 'team': 'NYG', 'injuries': ['neck', 'knee'], 'games_missed': 6},
+    'Kyler Murray': {'position': 'QB', 'team': 'ARI', 'injuries': ['knee'], 'games_missed': 8},
+    'Justin Herbert': {'position': 'QB', 'team': 'LAC', 'injuries': ['finger'], 'games_missed': 2},
+    'Russell Wilson': {'position': 'QB', 'team': 'PIT', 'injuries': ['calf'], 'games_missed': 1},
+
+    # RBs
+    'Nick Chubb': {'position': 'RB', 'team': 'CLE', 'injuries': ['knee'], 'games_missed': 15},
+    'J.K. Dobbins': {'position': 'RB', 'team': 'LAC', 'injuries': ['achilles'], 'games_missed': 17},
+    'Cam Akers': {'position': 'RB', 'team': 'HOU', 'injuries': ['achilles'], 'games_missed': 10},
+    'Javonte Williams': {'position': 'RB', 'team': 'DEN', 'injuries': ['knee'], 'games_missed': 4},
+    'Breece Hall': {'position': 'RB', 'team': 'NYJ', 'injuries': ['knee'], 'games_missed': 0},  # Recovered
+
+    # WRs
+    'Cooper Kupp': {'position': 'WR', 'team': 'LAR', 'injuries': ['hamstring'], 'games_missed': 4},
+    'Keenan Allen': {'position': 'WR', 'team': 'CHI', 'injuries': ['heel'], 'games_missed': 4},
+    'Mike Evans': {'position': 'WR', 'team': 'TB', 'injuries': ['hamstring'], 'games_missed': 1},
+    'DeAndre Hopkins': {'position': 'WR', 'team': 'TEN', 'injuries': ['ankle'], 'games_missed': 0},
+    'Michael Thomas': {'position': 'WR', 'team': 'NO', 'injuries': ['foot'], 'games_missed': 6},
+
+    # TEs
+    'Dallas Goedert': {'position': 'TE', 'team': 'PHI', 'injuries': ['forearm'], 'games_missed': 2},
+    'Darren Waller': {'position': 'TE', 'team': 'NYG', 'injuries': ['hamstring'], 'games_missed': 9},
+    'Kyle Pitts': {'position': 'TE', 'team': 'ATL', 'injuries': ['knee'], 'games_missed': 6},
+}
+
+# ESPN and FantasyPros spell names differently from the table above
+INJURY_INDEX = player_names.NameIndex(INJURY_HISTORY_MAP)
+
+def enrich_injury(player, seed=build_state.DEFAULT_SEED):
+    """Add injury history and risk to one player"""
+    position = player['position']
+    player_name = player['name']
+
+    # Start with base risk for position
+    base_risk = POSITION_BASE_RISK.get(position, 0.15)
+
+    # Check if player has known injury history
+    injury_data = INJURY_INDEX.get(player_name, where={'position': position, 'team': player.get('team')})
+    if injury_data is not None:
+        player['injury']['injuryHistory'] = injury_data['injuries']
+        player['injury']['gamesInjured'] = min(injury_data['games_missed'], 8)  # Cap at 8 for current season
+
+        # Calculate risk score based on games missed
+        # More games missed = higher risk
+        risk_modifier = injury_data['games_missed'] / 17.0  # 17 game season
+        player['injury']['riskScore'] = min(projection_engine.MAX_RISK, base_risk + (risk_modifier * 0.5))
+    else:
+        # For players without specific injury history
+        player['injury']['riskScore'] = base_risk
+        player['injury']['gamesInjured'] = 0
+        player['injury']['injuryHistory'] = []
+
+        # Add some variance based on age/experience (simulated)
+        # Veterans and rookies slightly higher risk
+        rng = build_state.player_rng(seed, player['sourceId'], 'injury')
+        if rng.random() < 0.2:  # 20% chance of minor injury history
+            common_injuries = ['hamstring', 'ankle', 'shoulder', 'knee', 'concussion']
+            player['injury']['injuryHistory'] = [rng.choice(common_injuries)]
+            player['injury']['gamesInjured'] = rng.randint(0, 2)
+            player['injury']['riskScore'] += 0.1
+
+    # Same range as every other injury model (projection_engine)
+    player['injury']['riskScore'] = max(projection_engine.MIN_RISK,
+                                        min(projection_engine.MAX_RISK, player['injury']['riskScore']))
+
+    # Adjust consistency based on injury risk
+    if player['injury']['riskScore'] > 0.3:
+        player['stats']['consistency'] *= (1 - player['injury']['riskScore'] * 0.3)
     
-    return players
+    return player
+
+def iter_injury_data(players, seed=build_state.DEFAULT_SEED):
+    """Injury enrichment stage"""
+    for player in players:
+        yield enrich_injury(player, seed)
 
 def scrape_injury_data(players):
     """Add realistic injury data to players based on historical injury patterns"""
-    
-    # Real injury risk data based on position and player history
-    # These are approximate injury rates based on NFL historical data
-    position_base_risk = {
-        'RB': 0.35,   # Running backs have highest injury risk
-        'WR': 0.25,   # Wide receivers moderate risk
-        'TE': 0.30,   # Tight ends moderate-high risk
-        'QB': 0.20,   # Quarterbacks lower risk but high impact
-        'K': 0.05,    # Kickers very low risk
-        'DEF': 0.15   # Defense/ST moderate risk
-    }
-    
-    # Known injury-prone players (2023-2024 season data)
-    injury_history_map = {
-        # QBs
-        'Daniel Jones': {'injuries': ['neck', 'knee'], 'games_missed': 6},
-        'Kyler Murray': {'injuries': ['knee'], 'games_missed': 8},
-        'Justin Herbert': {'injuries': ['finger'], 'games_missed': 2},
-        'Russell Wilson': {'injuries': ['calf'], 'games_missed': 1},
-        
-        # RBs
-        'Nick Chubb': {'injuries': ['knee'], 'games_missed': 15},
-        'J.K. Dobbins': {'injuries': ['achilles'], 'games_missed': 17},
-        'Cam Akers': {'injuries': ['achilles'], 'games_missed': 10},
-        'Javonte Williams': {'injuries': ['knee'], 'games_missed': 4},
-        'Breece Hall': {'injuries': ['knee'], 'games_missed': 0},  # Recovered
-        
-        # WRs
-        'Cooper Kupp': {'injuries': ['hamstring'], 'games_missed': 4},
-        'Keenan Allen': {'injuries': ['heel'], 'games_missed': 4},
-        'Mike Evans': {'injuries': ['hamstring'], 'games_missed': 1},
-        'DeAndre Hopkins': {'injuries': ['ankle'], 'games_missed': 0},
-        'Michael Thomas': {'injuries': ['foot'], 'games_missed': 6},
-        
-        # TEs
-        'Dallas Goedert': {'injuries': ['forearm'], 'games_missed': 2},
-        'Darren Waller': {'injuries': ['hamstring'], 'games_missed': 9},
-        'Kyle Pitts': {'injuries': ['knee'], 'games_missed': 6},
-    }
-    
-    for player in players:
-        position = player['position']
-        player_name = player['name']
-        
-        # Start with base risk for position
-        base_risk = position_base_risk.get(position, 0.15)
-        
-        # Check if player has known injury history
-        if player_name in injury_history_map:
-            injury_data = injury_history_map[player_name]
-            player['injury']['injuryHistory'] = injury_data['injuries']
-            player['injury']['gamesInjured'] = min(injury_data['games_missed'], 8)  # Cap at 8 for current season
-            
-            # Calculate risk score based on games missed
-            # More games missed = higher risk
-            risk_modifier = injury_data['games_missed'] / 17.0  # 17 game season
-            player['injury']['riskScore'] = min(0.9, base_risk + (risk_modifier * 0.5))
-        else:
-            # For players without specific injury history
-            player['injury']['riskScore'] = base_risk
-            player['injury']['gamesInjured'] = 0
-            player['injury']['injuryHistory'] = []
-            
-            # Add some variance based on age/experience (simulated)
-            # Veterans and rookies slightly higher risk
-            if random.random() < 0.2:  # 20% chance of minor injury history
-                common_injuries = ['hamstring', 'ankle', 'shoulder', 'knee', 'concussion']
-                player['injury']['injuryHistory'] = [random.choice(common_injuries)]
-                player['injury']['gamesInjured'] = random.randint(0, 2)
-                player['injury']['riskScore'] += 0.1
-        
-        # Ensure risk score is between 0 and 1
-        player['injury']['riskScore'] = max(0.05, min(0.9, player['injury']['riskScore']))
-        
-        # Adjust consistency based on injury risk
-        if player['injury']['riskScore'] > 0.3:
-            player['stats']['consistency'] *= (1 - player['injury']['riskScore'] * 0.3)
-    
-    return players
+    return list(iter_injury_data(players))
 
 def calculate_player_stats(players):
     """Calculate fantasy points and statistics for each player"""
+    return list(iter_player_stats(players))
+
+def iter_player_stats(players, seed=build_state.DEFAULT_SEED):
+    """Projection stage: fill in points and consistency from position baselines and rank"""
     position_baselines = {
         'QB': {'avg': 18, 'total': 288, 'consistency': 0.75},
         'RB': {'avg': 12, 'total': 192, 'consistency': 0.65},
@@ -318,139 +336,242 @@ def calculate_player_stats(players):
         'DEF': {'avg': 8, 'total': 128, 'consistency': 0.70}
     }
     
-    for i, player in enumerate(players):
+    position_ranks = {}
+    
+    for player in players:
         position = player['position']
         baseline = position_baselines.get(position, position_baselines['WR'])
         
+        # Players arrive ranked within each position; depth can exceed 50 per position
+        rank = position_ranks.get(position, 0)
+        position_ranks[position] = rank + 1
+        
         # Create a performance multiplier based on ranking
-        rank_multiplier = 1.5 - (i % 50) * 0.02  # Top players get higher multiplier
+        rank_multiplier = max(0.5, 1.5 - rank * 0.02)  # Top players get higher multiplier
         
-        player['stats']['averagePoints'] = baseline['avg'] * rank_multiplier * (1 + random.uniform(-0.2, 0.2))
+        rng = build_state.player_rng(seed, player['sourceId'], 'stats')
+        player['stats']['averagePoints'] = baseline['avg'] * rank_multiplier * (1 + rng.uniform(-0.2, 0.2))
         player['stats']['totalPoints'] = player['stats']['averagePoints'] * 16
-        player['stats']['consistency'] = baseline['consistency'] * (1 + random.uniform(-0.1, 0.1))
+        player['stats']['consistency'] = baseline['consistency'] * (1 + rng.uniform(-0.1, 0.1))
         
         # Adjust stats based on injury
         injury_adjustment = 1 - (player['injury']['riskScore'] * 0.2)
         player['stats']['averagePoints'] *= injury_adjustment
         player['stats']['totalPoints'] *= injury_adjustment
         player['stats']['gamesPlayed'] = 16 - player['injury']['gamesInjured']
-    
+        
+        yield player
+
+def project_if_missing(players, seed=build_state.DEFAULT_SEED):
+    """Run the projection stage only when the source came without projected points"""
+    first, players = pipeline.peek(players)
+    if first is not None and first['stats']['totalPoints'] == 0:
+        return iter_player_stats(players, seed)
     return players
 
-def main():
+def iter_fallback_players(id_map, seed=build_state.DEFAULT_SEED):
+    """Last-resort source: real player names from the 2024 season with generated points"""
+    # Real player names from 2024 NFL season
+    player_names = {
+        'QB': ['Josh Allen', 'Dak Prescott', 'Jalen Hurts', 'Lamar Jackson', 'Patrick Mahomes',
+               'Tua Tagovailoa', 'Joe Burrow', 'Justin Herbert', 'Trevor Lawrence', 'C.J. Stroud',
+               'Jared Goff', 'Kirk Cousins', 'Jordan Love', 'Brock Purdy', 'Russell Wilson',
+               'Deshaun Watson', 'Geno Smith', 'Derek Carr', 'Baker Mayfield', 'Justin Fields'],
+        'RB': ['Christian McCaffrey', 'Austin Ekeler', 'Bijan Robinson', 'Saquon Barkley', 'Tony Pollard',
+               'Jonathan Taylor', 'Derrick Henry', 'Josh Jacobs', 'Najee Harris', 'Jahmyr Gibbs',
+               'Travis Etienne Jr.', 'Kenneth Walker III', 'Breece Hall', 'Aaron Jones', 'Rhamondre Stevenson',
+               'Joe Mixon', 'Rachaad White', 'James Cook', 'Isiah Pacheco', 'Alvin Kamara'],
+        'WR': ['Tyreek Hill', 'CeeDee Lamb', 'Justin Jefferson', "Ja'Marr Chase", 'A.J. Brown',
+               'Stefon Diggs', 'Amon-Ra St. Brown', 'Davante Adams', 'Cooper Kupp', 'Garrett Wilson',
+               'Chris Olave', 'DK Metcalf', 'DeVonta Smith', 'Jaylen Waddle', 'Keenan Allen',
+               'Mike Evans', 'Tee Higgins', 'Calvin Ridley', 'Terry McLaurin', 'Brandon Aiyuk'],
+        'TE': ['Travis Kelce', 'T.J. Hockenson', 'Mark Andrews', 'George Kittle', 'Darren Waller',
+               'Dallas Goedert', 'Kyle Pitts', 'Evan Engram', 'David Njoku', 'Sam LaPorta',
+               'Cole Kmet', 'Jake Ferguson', 'Dalton Schultz', 'Tyler Higbee', 'Pat Freiermuth',
+               'Trey McBride', 'Dalton Kincaid', 'Michael Mayer', 'Greg Dulcich', 'Chigoziem Okonkwo'],
+        'K': ['Justin Tucker', 'Harrison Butker', 'Daniel Carlson', 'Tyler Bass', 'Jake Elliott',
+              'Jason Myers', 'Evan McPherson', 'Younghoe Koo', 'Cameron Dicker', 'Brandon McManus',
+              'Matt Gay', 'Jake Moody', 'Greg Zuerlein', 'Jason Sanders', 'Cairo Santos'],
+        'DEF': ['49ers', 'Cowboys', 'Bills', 'Ravens', 'Browns', 
+                'Jets', 'Saints', 'Steelers', 'Dolphins', 'Chiefs',
+                'Eagles', 'Bengals', 'Broncos', 'Jaguars', 'Patriots']
+    }
+
+    teams = ['KC', 'BUF', 'CIN', 'JAX', 'LAC', 'BAL', 'MIA', 'NE', 'NYJ', 'PIT', 
+            'CLE', 'TEN', 'IND', 'HOU', 'DEN', 'LV', 'DAL', 'PHI', 'WAS', 'NYG',
+            'GB', 'MIN', 'CHI', 'DET', 'TB', 'NO', 'ATL', 'CAR', 'SF', 'SEA', 'LAR', 'ARI']
+
+    for position in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
+        names = player_names.get(position, [])
+        for i in range(min(len(names), 50)):  # Use real names when available
+            name = names[i]
+
+            if position == 'DEF':
+                team = name  # For DEF, the name is the team
+            else:
+                # Assign teams in a rotating fashion
+                team = teams[i % len(teams)]
+
+            # Calculate realistic points based on position and rank
+            base_points_by_pos = {
+                'QB': 350 - (i * 7),
+                'RB': 250 - (i * 6),
+                'WR': 200 - (i * 5),
+                'TE': 150 - (i * 4),
+                'K': 140 - (i * 2),
+                'DEF': 130 - (i * 3)
+            }
+
+            source_id = player_ids.name_key('static', position, name)
+            base_total = max(50, base_points_by_pos.get(position, 100))
+            rng = build_state.player_rng(seed, source_id, 'points')
+            total_points = base_total * (1 + rng.uniform(-0.1, 0.1))
+
+            yield {
+                'id': id_map.assign(source_id),
+                'sourceId': source_id,
+                'name': name,
+                'position': position,
+                'team': team,
+                'stats': {
+                    'gamesPlayed': 17,  # 17 game season
+                    'totalPoints': total_points,
+                    'averagePoints': total_points / 17,
+                    'consistency': 0.8 - (i * 0.01)
+                },
+                'injury': {
+                    'gamesInjured': 0,
+                    'injuryHistory': [],
+                    'riskScore': 0.1
+                }
+            }
+
+def main(offline=False, depth=None, max_workers=8, output_format='json', columnar_export=False,
+         seed=build_state.DEFAULT_SEED, force=False, requests_per_second=4.0, base_url=None,
+         prometheus_path=None, season=history.CURRENT_SEASON, binary_export=False, search_export=False,
+         simulate_seasons=0):
     print("Starting NFL data scraping...")
+    build_metrics = metrics.BuildMetrics('nfl_data')
+    http_client.use_mock_root(base_url)
+    http_client.configure(requests_per_second=requests_per_second, offline=offline, base_url=base_url)
     
-    # Try ESPN API first, then fall back to FantasyPros
-    players = fetch_espn_fantasy_players()
+    # Player IDs stay stable across runs so saved draft state keeps working
+    id_map = player_ids.PlayerIdMap()
     
-    if not players:
-        print("ESPN API failed, trying FantasyPros...")
-        players = scrape_fantasy_pros_rankings()
+    # Try ESPN API first, then fall back to FantasyPros, then to built-in names
+    players = pipeline.first_nonempty(
+        ("ESPN API", lambda: iter_espn_fantasy_players(id_map, depth, max_workers)),
+        ("FantasyPros", lambda: iter_fantasy_pros_rankings(id_map, seed=seed)),
+        ("Fallback player list", lambda: iter_fallback_players(id_map, seed))
+    )
     
-    if not players:
-        print("All scraping failed, generating fallback data with real player names...")
-        # Generate fallback data with real player names from 2024 season
-        players = []
-        
-        # Real player names from 2024 NFL season
-        player_names = {
-            'QB': ['Josh Allen', 'Dak Prescott', 'Jalen Hurts', 'Lamar Jackson', 'Patrick Mahomes',
-                   'Tua Tagovailoa', 'Joe Burrow', 'Justin Herbert', 'Trevor Lawrence', 'C.J. Stroud',
-                   'Jared Goff', 'Kirk Cousins', 'Jordan Love', 'Brock Purdy', 'Russell Wilson',
-                   'Deshaun Watson', 'Geno Smith', 'Derek Carr', 'Baker Mayfield', 'Justin Fields'],
-            'RB': ['Christian McCaffrey', 'Austin Ekeler', 'Bijan Robinson', 'Saquon Barkley', 'Tony Pollard',
-                   'Jonathan Taylor', 'Derrick Henry', 'Josh Jacobs', 'Najee Harris', 'Jahmyr Gibbs',
-                   'Travis Etienne Jr.', 'Kenneth Walker III', 'Breece Hall', 'Aaron Jones', 'Rhamondre Stevenson',
-                   'Joe Mixon', 'Rachaad White', 'James Cook', 'Isiah Pacheco', 'Alvin Kamara'],
-            'WR': ['Tyreek Hill', 'CeeDee Lamb', 'Justin Jefferson', "Ja'Marr Chase", 'A.J. Brown',
-                   'Stefon Diggs', 'Amon-Ra St. Brown', 'Davante Adams', 'Cooper Kupp', 'Garrett Wilson',
-                   'Chris Olave', 'DK Metcalf', 'DeVonta Smith', 'Jaylen Waddle', 'Keenan Allen',
-                   'Mike Evans', 'Tee Higgins', 'Calvin Ridley', 'Terry McLaurin', 'Brandon Aiyuk'],
-            'TE': ['Travis Kelce', 'T.J. Hockenson', 'Mark Andrews', 'George Kittle', 'Darren Waller',
-                   'Dallas Goedert', 'Kyle Pitts', 'Evan Engram', 'David Njoku', 'Sam LaPorta',
-                   'Cole Kmet', 'Jake Ferguson', 'Dalton Schultz', 'Tyler Higbee', 'Pat Freiermuth',
-                   'Trey McBride', 'Dalton Kincaid', 'Michael Mayer', 'Greg Dulcich', 'Chigoziem Okonkwo'],
-            'K': ['Justin Tucker', 'Harrison Butker', 'Daniel Carlson', 'Tyler Bass', 'Jake Elliott',
-                  'Jason Myers', 'Evan McPherson', 'Younghoe Koo', 'Cameron Dicker', 'Brandon McManus',
-                  'Matt Gay', 'Jake Moody', 'Greg Zuerlein', 'Jason Sanders', 'Cairo Santos'],
-            'DEF': ['49ers', 'Cowboys', 'Bills', 'Ravens', 'Browns', 
-                    'Jets', 'Saints', 'Steelers', 'Dolphins', 'Chiefs',
-                    'Eagles', 'Bengals', 'Broncos', 'Jaguars', 'Patriots']
-        }
-        
-        teams = ['KC', 'BUF', 'CIN', 'JAX', 'LAC', 'BAL', 'MIA', 'NE', 'NYJ', 'PIT', 
-                'CLE', 'TEN', 'IND', 'HOU', 'DEN', 'LV', 'DAL', 'PHI', 'WAS', 'NYG',
-                'GB', 'MIN', 'CHI', 'DET', 'TB', 'NO', 'ATL', 'CAR', 'SF', 'SEA', 'LAR', 'ARI']
-        
-        player_id = 1
-        for position in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
-            names = player_names.get(position, [])
-            for i in range(min(len(names), 50)):  # Use real names when available
-                name = names[i]
-                
-                if position == 'DEF':
-                    team = name  # For DEF, the name is the team
-                else:
-                    # Assign teams in a rotating fashion
-                    team = teams[i % len(teams)]
-                
-                # Calculate realistic points based on position and rank
-                base_points_by_pos = {
-                    'QB': 350 - (i * 7),
-                    'RB': 250 - (i * 6),
-                    'WR': 200 - (i * 5),
-                    'TE': 150 - (i * 4),
-                    'K': 140 - (i * 2),
-                    'DEF': 130 - (i * 3)
-                }
-                
-                base_total = max(50, base_points_by_pos.get(position, 100))
-                total_points = base_total * (1 + random.uniform(-0.1, 0.1))
-                
-                players.append({
-                    'id': player_id,
-                    'name': name,
-                    'position': position,
-                    'team': team,
-                    'stats': {
-                        'gamesPlayed': 17,  # 17 game season
-                        'totalPoints': total_points,
-                        'averagePoints': total_points / 17,
-                        'consistency': 0.8 - (i * 0.01)
-                    },
-                    'injury': {
-                        'gamesInjured': 0,
-                        'injuryHistory': [],
-                        'riskScore': 0.1
-                    }
-                })
-                player_id += 1
-    
-    print(f"Processing {len(players)} players...")
+    # Finish fetching so every source record is in the input hash (spooled to
+    # disk, not held in memory), then skip the rest if nothing changed
+    inputs = build_state.InputHash('nfl_data')
+    inputs.update('params', [output_format, columnar_export, binary_export, search_export, simulate_seasons, seed,
+                             season])
+    with build_metrics.stage('fetch'):
+        players = inputs.spool('players', players)
+    previous = history.load_season(season - 1, 'espn')
+    weekly = game_logs.load_consistency(season)
+    inputs.update('injuries', INJURY_HISTORY_MAP)
+    inputs.update('previousSeason', previous.rows)
+    inputs.update('gameLogs', weekly.by_source)
+    inputs.update_code(__file__, binary_table, build_state, columnar, fantasypros, game_logs, history, pipeline,
+                       player_ids, player_names, projection_engine, rankings)
+    if simulate_seasons:
+        import simulation
+        inputs.update_code(simulation)
+    if build_state.skip_if_current(inputs, force):
+        return
     
     # Add injury data
-    players = scrape_injury_data(players)
+    players = build_metrics.track('injury', iter_injury_data(players, seed))
     
     # Calculate/adjust stats if needed
-    if players and players[0]['stats']['totalPoints'] == 0:
-        players = calculate_player_stats(players)
+    players = build_metrics.track('projections', project_if_missing(players, seed))
+    players = build_metrics.track('game_logs', weekly.attach(players))
+    players = build_metrics.track('previous_season', previous.attach(players))
     
     # Save to JSON
-    with open('data/players.json', 'w') as f:
-        json.dump(players, f, indent=2)
+    with build_metrics.stage('write'):
+        written = pipeline.write_players(players, output_format,
+                                         columnar_path=columnar.COLUMNAR_PATH if columnar_export else None,
+                                         binary_path=binary_table.BINARY_PATH if binary_export else None,
+                                         search=search_export)
+    
+    # Season percentiles for the floors and ceilings, before rankings read them
+    if simulate_seasons:
+        with build_metrics.stage('simulation'):
+            written = simulation.simulate_file(written['path'], simulate_seasons, seed=seed,
+                                               columnar_path=written.get('columnarPath'),
+                                               binary_path=written.get('binaryPath'),
+                                               search=bool(written.get('searchPath')))
+    id_map.save()
+    
+    # Precompute rankings for the common league configurations
+    with build_metrics.stage('rankings'):
+        saved = rankings.load_players(written['path'])
+        rankings.write_rankings(saved)
+    
+    # Append this season to the history store for next season's build
+    with build_metrics.stage('history'):
+        history.record_season(saved, season, 'espn')
     
-    print(f"Successfully saved {len(players)} players to data/players.json")
+    print(f"Successfully saved {written['totalPlayers']} players to {written['path']}")
     
     # Create a summary file
     summary = {
         'lastUpdated': datetime.now().isoformat(),
-        'totalPlayers': len(players),
-        'positions': {pos: len([p for p in players if p['position'] == pos]) for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']},
-        'dataSource': 'ESPN Fantasy API / FantasyPros rankings with real injury risk modeling'
+        'totalPlayers': written['totalPlayers'],
+        'positions': {pos: written['positions'].get(pos, 0) for pos in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']},
+        'dataSource': 'ESPN Fantasy API / FantasyPros rankings with real injury risk modeling',
+        **pipeline.summary_fields(written),
+        'metrics': build_metrics.to_dict(http_client.get_client())
     }
     
     with open('data/summary.json', 'w') as f:
         json.dump(summary, f, indent=2)
+    pipeline.print_file_sizes(written)
+    if prometheus_path:
+        metrics.write_prometheus(summary['metrics'], prometheus_path)
+    build_state.record(inputs, list(written['files']) + ['data/summary.json', rankings.RANKINGS_PATH])
+    
+    build_metrics.print_stages()
+    print("\nRequest latency:")
+    http_client.get_client().print_latency_stats()
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--offline', action='store_true',
+                        help="Serve every request from the response cache, never the network")
+    parser.add_argument('--base-url', default=None,
+                        help="Send every request to this server instead, e.g. http://127.0.0.1:8765 for mock_server.py")
+    parser.add_argument('--rate', type=float, default=4.0,
+                        help="Maximum requests per second to each host (default: 4)")
+    parser.add_argument('--depth', default='',
+                        help="Players to fetch per position, e.g. RB=200,WR=240 (defaults cover 14-team leagues)")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="Number of ESPN pages fetched concurrently (default: 8)")
+    pipeline.add_output_arguments(parser, sort=False)
+    build_state.add_build_arguments(parser)
+    metrics.add_metrics_arguments(parser)
+    history.add_history_arguments(parser)
+
+def run(args):
+    depth = {}
+    for item in filter(None, args.depth.split(',')):
+        position, count = item.split('=')
+        position = position.strip().upper()
+        depth['D/ST' if position in ('DEF', 'DST') else position] = int(count)
+    
+    main(offline=args.offline, depth=depth, max_workers=args.workers, output_format=args.format,
+         columnar_export=args.columnar, seed=args.seed, force=args.force,
+         requests_per_second=args.rate, base_url=args.base_url, prometheus_path=args.prometheus,
+         season=args.season, binary_export=args.binary, search_export=args.search_index,
+         simulate_seasons=args.simulate)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape fantasy rankings from ESPN / FantasyPros")
+    add_arguments(parser)
+    run(parser.parse_args())
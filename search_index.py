@@ -0,0 +1,241 @@
+import argparse
+import bisect
+import json
+import os
+import random
+import time
+
+import player_names
+import team_registry
+
+# Build-time search index for the draft board's player search box, written
+# next to players.json in the same pass. Two parts:
+#
+#   trigrams  trigram of the lowercased name -> player IDs. A name containing
+#             the query contains every trigram of it, so intersecting those
+#             lists and checking the few candidates gives exactly the old
+#             `name.toLowerCase().includes(term)` matches.
+#   tokens    sorted search tokens with parallel `postings` of player IDs:
+#             the canonical name and each trailing run of its words (so
+#             "st brown" finds Amon-Ra St. Brown), team abbreviation and team
+#             name, and nicknames. Prefix lookups are a binary search.
+#
+# search() is the Python mirror of searchCandidates() in app.js, and
+# `python3 search_index.py --check` compares it with a brute-force scan.
+
+FORMAT_VERSION = 1
+
+# Queries shorter than a trigram fall back to scanning names
+MIN_TRIGRAM_QUERY = 3
+
+# Canonical name -> extra search tokens. player_names.ALIASES spellings are added too.
+NICKNAMES = {
+    'christian mccaffrey': ['cmc'],
+    'amon ra st brown': ['arsb', 'sun god'],
+    'kenneth walker': ['k9'],
+    'marquise brown': ['hollywood'],
+    'chigoziem okonkwo': ['chig'],
+    'gabriel davis': ['gabe davis'],
+    'david montgomery': ['monty'],
+    'deebo samuel': ['deebo'],
+    'tyreek hill': ['cheetah']
+}
+
+TEAM_NAMES = {team['abbreviation']: team['name'] for team in team_registry.FALLBACK_TEAMS}
+
+def search_path(players_path):
+    """data/players.json (or .ndjson) -> data/players.search.json"""
+    root, ext = os.path.splitext(players_path)
+    return f"{root}.search.json"
+
+def name_trigrams(name):
+    lowered = name.lower()
+    return {lowered[i:i + 3] for i in range(len(lowered) - 2)}
+
+def player_tokens(record):
+    """Every token a prefix search should find this player by"""
+    key = player_names.canonical(record.get('name') or '')
+    words = key.split()
+    tokens = {' '.join(words[i:]) for i in range(len(words))}
+    tokens.update(NICKNAMES.get(key, ()))
+    tokens.update(alias for alias, target in player_names.ALIASES.items() if target == key)
+
+    team = record.get('team')
+    if team:
+        tokens.add(team.lower())
+        if team in TEAM_NAMES:
+            tokens.add(TEAM_NAMES[team].lower())
+    tokens.discard('')
+    return tokens
+
+class SearchIndexBuilder:
+    """Accumulates the index per player; call add() per record, then write()"""
+
+    def __init__(self):
+        self.length = 0
+        self.trigrams = {}  # trigram -> player IDs
+        self.tokens = {}    # token -> player IDs
+
+    def __len__(self):
+        return self.length
+
+    def add(self, record):
+        player_id = record['id']
+        self.length += 1
+        for gram in name_trigrams(record.get('name') or ''):
+            self.trigrams.setdefault(gram, set()).add(player_id)
+        for token in player_tokens(record):
+            self.tokens.setdefault(token, set()).add(player_id)
+        return record
+
+    def to_dict(self):
+        tokens = sorted(self.tokens)
+        return {
+            'version': FORMAT_VERSION,
+            'length': len(self),
+            'tokens': tokens,
+            'postings': [sorted(self.tokens[token]) for token in tokens],
+            'trigrams': {gram: sorted(ids) for gram, ids in sorted(self.trigrams.items())}
+        }
+
+    def write(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+def build_index(players):
+    builder = SearchIndexBuilder()
+    for player in players:
+        builder.add(player)
+    return builder.to_dict()
+
+def search(index, names, term):
+    """Player IDs matching `term`: name substring matches plus token prefix matches
+
+    `names` maps player ID -> name. Mirrors searchCandidates() in app.js.
+    """
+    term = term.lower()
+    if not term:
+        return set()
+
+    if len(term) >= MIN_TRIGRAM_QUERY:
+        lists = [index['trigrams'].get(term[i:i + 3], []) for i in range(len(term) - 2)]
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                break
+        matches = {player_id for player_id in candidates if term in names[player_id].lower()}
+    else:
+        matches = {player_id for player_id, name in names.items() if term in name.lower()}
+
+    tokens = index['tokens']
+    position = bisect.bisect_left(tokens, term)
+    while position < len(tokens) and tokens[position].startswith(term):
+        matches.update(index['postings'][position])
+        position += 1
+    return matches
+
+def substring_scan(players, term):
+    """The draft board's old search: every player whose name contains the term"""
+    term = term.lower()
+    return {player['id'] for player in players if term and term in player['name'].lower()}
+
+def brute_force(players, term):
+    """The semantics search() must reproduce: substring_scan() plus token prefix matches"""
+    term = term.lower()
+    if not term:
+        return set()
+    return {player['id'] for player in players
+            if term in player['name'].lower()
+            or any(token.startswith(term) for token in player_tokens(player))}
+
+def check_terms(players, samples=2000, seed=0):
+    """Query terms for the check: substrings of real names, tokens and some that match nothing"""
+    rng = random.Random(seed)
+    terms = {'', 'a', 'zz', 'xqz', 'kc', 'cmc', 'st brown', 'jr.', "'", ' '}
+    names = [player['name'] for player in players]
+    for _ in range(samples):
+        name = rng.choice(names)
+        length = rng.randint(1, min(8, len(name)))
+        start = rng.randrange(len(name) - length + 1)
+        term = name[start:start + length]
+        terms.add(term.upper() if rng.random() < 0.2 else term)
+    for player in rng.sample(players, min(len(players), samples // 10)):
+        token = rng.choice(sorted(player_tokens(player)))
+        terms.add(token[:rng.randint(1, len(token))])
+    return sorted(terms)
+
+def check(players, samples=2000):
+    """Compare search() with brute_force() on sample queries; returns the mismatches"""
+    index = json.loads(json.dumps(build_index(players)))  # same types as the browser sees
+    names = {player['id']: player['name'] for player in players}
+    terms = check_terms(players, samples)
+
+    mismatches = []
+    long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_QUERY]
+    for term in terms:
+        found = search(index, names, term)
+
+        expected = brute_force(players, term)
+        if found != expected:
+            mismatches.append((term, sorted(found - expected), sorted(expected - found)))
+
+    # Shorter queries scan either way; time the ones the trigram index serves
+    start = time.perf_counter()
+    for term in long_terms:
+        search(index, names, term)
+    indexed_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for term in long_terms:
+        substring_scan(players, term)
+    scan_time = time.perf_counter() - start
+
+    print(f"Checked {len(terms)} queries against {len(players)} players: "
+          f"{len(mismatches)} mismatches")
+    print(f"  {len(long_terms)} queries of {MIN_TRIGRAM_QUERY}+ characters: "
+          f"index {indexed_time / len(long_terms) * 1e6:.0f}us/query, "
+          f"substring scan {scan_time / len(long_terms) * 1e6:.0f}us/query")
+    for term, extra, missing in mismatches[:20]:
+        print(f"  {term!r}: extra {extra[:5]}, missing {missing[:5]}")
+    return mismatches
+
+def add_arguments(parser):
+    """Command-line options, shared with the draft.py subcommand"""
+    parser.add_argument('--players', default='data/players.json',
+                        help="Player file to index (JSON array or .ndjson)")
+    parser.add_argument('--check', action='store_true',
+                        help="Compare index lookups with a full substring scan instead of writing")
+    parser.add_argument('--samples', type=int, default=2000,
+                        help="Name substrings to sample as --check queries (default: 2000)")
+
+def run(args):
+    import rankings
+
+    players = rankings.load_players(args.players)
+    if args.check:
+        raise SystemExit(1 if check(players, args.samples) else 0)
+    path = search_path(args.players)
+    builder = SearchIndexBuilder()
+    for player in players:
+        builder.add(player)
+    print(f"Saved search index for {len(builder)} players to {path} ({builder.write(path) / 1024:.1f} KB)")
+
+    # Point the draft board at it; builds only list it when run with --search-index
+    summary_path = os.path.join(os.path.dirname(args.players), 'summary.json')
+    try:
+        with open(summary_path) as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return
+    summary['searchFile'] = os.path.basename(path)
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or check the player search index")
+    add_arguments(parser)
+    run(parser.parse_args())
@@ -0,0 +1,177 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+import build_state
+import pipeline
+import rankings
+
+# Monte Carlo season simulator. Each simulated season draws 17 weekly scores
+# per player from averagePoints with a spread set by the observed weekly CV
+# (game_logs.py) or else by consistency (the same stdDev the draft board
+# uses), then knocks out an injury absence with probability
+# injury.riskScore. Season totals are accumulated into per-player histograms,
+# so memory stays flat however many seasons are run, and the seasons are
+# split across a process pool.
+
+WEEKS = 17
+PERCENTILES = [10, 50, 90]
+BIN_WIDTH = 0.5        # points per histogram bin
+MAX_SEASON_POINTS = 800
+CHUNK_SEASONS = 500    # seasons drawn per vectorized batch
+TASK_SEASONS = 2000    # seasons per pool task
+MEAN_ABSENCE = 3.0     # average games missed per injury
+
+def player_arrays(players):
+    """Per-player model inputs as float32 arrays"""
+    average = np.array([p['stats']['averagePoints'] for p in players], dtype=np.float32)
+    consistency = np.array([p['stats']['consistency'] for p in players], dtype=np.float32)
+    risk = np.array([p['injury']['riskScore'] for p in players], dtype=np.float32)
+    cv = np.array([p.get('gameLog', {}).get('cv', np.nan) for p in players], dtype=np.float32)
+    # The observed weekly CV where there are game logs, else the same
+    # volatility -> stdDev approximation as calculateAdvancedStats in app.js
+    std_dev = np.where(np.isnan(cv), average * (1 - consistency) * 0.5, average * cv)
+    return average, std_dev, np.clip(risk, 0, 1)
+
+def simulate_chunk(average, std_dev, risk, seasons, seed):
+    """Histogram of season totals (players x bins) for `seasons` simulated seasons"""
+    rng = np.random.default_rng(seed)
+    n = len(average)
+    bins = int(MAX_SEASON_POINTS / BIN_WIDTH)
+    counts = np.zeros((n, bins), dtype=np.int64)
+    weeks = np.arange(WEEKS, dtype=np.int16)
+    offsets = np.arange(n, dtype=np.int64)[:, None] * bins
+
+    done = 0
+    while done < seasons:
+        batch = min(CHUNK_SEASONS, seasons - done)
+
+        # Weekly scores, floored at zero: players x seasons x weeks
+        scores = rng.standard_normal((n, batch, WEEKS), dtype=np.float32)
+        scores *= std_dev[:, None, None]
+        scores += average[:, None, None]
+        np.maximum(scores, 0, out=scores)
+
+        # One possible injury per season: onset week and geometric length
+        injured = rng.random((n, batch), dtype=np.float32) < risk[:, None]
+        onset = rng.integers(0, WEEKS, (n, batch), dtype=np.int16)
+        length = rng.geometric(1 / MEAN_ABSENCE, (n, batch)).astype(np.int16)
+        out = injured[:, :, None] & (weeks >= onset[:, :, None]) & (weeks < (onset + length)[:, :, None])
+        scores[out] = 0
+
+        totals = scores.sum(axis=2)
+        index = np.minimum((totals / BIN_WIDTH).astype(np.int64), bins - 1)
+        counts += np.bincount((index + offsets).ravel(), minlength=n * bins).reshape(n, bins)
+        done += batch
+
+    return counts
+
+def percentiles_from_counts(counts, percentiles=PERCENTILES):
+    """Percentile season totals per player from histogram counts, interpolated within a bin"""
+    cumulative = np.cumsum(counts, axis=1)
+    total = cumulative[:, -1:]
+    result = {}
+    for pct in percentiles:
+        target = total * (pct / 100)
+        bin_index = (cumulative < target).sum(axis=1)
+        below = np.take_along_axis(cumulative, np.maximum(bin_index - 1, 0)[:, None], axis=1)
+        below = np.where(bin_index[:, None] > 0, below, 0)
+        in_bin = np.take_along_axis(counts, bin_index[:, None], axis=1)
+        fraction = np.where(in_bin > 0, (target - below) / np.maximum(in_bin, 1), 0)
+        result[f"p{pct}"] = ((bin_index[:, None] + fraction) * BIN_WIDTH)[:, 0]
+    result['mean'] = (counts * (np.arange(counts.shape[1]) + 0.5) * BIN_WIDTH).sum(axis=1) / total[:, 0]
+    return result
+
+def simulate(players, seasons=10000, workers=None, seed=0):
+    """{player id: {'p10', 'p50', 'p90', 'mean'}} from `seasons` simulated seasons"""
+    average, std_dev, risk = player_arrays(players)
+    workers = workers or os.cpu_count() or 1
+
+    # One independent stream per task; the split does not depend on the
+    # worker count, so a seed gives the same tables on any machine
+    tasks = max(1, -(-seasons // TASK_SEASONS))
+    sizes = [seasons // tasks + (1 if i < seasons % tasks else 0) for i in range(tasks)]
+    seeds = np.random.SeedSequence(seed).spawn(tasks)
+
+    counts = None
+    if workers == 1:
+        results = (simulate_chunk(average, std_dev, risk, size, s) for size, s in zip(sizes, seeds))
+        for result in results:
+            counts = result if counts is None else counts + result
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(simulate_chunk, repeat(average), repeat(std_dev), repeat(risk), sizes, seeds)
+            for result in results:
+                counts = result if counts is None else counts + result
+
+    stats = percentiles_from_counts(counts)
+    return {
+        player['id']: {key: round(float(values[i]), 1) for key, values in stats.items()}
+        for i, player in enumerate(players)
+    }
+
+def attach(players, results, seasons):
+    """Add a `simulation` block with the percentile table to each player"""
+    for player in players:
+        if player['id'] in results:
+            player['simulation'] = dict(results[player['id']], seasons=seasons)
+        yield player
+
+def simulate_file(path, seasons=10000, workers=None, seed=0, columnar_path=None, binary_path=None, search=False):
+    """Add simulation blocks to the players in `path` and rewrite the player files; returns write_players' counts"""
+    players = rankings.load_players(path)
+    print(f"Simulating {seasons:,} seasons for {len(players)} players on {workers or os.cpu_count()} processes...")
+
+    start = time.perf_counter()
+    results = simulate(players, seasons, workers, seed)
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {seasons * len(players):,} player-seasons in {elapsed:.2f}s")
+
+    players = attach(players, results, seasons)
+    return pipeline.write_players(players, 'ndjson' if path.endswith('.ndjson') else 'json',
+                                  path=path, columnar_path=columnar_path, binary_path=binary_path,
+                                  search=search)
+
+def main(path='data/players.json', seasons=10000, workers=None, seed=0):
+    # The build's summary.json says which exports it made; they all sit next to the player file
+    directory = os.path.dirname(path)
+    summary_path = os.path.join(directory, 'summary.json')
+    try:
+        with open(summary_path) as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        summary = {}
+    columnar_path = os.path.join(directory, summary['columnarFile']) if summary.get('columnarFile') else None
+    binary_path = os.path.join(directory, summary['binaryFile']) if summary.get('binaryFile') else None
+    search = bool(summary.get('searchFile'))
+
+    builds = build_state.current_builds(owning=path)
+    written = simulate_file(path, seasons, workers, seed, columnar_path, binary_path, search)
+    pipeline.update_summary(written, summary_path)
+    pipeline.print_file_sizes(written)
+
+    # Floors and ceilings now come from the simulation
+    rankings.write_rankings(rankings.load_players(written['path']), os.path.join(directory, 'rankings.json'))
+
+    # Keep the build that wrote these files current, so the next generator run
+    # doesn't rebuild them without the simulation; generators take --simulate
+    # to run it as part of the build instead
+    build_state.refresh_outputs(builds)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate seasons to add P10/P50/P90 outcomes to players.json")
+    parser.add_argument('--seasons', type=int, default=10000,
+                        help="Seasons to simulate (default: 10000)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Random seed; the same seed and inputs give the same tables")
+    parser.add_argument('--players', default='data/players.json',
+                        help="Player file to simulate and update")
+    args = parser.parse_args()
+    main(args.players, args.seasons, args.workers, args.seed)
@@ -0,0 +1,169 @@
+import json
+import os
+
+# One registry of NFL teams per process, persisted to data/teams.json along
+# with the server it came from, so a registry fetched from a stand-in server
+# (--base-url) is never used by a real run.
+# ESPN uses the same team IDs in the site API (teams/{id}/roster) and as the
+# fantasy API's proTeamId, so a single map serves every scraper.
+
+REGISTRY_PATH = 'data/teams.json'
+TEAMS_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams"
+
+# ESPN abbreviations that differ from the ones used throughout our data
+ABBREVIATION_ALIASES = {
+    'WSH': 'WAS'
+}
+
+# Used when neither the saved registry nor the ESPN teams endpoint is available
+FALLBACK_TEAMS = [
+    {'id': '22', 'abbreviation': 'ARI', 'name': 'Cardinals', 'displayName': 'Arizona Cardinals', 'location': 'Arizona'},
+    {'id': '1', 'abbreviation': 'ATL', 'name': 'Falcons', 'displayName': 'Atlanta Falcons', 'location': 'Atlanta'},
+    {'id': '33', 'abbreviation': 'BAL', 'name': 'Ravens', 'displayName': 'Baltimore Ravens', 'location': 'Baltimore'},
+    {'id': '2', 'abbreviation': 'BUF', 'name': 'Bills', 'displayName': 'Buffalo Bills', 'location': 'Buffalo'},
+    {'id': '29', 'abbreviation': 'CAR', 'name': 'Panthers', 'displayName': 'Carolina Panthers', 'location': 'Carolina'},
+    {'id': '3', 'abbreviation': 'CHI', 'name': 'Bears', 'displayName': 'Chicago Bears', 'location': 'Chicago'},
+    {'id': '4', 'abbreviation': 'CIN', 'name': 'Bengals', 'displayName': 'Cincinnati Bengals', 'location': 'Cincinnati'},
+    {'id': '5', 'abbreviation': 'CLE', 'name': 'Browns', 'displayName': 'Cleveland Browns', 'location': 'Cleveland'},
+    {'id': '6', 'abbreviation': 'DAL', 'name': 'Cowboys', 'displayName': 'Dallas Cowboys', 'location': 'Dallas'},
+    {'id': '7', 'abbreviation': 'DEN', 'name': 'Broncos', 'displayName': 'Denver Broncos', 'location': 'Denver'},
+    {'id': '8', 'abbreviation': 'DET', 'name': 'Lions', 'displayName': 'Detroit Lions', 'location': 'Detroit'},
+    {'id': '9', 'abbreviation': 'GB', 'name': 'Packers', 'displayName': 'Green Bay Packers', 'location': 'Green Bay'},
+    {'id': '34', 'abbreviation': 'HOU', 'name': 'Texans', 'displayName': 'Houston Texans', 'location': 'Houston'},
+    {'id': '11', 'abbreviation': 'IND', 'name': 'Colts', 'displayName': 'Indianapolis Colts', 'location': 'Indianapolis'},
+    {'id': '30', 'abbreviation': 'JAX', 'name': 'Jaguars', 'displayName': 'Jacksonville Jaguars', 'location': 'Jacksonville'},
+    {'id': '12', 'abbreviation': 'KC', 'name': 'Chiefs', 'displayName': 'Kansas City Chiefs', 'location': 'Kansas City'},
+    {'id': '13', 'abbreviation': 'LV', 'name': 'Raiders', 'displayName': 'Las Vegas Raiders', 'location': 'Las Vegas'},
+    {'id': '24', 'abbreviation': 'LAC', 'name': 'Chargers', 'displayName': 'Los Angeles Chargers', 'location': 'Los Angeles'},
+    {'id': '14', 'abbreviation': 'LAR', 'name': 'Rams', 'displayName': 'Los Angeles Rams', 'location': 'Los Angeles'},
+    {'id': '15', 'abbreviation': 'MIA', 'name': 'Dolphins', 'displayName': 'Miami Dolphins', 'location': 'Miami'},
+    {'id': '16', 'abbreviation': 'MIN', 'name': 'Vikings', 'displayName': 'Minnesota Vikings', 'location': 'Minnesota'},
+    {'id': '17', 'abbreviation': 'NE', 'name': 'Patriots', 'displayName': 'New England Patriots', 'location': 'New England'},
+    {'id': '18', 'abbreviation': 'NO', 'name': 'Saints', 'displayName': 'New Orleans Saints', 'location': 'New Orleans'},
+    {'id': '19', 'abbreviation': 'NYG', 'name': 'Giants', 'displayName': 'New York Giants', 'location': 'New York'},
+    {'id': '20', 'abbreviation': 'NYJ', 'name': 'Jets', 'displayName': 'New York Jets', 'location': 'New York'},
+    {'id': '21', 'abbreviation': 'PHI', 'name': 'Eagles', 'displayName': 'Philadelphia Eagles', 'location': 'Philadelphia'},
+    {'id': '23', 'abbreviation': 'PIT', 'name': 'Steelers', 'displayName': 'Pittsburgh Steelers', 'location': 'Pittsburgh'},
+    {'id': '25', 'abbreviation': 'SF', 'name': '49ers', 'displayName': 'San Francisco 49ers', 'location': 'San Francisco'},
+    {'id': '26', 'abbreviation': 'SEA', 'name': 'Seahawks', 'displayName': 'Seattle Seahawks', 'location': 'Seattle'},
+    {'id': '27', 'abbreviation': 'TB', 'name': 'Buccaneers', 'displayName': 'Tampa Bay Buccaneers', 'location': 'Tampa Bay'},
+    {'id': '10', 'abbreviation': 'TEN', 'name': 'Titans', 'displayName': 'Tennessee Titans', 'location': 'Tennessee'},
+    {'id': '28', 'abbreviation': 'WAS', 'name': 'Commanders', 'displayName': 'Washington Commanders', 'location': 'Washington'}
+]
+
+class TeamRegistry:
+    """Lookup of NFL teams by ESPN team ID, abbreviation or name"""
+
+    def __init__(self, teams, source='fallback'):
+        self.teams = teams
+        self.source = source
+        self.by_id = {}
+        self.by_abbreviation = {}
+        self.by_name = {}
+
+        for team in teams:
+            self.by_id[str(team['id'])] = team
+            self.by_abbreviation[team['abbreviation']] = team
+            for name in (team.get('name'), team.get('displayName')):
+                if name:
+                    self.by_name[name.lower()] = team
+
+        for alias, abbreviation in ABBREVIATION_ALIASES.items():
+            if abbreviation in self.by_abbreviation:
+                self.by_abbreviation.setdefault(alias, self.by_abbreviation[abbreviation])
+
+    def __iter__(self):
+        return iter(self.teams)
+
+    def __len__(self):
+        return len(self.teams)
+
+    def get(self, team_id):
+        """Team for an ESPN team ID / fantasy proTeamId (int or str)"""
+        return self.by_id.get(str(team_id))
+
+    def abbreviation(self, team_id, default='FA'):
+        team = self.get(team_id)
+        return team['abbreviation'] if team else default
+
+    def find(self, key):
+        """Team for an abbreviation, nickname or display name"""
+        if not key:
+            return None
+        return self.by_abbreviation.get(key.upper()) or self.by_name.get(key.lower())
+
+def parse_teams_response(data):
+    """Extract team records from the ESPN teams endpoint payload"""
+    teams = []
+    for team in data.get('sports', [{}])[0].get('leagues', [{}])[0].get('teams', []):
+        team_info = team.get('team', {})
+        abbreviation = team_info.get('abbreviation')
+        teams.append({
+            'id': str(team_info.get('id')),
+            'abbreviation': ABBREVIATION_ALIASES.get(abbreviation, abbreviation),
+            'name': team_info.get('name'),
+            'displayName': team_info.get('displayName'),
+            'location': team_info.get('location')
+        })
+    return teams
+
+def fetch_teams():
+    """Fetch the team list from ESPN, or [] on failure"""
+    import http_client
+
+    try:
+        response = http_client.get(TEAMS_URL)
+        if response.status_code == 200:
+            teams = parse_teams_response(response.json())
+            print(f"Found {len(teams)} NFL teams")
+            return teams
+    except Exception as e:
+        print(f"Error fetching teams: {e}")
+
+    return []
+
+def registry_origin():
+    """Base URL of the server the shared client talks to, None for the real ESPN API"""
+    import http_client
+
+    base_url = http_client.get_client().base_url
+    return base_url.geturl() if base_url else None
+
+def load_saved_registry(path=REGISTRY_PATH):
+    """Saved teams, unless they were fetched from a different server than this run's"""
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+        if saved.get('origin') != registry_origin():
+            return []
+        return saved['teams']
+    except (OSError, ValueError, KeyError):
+        return []
+
+def save_registry(registry, path=REGISTRY_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'origin': registry_origin(), 'teams': registry.teams}, f, indent=2)
+
+_registry = None
+
+def get_registry(refresh=False, path=REGISTRY_PATH):
+    """Return the process-wide registry: saved file, then ESPN, then the fallback list"""
+    global _registry
+    if _registry is not None and not refresh:
+        return _registry
+
+    teams = [] if refresh else load_saved_registry(path)
+    if teams:
+        _registry = TeamRegistry(teams, source='saved')
+        return _registry
+
+    teams = fetch_teams()
+    if teams:
+        _registry = TeamRegistry(teams, source='espn')
+        save_registry(_registry, path)
+    else:
+        print("Failed to fetch teams. Using fallback team list...")
+        _registry = TeamRegistry(FALLBACK_TEAMS, source='fallback')
+
+    return _registry